@@ -0,0 +1,372 @@
+"""Subcomando appointments do seed-data.py: consultórios, pacientes e reservas concorrentes."""
+import argparse
+import datetime
+import itertools
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import seed_http  # for BASE, which main() sets
+from seed_common import DAY_NAMES, LatencyStats, minutes
+from seed_datasets import CITIES, FIRST_NAMES_F, FIRST_NAMES_M, SURNAMES
+from seed_http import (book_appointment, cancel_appointment, create_availability, create_workplace, get_availability,
+                       get_workplaces, register_patient, search_doctors, set_step, warn)
+from seed_tasks import run_parallel
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_APPOINTMENTS_REPORT = os.path.join(SCRIPT_DIR, "appointments-report.json")
+PATIENT_PASSWORD = "Senha@2026"
+PATIENT_DOMAIN = "paciente.medconnect.com"
+WORKPLACE_NAME = "Consultório MedConnect (carga)"
+BOOKING_OUTCOMES = ("booked", "slot_taken", "patient_busy", "error")
+
+# City centres for the workplaces and the search points; unknown cities fall back to São Paulo
+CITY_COORDINATES = {
+    "São Paulo": (-23.5505, -46.6333), "Campinas": (-22.9099, -47.0626), "Ribeirão Preto": (-21.1775, -47.8103),
+    "Rio de Janeiro": (-22.9068, -43.1729), "Niterói": (-22.8832, -43.1034), "Belo Horizonte": (-19.9167, -43.9345),
+    "Uberlândia": (-18.9186, -48.2772), "Porto Alegre": (-30.0346, -51.2177), "Curitiba": (-25.4284, -49.2733),
+    "Londrina": (-23.3045, -51.1696), "Florianópolis": (-27.5954, -48.548), "Salvador": (-12.9777, -38.5016),
+    "Recife": (-8.0476, -34.877), "Fortaleza": (-3.7319, -38.5267), "Brasília": (-15.7975, -47.8919),
+    "Goiânia": (-16.6869, -49.2648), "Manaus": (-3.119, -60.0217), "Belém": (-1.4558, -48.4902),
+    "Natal": (-5.7945, -35.211), "Vitória": (-20.3155, -40.3128),
+}
+
+
+def parse_window(spec):
+    """'08:00-12:00' -> ('08:00', '12:00'), the daily availability window created for each doctor."""
+    start, _, end = spec.partition("-")
+    for value in (start, end):
+        if not re.fullmatch(r"([01]\d|2[0-3]):[0-5]\d", value):
+            raise argparse.ArgumentTypeError(f"janela inválida: {spec!r} (use HH:mm-HH:mm)")
+    if start >= end:
+        raise argparse.ArgumentTypeError(f"janela vazia: {spec!r}")
+    return start, end
+
+
+def patient_email(i):
+    return f"paciente{i:06d}@{PATIENT_DOMAIN}"
+
+
+def patient_password(email):
+    """Password of a patient registered by the appointments subcommand, None for other accounts."""
+    return PATIENT_PASSWORD if email.endswith(f"@{PATIENT_DOMAIN}") else None
+
+
+def patient_record(i):
+    """RegisterPatientDto body of synthetic patient i; the CPF is unique per i but not check-digit valid."""
+    rng = random.Random(f"patient:{i}")
+    city, state, ddd, _ = rng.choice(CITIES)
+    first = rng.choice(FIRST_NAMES_F if i % 2 else FIRST_NAMES_M)
+    return {
+        "email": patient_email(i), "password": PATIENT_PASSWORD,
+        "fullName": f"{first} {rng.choice(SURNAMES)} {rng.choice(SURNAMES)}",
+        "cpf": f"9{i:010d}", "phone": f"{ddd}9{rng.randint(10000000, 99999999)}",
+        "state": state, "city": city,
+    }
+
+
+def workplace_payload(doc, i):
+    """CreateWorkplaceDto body of the load-test workplace of a doctor, in the doctor's city."""
+    city = doc.get("city") if doc.get("city") in CITY_COORDINATES else "São Paulo"
+    state = doc.get("state") if doc.get("city") in CITY_COORDINATES else "SP"
+    latitude, longitude = CITY_COORDINATES[city]
+    rng = random.Random(f"workplace:{doc['email']}")
+    return {
+        "name": WORKPLACE_NAME, "street": "Rua da Consulta", "number": str(100 + i),
+        "neighborhood": "Centro", "city": city, "state": state, "zipCode": f"{rng.randint(10000, 99999)}-000",
+        "latitude": round(latitude + rng.uniform(-0.05, 0.05), 6),
+        "longitude": round(longitude + rng.uniform(-0.05, 0.05), 6),
+    }
+
+
+def appointment_slots(windows, days, slot_minutes, today):
+    """scheduledAt of every slot in `windows` over the next `days` days, in UTC like the backend.
+
+    `windows` maps a DayOfWeek to its (startTime, endTime) pairs.
+    """
+    for offset in range(1, days + 1):
+        day = today + datetime.timedelta(days=offset)
+        for start, end in windows.get(DAY_NAMES[day.weekday()], ()):
+            for minute in range(minutes(start), minutes(end), slot_minutes):
+                yield f"{day.isoformat()}T{minute // 60:02d}:{minute % 60:02d}:00.000Z"
+
+
+def appointments(args, dataset, tokens):
+    """Load the scheduling hot path: availability setup, slot search and concurrent bookings.
+
+    1. The first --doctors seeded doctors get one workplace and a weekday
+       availability window (--window, --slot); both are reused on reruns.
+       --patients patients are registered (or logged in) through
+       /auth/register-patient.
+    2. --searches POST /appointments/search-doctors from random patients
+       around the doctors' cities, on random days of the horizon.
+    3. --bookings POST /appointments, each on a slot of its own except for
+       groups of --contenders patients (a --collision-rate fraction of the
+       bookings) that hit the same slot at the same instant: a Barrier
+       releases the whole group together. The backend checks for a conflict
+       and then inserts without a lock or a unique index, so every group
+       must end with one 201 and 409s; more than one 201 is a double booking.
+
+    Booked appointments are cancelled at the end unless --keep.
+    Returns the number of double-booked slots.
+    """
+    print("=" * 60)
+    print("MedConnect - Carga de agenda")
+    print(f"Concorrência: {args.concurrency}, {args.doctors} médicos, {args.patients} pacientes, "
+          f"{args.bookings} reservas ({args.collision_rate:.0%} em grupos de {args.contenders} no mesmo horário)")
+    print("=" * 60)
+    tokens.probe(dataset.first_email())
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+
+    # --- 1. Workplaces, availability and patients ---
+    print("\n[1/3] Consultórios, disponibilidade e pacientes...")
+    set_step("[1/3] agenda")
+    doctors = list(itertools.islice(dataset.doctors(), args.doctors))
+    start, end = args.window
+
+    def setup_doctor(item):
+        i, doc = item
+        token = tokens.token(doc["email"])
+        if not token:
+            return None
+        payload = workplace_payload(doc, i)
+        workplace = next((w for w in get_workplaces(token) or [] if w["name"] == WORKPLACE_NAME), None)
+        workplace_id = workplace["id"] if workplace else create_workplace(token, payload)
+        if not workplace_id:
+            return None
+        existing = {(a["dayOfWeek"], a["startTime"]) for a in get_availability(token) or []
+                    if a["workplaceId"] == workplace_id}
+        for day in DAY_NAMES[:5]:
+            if (day, start) not in existing:
+                create_availability(token, {"workplaceId": workplace_id, "dayOfWeek": day, "startTime": start,
+                                            "endTime": end, "slotDurationMin": args.slot})
+        windows = {}
+        for a in get_availability(token) or []:
+            if a["workplaceId"] == workplace_id and a.get("isActive", True):
+                windows.setdefault(a["dayOfWeek"], []).append((a["startTime"], a["endTime"]))
+        return tokens.doctor_id(doc["email"]), workplace_id, windows, payload
+
+    schedules = []
+    for _, schedule, _ in run_parallel(setup_doctor, enumerate(doctors), args.concurrency):
+        if schedule and schedule[0] and schedule[2]:
+            schedules.append(schedule)
+    if not schedules:
+        print("  ✗ Nenhum médico semeado aceitou login ou recebeu disponibilidade; rode o seed antes")
+        sys.exit(1)
+    schedules.sort(key=lambda schedule: schedule[0])
+
+    patients = []
+    for record, auth, _ in run_parallel(register_patient, map(patient_record, range(args.patients)), args.concurrency):
+        if auth and (auth.get("user") or {}).get("patientId"):
+            tokens.store(record["email"], auth)
+            patients.append(record["email"])
+        elif auth:
+            warn(f"{record['email']} entrou sem patientId (JwtStrategy sem o perfil de paciente?)")
+    if len(patients) < args.contenders:
+        print(f"  ✗ Só {len(patients)} pacientes disponíveis; são necessários pelo menos {args.contenders}")
+        sys.exit(1)
+    patients.sort()
+    print(f"  Médicos com agenda: {len(schedules)} de {len(doctors)}, pacientes: {len(patients)} de {args.patients}")
+
+    # Every slot of the horizon, shuffled so the load spreads over doctors and days
+    rng = random.Random(args.seed)
+    slots = [(schedule, scheduled_at) for schedule in schedules
+             for scheduled_at in appointment_slots(schedule[2], args.days, args.slot, today)]
+    rng.shuffle(slots)
+
+    # --- 2. Slot search ---
+    print(f"[2/3] Busca de horários (/appointments/search-doctors) x{args.searches}...")
+    set_step("[2/3] busca")
+    searches = LatencyStats()
+
+    def search(n):
+        search_rng = random.Random(f"{args.seed}:search:{n}")
+        token = tokens.token(search_rng.choice(patients))
+        workplace = search_rng.choice(schedules)[3]
+        day = today + datetime.timedelta(days=search_rng.randint(1, args.days))
+        query = {"latitude": workplace["latitude"], "longitude": workplace["longitude"], "radiusKm": 20,
+                 "date": day.isoformat(), "limit": 20}
+        start_time = time.perf_counter()
+        result = search_doctors(token, query, quiet=True) if token else None
+        searches.add("POST /appointments/search-doctors", time.perf_counter() - start_time, result is not None)
+        return result
+
+    found = 0
+    for _, result, _ in run_parallel(search, range(args.searches), args.concurrency):
+        found += sum(len(item.get("availableSlots") or ()) for item in (result or {}).get("data") or ())
+    searches.stop()
+
+    # --- 3. Concurrent bookings ---
+    groups = []
+    planned = 0
+    for schedule, scheduled_at in slots:
+        if planned >= args.bookings:
+            break
+        size = args.contenders if rng.random() < args.collision_rate else 1
+        size = min(size, args.bookings - planned)
+        groups.append((schedule, scheduled_at, rng.sample(patients, size)))
+        planned += size
+    if planned < args.bookings:
+        print(f"  ! Só {len(slots)} horários no horizonte de {args.days} dias: {planned} reservas em vez de {args.bookings}")
+    contended = sum(1 for group in groups if len(group[2]) > 1)
+    print(f"[3/3] Reservas (/appointments): {planned} em {len(groups)} horários, {contended} disputados...")
+    set_step("[3/3] reservas")
+    bookings = LatencyStats()
+    labels = {"booked": "201 reservada", "slot_taken": "409 horário ocupado",
+              "patient_busy": "409 paciente ocupado", "error": "erro"}
+
+    def book(group_index, email, barrier):
+        (doctor_id, workplace_id, _, _), scheduled_at, _ = groups[group_index]
+        token = tokens.token(email)
+        if barrier is not None:
+            try:
+                barrier.wait()
+            except threading.BrokenBarrierError:
+                pass  # a contender without a token or a timeout; the rest still go
+        if not token:
+            return group_index, email, "error", None
+        start_time = time.perf_counter()
+        r = book_appointment(token, {"doctorId": doctor_id, "workplaceId": workplace_id,
+                                     "scheduledAt": scheduled_at, "reason": "Carga de agenda"}, quiet=True)
+        elapsed = time.perf_counter() - start_time
+        if r is not None and r.status_code == 201:
+            outcome, appointment_id = "booked", r.json()["id"]
+        elif r is not None and r.status_code == 409:
+            outcome = "slot_taken" if "already booked" in r.text else "patient_busy"
+            appointment_id = None
+        else:
+            outcome, appointment_id = "error", None
+        bookings.add(labels[outcome], elapsed, outcome != "error")
+        return group_index, email, outcome, appointment_id
+
+    # Members of a group are submitted back to back, so with contenders <= concurrency the
+    # pool always gets to the last one and the Barrier never waits on a queued task
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = []
+        for group_index, (_, _, contenders) in enumerate(groups):
+            barrier = threading.Barrier(len(contenders), timeout=args.timeout) if len(contenders) > 1 else None
+            futures.extend(pool.submit(book, group_index, email, barrier) for email in contenders)
+        results = [future.result() for future in futures]
+    bookings.stop()
+
+    outcomes = dict.fromkeys(BOOKING_OUTCOMES, 0)
+    booked_per_group = [0] * len(groups)
+    booked = []
+    taken_before = 0  # uncontended slots already booked, e.g. by an earlier run with --keep
+    for group_index, email, outcome, appointment_id in results:
+        outcomes[outcome] += 1
+        if outcome == "booked":
+            booked_per_group[group_index] += 1
+            booked.append((email, appointment_id))
+        elif outcome == "slot_taken" and len(groups[group_index][2]) == 1:
+            taken_before += 1
+    double_booked = [groups[i][1] for i, count in enumerate(booked_per_group) if count > 1]
+    expected_conflicts = sum(len(contenders) - 1 for _, _, contenders in groups)
+
+    cancelled = 0
+    if booked and not args.keep:
+        set_step("cancelamento")
+        for _, ok, _ in run_parallel(lambda item: cancel_appointment(tokens.token(item[0]), item[1],
+                                                                     "Carga de agenda encerrada"),
+                                     booked, args.concurrency):
+            cancelled += bool(ok)
+
+    # --- Report ---
+    wall = bookings.wall or 0.0
+    summary = {
+        "doctors": len(schedules),
+        "patients": len(patients),
+        "slots_in_horizon": len(slots),
+        "searches": args.searches,
+        "slots_found": found,
+        "attempts": len(results),
+        "groups": len(groups),
+        "contended_groups": contended,
+        **outcomes,
+        "expected_slot_conflicts": expected_conflicts,
+        "conflict_rate": round(outcomes["slot_taken"] / len(results), 4) if results else 0.0,
+        "bookings_per_s": round(outcomes["booked"] / wall, 2) if wall else 0.0,
+        "attempts_per_s": round(len(results) / wall, 2) if wall else 0.0,
+        "double_booked": len(double_booked),
+        "cancelled": cancelled,
+    }
+    print("\n" + "=" * 60)
+    print("RESULTADO DA CARGA DE AGENDA")
+    print("=" * 60)
+    print(f"  Reservas: {outcomes['booked']} de {len(results)} tentativas em {wall:.2f}s "
+          f"({summary['bookings_per_s']:g} reservas/s, {summary['attempts_per_s']:g} tentativas/s)")
+    print(f"  Conflitos: {outcomes['slot_taken']} de horário ({summary['conflict_rate']:.1%}; "
+          f"{expected_conflicts} esperados pelos grupos), {outcomes['patient_busy']} de paciente, "
+          f"{outcomes['error']} erros")
+    if taken_before:
+        print(f"  ! {taken_before} horários já estavam ocupados (reservas de uma execução anterior com --keep? troque a --seed)")
+    if double_booked:
+        print(f"  ✗ {len(double_booked)} horários reservados mais de uma vez, ex.: {', '.join(double_booked[:3])}")
+    print(f"  Busca: {args.searches} consultas, {found} horários livres devolvidos")
+    if booked:
+        print(f"  Canceladas ao final: {cancelled} de {len(booked)}" if not args.keep
+              else f"  Mantidas (--keep): {len(booked)}")
+    print("-" * 60)
+    print("  Latência da busca")
+    searches.print_table()
+    print("  Latência das reservas por resultado")
+    bookings.print_table()
+    report = bookings.to_json(base=seed_http.BASE, concurrency=args.concurrency, contenders=args.contenders,
+                              collision_rate=args.collision_rate, summary=summary,
+                              search=searches.summary(), double_booked_slots=double_booked)
+    if args.json_out == "-":
+        print(json.dumps(report, indent=2))
+    elif args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"  Relatório JSON: {args.json_out}")
+    print(f"  {'✓ Nenhum horário reservado duas vezes' if not double_booked else '✗ Reserva dupla detectada'}")
+    print("=" * 60)
+    return len(double_booked)
+
+
+def add_parser(commands, parents):
+    """The `appointments` subparser: the agenda shape on top of the http, data and mock options."""
+    parser = commands.add_parser("appointments", parents=[parents.http, parents.data, parents.mock],
+                                 help="Carga de agenda: disponibilidade, pacientes e reservas concorrentes",
+                                 description="Cria consultórios e disponibilidade para os médicos semeados, "
+                                             "registra pacientes, mede a busca de horários e dispara reservas "
+                                             "concorrentes com colisões no mesmo horário.")
+    parser.add_argument("--doctors", type=int, default=20,
+                        help="Médicos do dataset (já semeados) que recebem consultório e disponibilidade")
+    parser.add_argument("--patients", type=int, default=200,
+                        help="Pacientes registrados via /auth/register-patient (reaproveitados se já existem)")
+    parser.add_argument("--bookings", type=int, default=1000, help="Tentativas de reserva")
+    parser.add_argument("--collision-rate", type=float, default=0.2,
+                        help="Fração das tentativas disparadas em grupos sobre o mesmo horário (0 a 1)")
+    parser.add_argument("--contenders", type=int, default=3,
+                        help="Pacientes por grupo de colisão, liberados juntos (no máximo --concurrency)")
+    parser.add_argument("--searches", type=int, default=200,
+                        help="Consultas a /appointments/search-doctors antes das reservas")
+    parser.add_argument("--window", type=parse_window, default=("08:00", "12:00"),
+                        help="Janela diária de atendimento, de segunda a sexta (HH:mm-HH:mm, UTC)")
+    parser.add_argument("--slot", type=int, default=30, help="Duração do horário em minutos (10 a 120)")
+    parser.add_argument("--days", type=int, default=14, help="Horizonte de dias a partir de amanhã")
+    parser.add_argument("--keep", action="store_true",
+                        help="Mantém as consultas reservadas em vez de cancelá-las ao final")
+    parser.add_argument("--json-out", default=DEFAULT_APPOINTMENTS_REPORT,
+                        help="Arquivo do relatório JSON ('-' imprime no stdout, '' desativa)")
+    return parser
+
+
+def check_args(parser, args):
+    """Bounds of the agenda options that argparse types cannot express."""
+    if min(args.doctors, args.patients, args.bookings, args.days) < 1:
+        parser.error("--doctors, --patients, --bookings e --days devem ser pelo menos 1")
+    if not 0 <= args.collision_rate <= 1:
+        parser.error("--collision-rate deve estar entre 0 e 1")
+    if not 2 <= args.contenders <= min(args.concurrency, args.patients):
+        parser.error("--contenders deve estar entre 2 e o menor de --concurrency e --patients")
+    if not 10 <= args.slot <= 120:
+        parser.error("--slot deve estar entre 10 e 120 minutos")
@@ -0,0 +1,410 @@
+"""Métricas por requisição e o subcomando bench do seed-data.py (carga mista com as contas semeadas)."""
+import argparse
+import bisect
+import csv
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import seed_http  # for BASE and CONTROLLER, which main() sets
+from seed_common import EXISTING_ACCOUNTS, LatencyStats, endpoint_label
+from seed_http import (create_job, current_step, get_specialties, get_suggestions, get_timeline, get_trending,
+                       job_payload, like_post, received_bytes)
+from seed_tasks import print_adaptive, run_parallel
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class RequestMetrics:
+    """Hot-path record of every api() call: step, endpoint, status, bytes and duration.
+
+    Calls are aggregated per seed step (as tagged by TaskGraph) and per
+    endpoint into histograms. The optional CSV and Chrome trace sinks stream
+    one line per request as it completes, so memory does not grow with the run.
+    """
+
+    OUTSIDE_STEP = "(fora das etapas)"
+
+    def __init__(self, csv_path=None, trace_path=None):
+        self.by_step = LatencyStats(exact=False)
+        self.by_endpoint = LatencyStats(exact=False)
+        self.origin = time.perf_counter()
+        self._sink_lock = threading.Lock()
+        self._threads = {}  # thread ident -> small tid for the trace viewer
+        self._csv_file = self._csv = self._trace = None
+        if csv_path:
+            self._csv_file = open(csv_path, "w", newline="")
+            self._csv = csv.writer(self._csv_file)
+            self._csv.writerow(["step", "method", "endpoint", "path", "status", "bytes",
+                                "start_ms", "duration_ms", "thread"])
+        if trace_path:
+            # Chrome/Perfetto JSON array format; each request is a complete ("X") event
+            self._trace = open(trace_path, "w")
+            self._trace.write("[\n")
+            self._trace_first = True
+
+    def observe(self, method, path, status, nbytes, start, duration):
+        step = current_step() or self.OUTSIDE_STEP
+        endpoint = endpoint_label(method, path)
+        ok = 0 < status < 400
+        self.by_step.add(step, duration, ok, nbytes)
+        self.by_endpoint.add(endpoint, duration, ok, nbytes)
+        if self._csv is None and self._trace is None:
+            return
+        with self._sink_lock:
+            tid = self._threads.setdefault(threading.get_ident(), len(self._threads) + 1)
+            offset = start - self.origin
+            if self._csv is not None:
+                self._csv.writerow([step, method, endpoint, path, status, nbytes,
+                                    f"{offset * 1000:.3f}", f"{duration * 1000:.3f}", tid])
+            if self._trace is not None:
+                event = {"name": endpoint, "cat": step, "ph": "X", "pid": 1, "tid": tid,
+                         "ts": round(offset * 1e6, 1), "dur": round(duration * 1e6, 1),
+                         "args": {"status": status, "bytes": nbytes, "path": path}}
+                self._trace.write(("" if self._trace_first else ",\n") + json.dumps(event))
+                self._trace_first = False
+
+    def state(self):
+        return {"by_step": self.by_step.state(), "by_endpoint": self.by_endpoint.state()}
+
+    def merge(self, state):
+        self.by_step.merge(state["by_step"])
+        self.by_endpoint.merge(state["by_endpoint"])
+
+    def step_rows(self, graph):
+        """Per-step breakdown in registration order, using each step's own wall time for throughput."""
+        summary = self.by_step.summary()
+        rows = []
+        for label, wall, _, tasks in graph.steps:
+            row = summary.get(label)
+            requests_made = row["requests"] if row else 0
+            rows.append({
+                "step": label,
+                "tasks": tasks,
+                "requests": requests_made,
+                "ok": requests_made - (row["errors"] if row else 0),
+                "failed": row["errors"] if row else 0,
+                "wall_s": round(wall, 3),
+                "mean_ms": row["mean_ms"] if row else None,
+                "p95_ms": row["p95_ms"] if row else None,
+                "rps": round(requests_made / wall, 2) if wall else 0.0,
+            })
+        outside = summary.get(self.OUTSIDE_STEP)
+        if outside:
+            rows.append({"step": self.OUTSIDE_STEP, "tasks": None, "requests": outside["requests"],
+                         "ok": outside["requests"] - outside["errors"], "failed": outside["errors"],
+                         "wall_s": None, "mean_ms": outside["mean_ms"], "p95_ms": outside["p95_ms"], "rps": None})
+        return rows
+
+    def print_steps(self, graph):
+        print(f"  {'Etapa':<18} {'Req':>7} {'OK':>7} {'Falhas':>7} {'Tempo':>9} {'Média':>8} {'p95':>8} {'Req/s':>8}")
+        for row in self.step_rows(graph):
+            wall = f"{row['wall_s']:.2f}s" if row["wall_s"] is not None else "—"
+            mean = f"{row['mean_ms']:.1f}" if row["mean_ms"] is not None else "—"
+            p95 = f"{row['p95_ms']:.1f}" if row["p95_ms"] is not None else "—"
+            rps = f"{row['rps']:.1f}" if row["rps"] is not None else "—"
+            print(f"  {row['step']:<18} {row['requests']:>7} {row['ok']:>7} {row['failed']:>7} "
+                  f"{wall:>9} {mean:>8} {p95:>8} {rps:>8}")
+
+    def write_json(self, path, graph, **extra):
+        report = {
+            "base": seed_http.BASE,
+            "steps": self.step_rows(graph),
+            "endpoints": self.by_endpoint.summary(),
+            **{key: value for key, value in extra.items() if value is not None},
+        }
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+    def close(self):
+        with self._sink_lock:
+            if self._csv_file is not None:
+                self._csv_file.close()
+                self._csv_file = self._csv = None
+            if self._trace is not None:
+                self._trace.write("\n]\n")
+                self._trace.close()
+                self._trace = None
+
+
+DEFAULT_MIX = {"timeline": 50, "trending": 20, "suggestions": 15, "like": 10, "job": 5}
+DEFAULT_BENCH_REPORT = os.path.join(SCRIPT_DIR, "bench-report.json")
+
+
+def parse_mix(spec):
+    """Parse "timeline=50,like=10" into {operation: weight}."""
+    mix = {}
+    for part in spec.split(","):
+        name, sep, weight = part.partition("=")
+        name = name.strip()
+        if not sep or name not in BenchContext.OPERATIONS:
+            raise argparse.ArgumentTypeError(
+                f"operação inválida '{part}' (use {', '.join(BenchContext.OPERATIONS)})")
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"peso inválido em '{part}'")
+        if mix[name] < 0:
+            raise argparse.ArgumentTypeError(f"peso negativo em '{part}'")
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("o mix precisa de ao menos uma operação com peso > 0")
+    return mix
+
+
+class BenchContext:
+    """Seeded accounts, harvested post ids and job templates shared by the bench workers.
+
+    Each operation takes (ctx, rng) and returns True on success; OPERATIONS
+    maps it to the endpoint label used in the report.
+    """
+
+    POST_POOL_MAX = 5000
+
+    def __init__(self, tokens, emails, admin_email, jobs, spec_name_to_id):
+        self.quiet = False  # set once the measured run starts: failures are counted, not printed
+        self.tokens = tokens
+        self.emails = emails
+        self.admin_email = admin_email
+        self.jobs = jobs
+        self.spec_name_to_id = spec_name_to_id
+        self.post_ids = []
+        self._seen = set()
+        self._job_seq = 0
+        self._lock = threading.Lock()
+
+    def harvest(self, posts):
+        """Remember post ids returned by timeline/trending so likes hit real posts."""
+        fresh = [p["postId"] for p in posts or () if isinstance(p, dict) and p.get("postId")]
+        if not fresh or len(self.post_ids) >= self.POST_POOL_MAX:
+            return
+        with self._lock:
+            for post_id in fresh:
+                if post_id not in self._seen and len(self.post_ids) < self.POST_POOL_MAX:
+                    self._seen.add(post_id)
+                    self.post_ids.append(post_id)
+
+    def token(self, rng):
+        return self.tokens.token(rng.choice(self.emails))
+
+    def timeline(self, rng):
+        posts = get_timeline(self.token(rng), quiet=self.quiet)
+        self.harvest(posts)
+        return posts is not None
+
+    def trending(self, rng):
+        data = get_trending(self.token(rng), quiet=self.quiet)
+        if data is None:
+            return False
+        self.harvest(data.get("topPosts"))
+        return True
+
+    def suggestions(self, rng):
+        return get_suggestions(self.token(rng), quiet=self.quiet) is not None
+
+    def like(self, rng):
+        # A repeated like is an idempotent 201 (FeedService.likePost is a plain INSERT), so it is not an error
+        return like_post(self.token(rng), rng.choice(self.post_ids), quiet=self.quiet)
+
+    def job(self, rng):
+        with self._lock:
+            self._job_seq += 1
+            seq = self._job_seq
+        template = self.jobs[seq % len(self.jobs)]
+        payload = job_payload({**template, "title": f"{template['title']} [bench {seq}]"}, self.spec_name_to_id)
+        return create_job(self.tokens.token(self.admin_email), payload, quiet=self.quiet) is not None
+
+    OPERATIONS = {
+        "timeline": ("GET /feed/timeline", timeline),
+        "trending": ("GET /feed/trending", trending),
+        "suggestions": ("GET /connections/suggestions", suggestions),
+        "like": ("POST /feed/posts/:id/like", like),
+        "job": ("POST /jobs", job),
+    }
+
+
+def bench_accounts(args, dataset, tokens, concurrency):
+    """Emails of up to --accounts seeded doctors we can get a token for."""
+    candidates = [email for email, _ in EXISTING_ACCOUNTS]
+    for doc in dataset.doctors():
+        if len(candidates) >= args.accounts:
+            break
+        candidates.append(doc["email"])
+    candidates = candidates[:args.accounts]
+    return [email for email, token, _ in run_parallel(tokens.token, candidates, concurrency) if token]
+
+
+def bench(args, dataset, tokens):
+    """Drive a weighted read/write mix against BASE and report latency per endpoint."""
+    print("=" * 60)
+    print("MedConnect - Benchmark")
+    mode = f"open-loop {args.rps:g} req/s" if args.rps else "closed-loop"
+    limit = f"{args.requests} requisições" if args.requests else f"{args.duration:g}s"
+    print(f"Concorrência: {args.concurrency} ({mode}), limite: {limit}")
+    print("Mix: " + ", ".join(f"{name}={weight:g}" for name, weight in args.mix.items()))
+    print("=" * 60)
+
+    tokens.probe(dataset.first_email())
+    emails = bench_accounts(args, dataset, tokens, args.concurrency)
+    if not emails:
+        print("  ✗ Nenhuma conta semeada aceitou login; rode o seed antes do bench")
+        sys.exit(1)
+    print(f"  Contas: {len(emails)}")
+    admin_email = "demo@medconnect.com" if "demo@medconnect.com" in emails else emails[0]
+    spec_name_to_id = {}
+    if args.mix.get("job"):
+        spec_name_to_id = {s["name"]: s["id"] for s in get_specialties(tokens.token(admin_email))}
+    jobs = []
+    for job in dataset.jobs():
+        jobs.append(job)
+        if len(jobs) >= 1000:
+            break
+    ctx = BenchContext(tokens, emails, admin_email, jobs, spec_name_to_id)
+
+    # Warm-up: fill the post pool for likes and open the keep-alive connections
+    warm_rng = random.Random(args.seed)
+    for _ in run_parallel(lambda _: ctx.timeline(warm_rng), range(min(len(emails), 50)), args.concurrency):
+        pass
+    ctx.trending(warm_rng)
+    mix = dict(args.mix)
+    if mix.get("like") and not ctx.post_ids:
+        print("  ! Nenhum post encontrado no timeline/trending; removendo 'like' do mix")
+        mix.pop("like")
+    if mix.get("job") and not jobs:
+        mix.pop("job")
+    names = [name for name, weight in mix.items() if weight > 0]
+    if not names:
+        print("  ✗ Nenhuma operação executável no mix")
+        sys.exit(1)
+    cumulative = []
+    total = 0.0
+    for name in names:
+        total += mix[name]
+        cumulative.append(total)
+    print(f"  Posts no pool: {len(ctx.post_ids)}")
+
+    deadline = None if args.requests else time.perf_counter() + args.duration
+    issued = [0]
+    dropped = [0]
+    issue_lock = threading.Lock()
+
+    def next_ticket():
+        """False once the request budget or the duration is exhausted."""
+        if deadline is not None:
+            return time.perf_counter() < deadline
+        with issue_lock:
+            if issued[0] >= args.requests:
+                return False
+            issued[0] += 1
+            return True
+
+    def execute(rng, scheduled):
+        name = names[bisect.bisect(cumulative, rng.random() * total)]
+        endpoint, op = BenchContext.OPERATIONS[name]
+        received = received_bytes()
+        ok = op(ctx, rng)
+        stats.add(endpoint, time.perf_counter() - scheduled, ok, received_bytes() - received)
+
+    def closed_loop_worker(n):
+        rng = random.Random(f"{args.seed}:bench:{n}")
+        while next_ticket():
+            execute(rng, time.perf_counter())
+
+    backlog = queue.Queue(maxsize=args.concurrency * 4)
+
+    def open_loop_worker(n):
+        rng = random.Random(f"{args.seed}:bench:{n}")
+        while True:
+            scheduled = backlog.get()
+            if scheduled is None:
+                return
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            execute(rng, scheduled)
+
+    ctx.quiet = True
+    stats = LatencyStats()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        if not args.rps:
+            for n in range(args.concurrency):
+                pool.submit(closed_loop_worker, n)
+        else:
+            # Open loop: requests are scheduled on a fixed clock and latency is measured from
+            # the scheduled time, so a slow backend cannot hide queueing delay (coordinated
+            # omission). Arrivals that find the backlog full are dropped and reported.
+            workers = [pool.submit(open_loop_worker, n) for n in range(args.concurrency)]
+            start = time.perf_counter()
+            n = 0
+            while next_ticket():
+                scheduled = start + n / args.rps
+                n += 1
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                try:
+                    backlog.put_nowait(scheduled)
+                except queue.Full:
+                    dropped[0] += 1
+            for _ in workers:
+                backlog.put(None)
+    stats.stop()
+
+    print("\n" + "=" * 60)
+    print("RESULTADO DO BENCHMARK")
+    print("=" * 60)
+    stats.print_table()
+    if dropped[0]:
+        print(f"  ! {dropped[0]} chegadas descartadas: o backend não sustentou {args.rps:g} req/s")
+    print(f"  Duração: {stats.wall:.2f}s")
+    adaptive = seed_http.CONTROLLER.summary() if seed_http.CONTROLLER else None
+    if adaptive:
+        print("-" * 60)
+        print_adaptive(adaptive)
+    report = stats.to_json(
+        adaptive=adaptive,
+        base=seed_http.BASE,
+        mode="open" if args.rps else "closed",
+        target_rps=args.rps,
+        concurrency=args.concurrency,
+        mix=mix,
+        accounts=len(emails),
+        dropped=dropped[0],
+    )
+    if args.json_out == "-":
+        print(json.dumps(report, indent=2))
+    elif args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"  Relatório JSON: {args.json_out}")
+    print("=" * 60)
+
+
+def add_parser(commands, parents):
+    """The `bench` subparser: the http, data and mock options plus the load shape."""
+    parser = commands.add_parser("bench", parents=[parents.http, parents.data, parents.mock], help="Teste de carga com as contas semeadas",
+                                 description="Carga mista de leitura/escrita sobre as contas já semeadas, "
+                                             "com latência p50/p95/p99 e vazão por endpoint.")
+    parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX),
+                        help="Pesos das operações, ex.: timeline=50,trending=20,suggestions=15,like=10,job=5")
+    parser.add_argument("--duration", type=float, default=30.0,
+                        help="Duração do teste em segundos (ignorado com --requests)")
+    parser.add_argument("--requests", type=int,
+                        help="Número total de requisições em vez de uma duração")
+    parser.add_argument("--rps", type=float,
+                        help="Taxa alvo em open-loop; sem ela cada worker dispara em closed-loop")
+    parser.add_argument("--accounts", type=int, default=50,
+                        help="Quantas contas semeadas revezam as requisições")
+    parser.add_argument("--json-out", default=DEFAULT_BENCH_REPORT,
+                        help="Arquivo do relatório JSON ('-' imprime no stdout, '' desativa)")
+    return parser
+
+
+def check_args(parser, args):
+    """Option values argparse cannot check: --rps must be positive."""
+    if args.rps is not None and args.rps <= 0:
+        parser.error("--rps deve ser maior que 0")
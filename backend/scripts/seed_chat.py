@@ -0,0 +1,409 @@
+"""Carga do gateway /chat do seed-data.py: sockets socket.io, mensagens e fan-out de notificações."""
+import asyncio
+import functools
+import itertools
+import json
+import os
+import random
+import re
+import sys
+import time
+import uuid
+
+try:
+    import aiohttp  # with socketio: everything here; seed-data.py checks for them first
+    import socketio
+except ImportError:
+    aiohttp = socketio = None
+
+import seed_http  # for BASE, which main() sets
+from seed_common import LatencyStats
+from seed_http import create_job, get_specialties, job_payload
+from seed_tasks import run_parallel
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_CHAT_REPORT = os.path.join(SCRIPT_DIR, "chat-report.json")
+CHAT_REQUIREMENT = ('O subcomando chat precisa do python-socketio com o cliente asyncio '
+                    '(pip install "python-socketio[asyncio-client]").')
+CHAT_NAMESPACE = "/chat"
+CHAT_TOPOLOGIES = ("pairs", "ring", "star", "random", "connections")
+# handleConnection joins the user:<id> room only after a Redis write, so the client sees
+# the connect before the room exists; messages wait this long after the last connect
+CHAT_SETTLE = 0.5
+_CHAT_TAG = re.compile(r"^\[carga (\w+):(\d+)\]")
+
+
+def socket_origin(base):
+    """scheme://host:port of an API base URL: socket.io listens at the root, outside /api/v1."""
+    scheme, _, rest = base.partition("://")
+    return f"{scheme}://{rest.split('/', 1)[0]}"
+
+
+def bearer(token):
+    """Authorization header for `token` (on the socket handshake and the notification polls)."""
+    return {"Authorization": f"Bearer {token}"}
+
+
+def chat_id(a, b):
+    """ChatService.getChatId: both doctor ids sorted and joined."""
+    return ":".join(sorted((a, b)))
+
+
+def chat_conversations(topology, n, hubs, edges):
+    """(sender, receiver) socket positions the messages pick from; None for `random` (any two sockets).
+
+    pairs: disjoint 1:1 conversations; ring: each socket writes to the next one;
+    star: everyone talks with one of `hubs` hot accounts; connections: the
+    seeded connection graph (`edges`, pairs of positions).
+    """
+    if topology == "random":
+        return None
+    if topology == "ring":
+        return [(i, (i + 1) % n) for i in range(n)]
+    if topology == "pairs":
+        pairs = [(i, i + 1) for i in range(0, n - 1, 2)]
+    elif topology == "star":
+        pairs = [(i, i % hubs) for i in range(hubs, n)]
+    else:
+        pairs = list(edges)
+    return pairs + [(b, a) for a, b in pairs]
+
+
+async def chat_traffic(args, base, accounts, edges, jobs, stats, counts):
+    """Connect one /chat socket per account, send the messages, then run the job fan-outs.
+
+    Each phase puts its LatencyStats in `stats` ("connect", "messages",
+    "notifications") as it starts; `jobs` is a list of (function that creates the job and
+    returns its id or None, recipient (email, token) pairs). `base` is the API base URL.
+    """
+    run = uuid.uuid4().hex[:8]
+    session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0),
+                                    timeout=aiohttp.ClientTimeout(total=args.timeout))
+    clients = [None] * len(accounts)
+    sent = {}          # seq -> (start, receiver position)
+    unacked = {}       # the same, for sends whose ack failed or timed out
+    delivered = set()
+    late = set()       # delivered although the ack failed: not lost, not misrouted
+    gate = asyncio.Semaphore(args.concurrency)
+
+    def on_new_message(i):
+        async def handler(message):
+            match = _CHAT_TAG.match(str((message or {}).get("content", "")))
+            if not match or match.group(1) != run:
+                counts["foreign"] += 1
+                return
+            seq = int(match.group(2))
+            entry = sent.get(seq) or unacked.get(seq)
+            if entry is None or entry[1] != i:
+                counts["misrouted"] += 1
+            elif seq in delivered or seq in late:
+                counts["duplicated"] += 1
+            elif seq in unacked:
+                late.add(seq)
+            else:
+                delivered.add(seq)
+                stats["messages"].add("new_message (entrega)", time.perf_counter() - entry[0])
+        return handler
+
+    async def connect(i):
+        _, token, doctor_id, _, _ = accounts[i]
+        client = socketio.AsyncClient(reconnection=False, handle_sigint=False, http_session=session)
+        client.on("new_message", on_new_message(i), namespace=CHAT_NAMESPACE)
+        async with gate:
+            start = time.perf_counter()
+            try:
+                # The gateway only reads ?userId= today; the token goes along for when it checks it
+                await client.connect(f"{args.socket_url}?userId={doctor_id}", headers=bearer(token),
+                                     auth={"token": token}, transports=["websocket"], namespaces=[CHAT_NAMESPACE],
+                                     wait_timeout=args.timeout)
+            except socketio.exceptions.ConnectionError as e:
+                stats["connect"].add("connect /chat", time.perf_counter() - start, False)
+                counts["connect_errors"] += 1
+                counts.setdefault("connect_error", str(e))
+                return
+            stats["connect"].add("connect /chat", time.perf_counter() - start)
+        clients[i] = client
+
+    async def send(seq, sender, receiver, start):
+        sender_id, receiver_id = accounts[sender][2], accounts[receiver][2]
+        sent[seq] = (start, receiver)
+        payload = {"chatId": chat_id(sender_id, receiver_id), "receiverId": receiver_id,
+                   "content": f"[carga {run}:{seq}] Mensagem de carga {seq} para {accounts[receiver][0]}"}
+        counts["sent"] += 1
+        try:
+            ack = await clients[sender].call("send_message", payload, namespace=CHAT_NAMESPACE, timeout=args.timeout)
+        except socketio.exceptions.SocketIOError:
+            ack = None
+        ok = isinstance(ack, dict) and bool(ack.get("messageId"))
+        stats["messages"].add("send_message (ack)", time.perf_counter() - start, ok)
+        if ok:
+            counts["acked"] += 1
+        else:
+            counts["send_errors"] += 1
+            unacked[seq] = sent.pop(seq)
+            if seq in delivered:  # the delivery beat the failed ack
+                delivered.discard(seq)
+                late.add(seq)
+
+    async def fanout(create, recipients):
+        """Create one job and wait for its JOB_CREATED notification in every recipient's inbox."""
+        start = time.perf_counter()
+        job_id = await asyncio.to_thread(create)
+        stats["notifications"].add("POST /jobs", time.perf_counter() - start, job_id is not None)
+        if not job_id:
+            counts["jobs_failed"] += 1
+            return
+
+        async def watch(token):
+            deadline = start + args.fanout_timeout
+            while time.perf_counter() < deadline:
+                try:
+                    async with session.get(f"{base}/notifications", params={"limit": 50},
+                                           headers=bearer(token)) as r:
+                        items = await r.json() if r.status == 200 else []
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                    items = []
+                if any(isinstance(n, dict) and (n.get("data") or {}).get("jobId") == job_id for n in items):
+                    return time.perf_counter() - start
+                await asyncio.sleep(args.poll_interval)
+            return None
+
+        times = await asyncio.gather(*(watch(token) for _, token in recipients))
+        seen = [t for t in times if t is not None]
+        for t in seen:
+            stats["notifications"].add("JOB_CREATED por destinatário", t)
+        counts["notified"] += len(seen)
+        counts["not_notified"] += len(times) - len(seen)
+        if seen and len(seen) == len(times):
+            stats["notifications"].add("JOB_CREATED fan-out completo", max(seen))
+
+    try:
+        print(f"[1/3] Conectando {len(accounts)} sockets em {args.socket_url}{CHAT_NAMESPACE}...")
+        stats["connect"] = LatencyStats()
+        await asyncio.gather(*(connect(i) for i in range(len(accounts))))
+        stats["connect"].stop()
+        connected = [i for i, client in enumerate(clients) if client]
+        counts["connected"] = len(connected)
+        position = {i: p for p, i in enumerate(connected)}
+        conversations = chat_conversations(args.topology, len(connected), args.hubs,
+                                           [(position[a], position[b]) for a, b in edges
+                                            if a in position and b in position])
+        if len(connected) < 2 or conversations == []:
+            print("  ✗ Sockets conectados ou conversas insuficientes para a topologia")
+        else:
+            await asyncio.sleep(CHAT_SETTLE)
+            rng = random.Random(args.seed)
+
+            def pick():
+                if conversations is None:
+                    return [connected[p] for p in rng.sample(range(len(connected)), 2)]
+                return [connected[p] for p in rng.choice(conversations)]
+
+            print(f"[2/3] {args.messages} mensagens ({args.topology}, "
+                  f"{f'{args.rps:g} msg/s' if args.rps else f'{args.concurrency} em voo'})...")
+            stats["messages"] = LatencyStats(total=False)  # acks and deliveries time different spans
+            if args.rps:
+                # Open loop, as in bench: latency counts from the scheduled send time
+                tasks = []
+                start = time.perf_counter()
+                for seq in range(args.messages):
+                    scheduled = start + seq / args.rps
+                    delay = scheduled - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    tasks.append(asyncio.create_task(send(seq, *pick(), scheduled)))
+                await asyncio.gather(*tasks)
+            else:
+                seqs = iter(range(args.messages))
+
+                async def worker():
+                    for seq in seqs:
+                        await send(seq, *pick(), time.perf_counter())
+
+                await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+            deadline = time.perf_counter() + args.drain
+            while len(delivered) < counts["acked"] and time.perf_counter() < deadline:
+                await asyncio.sleep(0.05)
+            stats["messages"].stop()
+            counts["delivered"] = len(delivered)
+            counts["late"] = len(late)
+            counts["lost"] = counts["acked"] - len(delivered)
+
+        if jobs:
+            print(f"[3/3] Fan-out de notificações: {len(jobs)} vagas, {len(jobs[0][1])} destinatários "
+                  f"acompanhados por vaga...")
+            stats["notifications"] = LatencyStats(total=False)  # job creation vs. fan-out times
+            for create, recipients in jobs:
+                await fanout(create, recipients)
+            stats["notifications"].stop()
+    finally:
+        await asyncio.gather(*(client.disconnect() for client in clients if client), return_exceptions=True)
+        await session.close()
+
+
+def run_chat(args, base, accounts, edges, jobs):
+    """Load the sockets with the accounts and jobs seed-data.py prepared, then print and save the report.
+
+    `accounts` holds (email, token, doctorId, city, state) and `edges` pairs of
+    account positions, for the `connections` topology. Returns the number of
+    messages lost or misrouted.
+    """
+    stats = {}
+    counts = dict.fromkeys(("sockets", "connected", "connect_errors", "sent", "acked", "send_errors", "delivered",
+                            "late", "lost", "misrouted", "duplicated", "foreign", "jobs_failed", "notified",
+                            "not_notified"), 0)
+    counts["sockets"] = len(accounts)
+    asyncio.run(chat_traffic(args, base, accounts, edges, jobs, stats, counts))
+    for phase in ("connect", "messages", "notifications"):
+        if phase not in stats:
+            stats[phase] = LatencyStats(total=False)
+            stats[phase].stop()
+
+    print("\n" + "=" * 60)
+    print("RESULTADO DO CHAT")
+    print("=" * 60)
+    print(f"  Sockets: {counts['connected']} de {counts['sockets']} conectados"
+          + (f" ({counts['connect_errors']} falhas: {counts['connect_error']})" if counts["connect_errors"] else ""))
+    print(f"  Mensagens: {counts['acked']} de {counts['sent']} confirmadas, {counts['delivered']} entregues, "
+          f"{counts['lost']} perdidas, {counts['misrouted']} no socket errado, {counts['duplicated']} duplicadas")
+    if counts["late"]:
+        print(f"  ! {counts['late']} entregues depois de o ack falhar ou expirar (--timeout {args.timeout:g}s)")
+    if counts["foreign"]:
+        print(f"  ! {counts['foreign']} new_message de fora desta carga (outra execução ou usuários reais)")
+    if jobs:
+        print(f"  Notificações: {counts['notified']} de {counts['notified'] + counts['not_notified']} recebidas "
+              f"em até {args.fanout_timeout:g}s, {counts['jobs_failed']} vagas não criadas "
+              f"(polling a cada {args.poll_interval:g}s)")
+    print("-" * 60)
+    print("  Conexões")
+    stats["connect"].print_table()
+    print("  Mensagens")
+    stats["messages"].print_table()
+    if jobs:
+        print("  Notificações")
+        stats["notifications"].print_table()
+    problems = counts["lost"] + counts["misrouted"]
+    report = stats["messages"].to_json(base=base, socket_url=args.socket_url, topology=args.topology,
+                                       concurrency=args.concurrency, target_rps=args.rps, summary=counts,
+                                       connect=stats["connect"].summary(),
+                                       notifications=stats["notifications"].summary())
+    if args.json_out == "-":
+        print(json.dumps(report, indent=2))
+    elif args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"  Relatório JSON: {args.json_out}")
+    print("  ✓ Todas as mensagens confirmadas foram entregues" if not problems
+          else f"  ✗ {problems} mensagens perdidas ou no socket errado")
+    print("=" * 60)
+    return problems
+
+
+def chat_accounts(args, dataset, tokens):
+    """(email, token, doctorId, city, state) of up to --sockets seeded doctors we can get a token for."""
+    def account(doc):
+        token = tokens.token(doc["email"])
+        return token and (doc["email"], token, tokens.doctor_id(doc["email"]), doc.get("city"), doc.get("state"))
+
+    doctors = itertools.islice(dataset.doctors(), args.sockets)
+    return sorted(account for _, account, _ in run_parallel(account, doctors, args.concurrency)
+                  if account and account[2])
+
+
+def chat(args, dataset, tokens):
+    """Load the /chat gateway and the notification fan-out with the seeded accounts.
+
+    1. One socket.io connection per account (up to --sockets seeded doctors)
+       on the /chat namespace, with ?userId= like the app.
+    2. --messages send_message events along --topology. Each one is timed to
+       its ack (the message the handler returns) and, end to end, to its
+       new_message on the receiver's socket; ids in the content tell
+       deliveries apart, so misrouted and duplicated ones are counted too.
+    3. --jobs jobs are created in the city with the most accounts: the
+       JOB_CREATED handler notifies every doctor of that city. Notifications
+       are not pushed on a socket, so --fanout-sample of those doctors poll
+       GET /notifications every --poll-interval; times are as fine as that.
+
+    Returns the number of messages lost or misrouted.
+    """
+    print("=" * 60)
+    print("MedConnect - Carga do chat")
+    print(f"Concorrência: {args.concurrency}, {args.sockets} sockets, topologia {args.topology}, "
+          f"{args.messages} mensagens, {args.jobs} vagas de fan-out")
+    print("=" * 60)
+    tokens.probe(dataset.first_email())
+    accounts = chat_accounts(args, dataset, tokens)
+    if len(accounts) < 2:
+        print("  ✗ Menos de dois médicos semeados aceitaram login; rode o seed antes do chat")
+        sys.exit(1)
+    print(f"  Contas: {len(accounts)}")
+    index = {account[0]: i for i, account in enumerate(accounts)}
+    edges = []
+    if args.topology == "connections":
+        edges = [(index[a], index[b]) for a, b in dataset.connections() if a in index and b in index]
+
+    jobs = []
+    template = next(iter(dataset.jobs()), None)
+    cities = {}
+    for email, token, _, city, state in accounts:
+        if city and state:
+            cities.setdefault((city, state), []).append((email, token))
+    if args.jobs and template and cities:
+        (city, state), recipients = max(cities.items(), key=lambda item: len(item[1]))
+        recipients = random.Random(args.seed).sample(recipients, min(args.fanout_sample, len(recipients)))
+        admin_token = tokens.token("demo@medconnect.com") or accounts[0][1]
+        spec_name_to_id = {s["name"]: s["id"] for s in get_specialties(admin_token) or ()}
+        for k in range(args.jobs):
+            job = {**template, "title": f"{template['title']} [chat {k}]", "city": city, "state": state}
+            jobs.append((functools.partial(create_job, admin_token, job_payload(job, spec_name_to_id)),
+                         recipients))
+        print(f"  Fan-out em {city}/{state}: {len(cities[(city, state)])} contas na cidade")
+    elif args.jobs:
+        print("  ! Sem vagas no dataset ou contas com cidade; pulando o fan-out de notificações")
+
+    return run_chat(args, seed_http.BASE, accounts, edges, jobs)
+
+
+def add_parser(commands, parents):
+    """The `chat` subparser: sockets, topology, message rate and the fan-out jobs."""
+    parser = commands.add_parser("chat", parents=[parents.http, parents.data, parents.mock],
+                                 help="Carga do gateway /chat e do fan-out de notificações",
+                                 description="Abre um socket.io /chat por médico semeado, troca mensagens "
+                                             "na topologia escolhida e mede a entrega ponta a ponta e o "
+                                             "fan-out das notificações de vagas.")
+    parser.add_argument("--sockets", type=int, default=200, help="Sockets abertos, um por médico semeado")
+    parser.add_argument("--topology", choices=CHAT_TOPOLOGIES, default="pairs",
+                        help="Quem conversa com quem: pares fixos, anel, estrela com --hubs contas quentes, "
+                             "pares aleatórios ou o grafo de conexões semeado")
+    parser.add_argument("--hubs", type=int, default=1, help="Contas centrais da topologia star")
+    parser.add_argument("--messages", type=int, default=2000, help="Mensagens enviadas")
+    parser.add_argument("--rps", type=float,
+                        help="Taxa alvo em open-loop; sem ela, --concurrency mensagens aguardam o ack")
+    parser.add_argument("--drain", type=float, default=10.0,
+                        help="Espera máxima pelas entregas pendentes depois do último envio, em segundos")
+    parser.add_argument("--jobs", type=int, default=3,
+                        help="Vagas criadas para medir o fan-out de notificações (0 desativa)")
+    parser.add_argument("--fanout-sample", type=int, default=50,
+                        help="Destinatários de cada vaga que acompanham GET /notifications")
+    parser.add_argument("--poll-interval", type=float, default=0.2,
+                        help="Intervalo do polling das notificações, em segundos (a precisão do fan-out)")
+    parser.add_argument("--fanout-timeout", type=float, default=30.0,
+                        help="Espera máxima pela notificação de cada destinatário, em segundos")
+    parser.add_argument("--socket-url",
+                        help="Origem do socket.io (padrão: esquema, host e porta de --base-url)")
+    parser.add_argument("--json-out", default=DEFAULT_CHAT_REPORT,
+                        help="Arquivo do relatório JSON ('-' imprime no stdout, '' desativa)")
+    return parser
+
+
+def check_args(parser, args):
+    """Sizes, rates and timeouts of the chat load that argparse types cannot bound."""
+    if args.sockets < 2:
+        parser.error("--sockets deve ser pelo menos 2")
+    if args.topology == "star" and not 1 <= args.hubs < args.sockets:
+        parser.error("--hubs deve estar entre 1 e --sockets - 1")
+    if args.rps is not None and args.rps <= 0:
+        parser.error("--rps deve ser maior que 0")
+    if min(args.poll_interval, args.fanout_timeout) <= 0:
+        parser.error("--poll-interval e --fanout-timeout devem ser maiores que 0")
@@ -0,0 +1,276 @@
+"""Contrato da API do backend compartilhado pelo seed-data.py e pelos módulos irmãos."""
+import base64
+import math
+import re
+import threading
+import time
+import unicodedata
+from array import array
+
+# ─────────────────────────────────────────────────────────────
+# CONTRATO DA API (campos dos DTOs, catálogo de especialidades, contas do prisma/seed.ts)
+# ─────────────────────────────────────────────────────────────
+
+# (required, optional) body fields of the backend DTOs this script sends. The global
+# ValidationPipe runs with whitelist + forbidNonWhitelisted, so anything else is a 400.
+DTO_FIELDS = {
+    "register": ({"email", "password", "fullName", "crm", "crmState"}, {"phone", "role"}),
+    "login": ({"email", "password"}, set()),
+    "refresh": ({"refreshToken"}, set()),
+    "update_doctor": (set(), {"fullName", "phone", "bio", "profilePicUrl", "graduationYear", "universityName",
+                              "city", "state", "latitude", "longitude"}),
+    "add_specialty": ({"specialtyId"}, {"isPrimary", "rqeNumber"}),
+    "institution": ({"name", "type", "city", "state"},
+                    {"cnpj", "phone", "email", "website", "description", "street", "number", "complement",
+                     "neighborhood", "zipCode", "latitude", "longitude"}),
+    "job": ({"title", "type", "description", "shift", "city", "state"},
+            {"requirements", "salaryMin", "salaryMax", "specialtyId", "startsAt", "expiresAt"}),
+    "post": ({"content"}, {"postType", "mediaUrls", "tags"}),
+    "comment": ({"content"}, set()),
+    "register_patient": ({"email", "password", "fullName"}, {"cpf", "phone", "state", "city"}),
+    "workplace": ({"name", "street", "number", "neighborhood", "city", "state", "zipCode", "latitude", "longitude"},
+                  {"phone", "complement"}),
+    "availability": ({"workplaceId", "dayOfWeek", "startTime", "endTime"}, {"slotDurationMin"}),
+    "appointment": ({"doctorId", "workplaceId", "scheduledAt"}, {"type", "reason"}),
+    "search_doctors": ({"latitude", "longitude"},
+                       {"radiusKm", "specialtyId", "date", "preferredTime", "page", "limit"}),
+    "cancel_appointment": (set(), {"reason"}),
+    # ChatGateway's send_message payload; socket events skip the ValidationPipe, the mock checks them anyway
+    "chat_message": ({"receiverId", "content"}, {"chatId", "messageType", "mediaUrl"}),
+}
+
+# What the helpers below send: the profile fields /auth/register does not take go to
+# PUT /doctors/me, and jobs carry every CreateJobDto field but specialtyId (mapped from specName)
+PROFILE_FIELDS = tuple(sorted(DTO_FIELDS["update_doctor"][1] - DTO_FIELDS["register"][0] - DTO_FIELDS["register"][1]))
+JOB_FIELDS = tuple(sorted(DTO_FIELDS["job"][0] | DTO_FIELDS["job"][1] - {"specialtyId"}))
+
+# Same codes as prisma/seed.ts, so a later `prisma db seed` upserts onto the exported rows
+SPECIALTY_CODES = {
+    "Cardiologia": "CARDIO",
+    "Neurologia": "NEURO",
+    "Cirurgia Geral": "CIRGER",
+    "Pediatria": "PED",
+    "Ortopedia e Traumatologia": "ORTO",
+    "Dermatologia": "DERMA",
+    "Medicina Intensiva": "UTI",
+    "Medicina de Emergência": "EMERG",
+    "Clínica Médica": "CLINMED",
+}
+
+# Accounts created by prisma/seed.ts; the seed logs into them instead of registering
+EXISTING_ACCOUNTS = [
+    ("demo@medconnect.com", "Demo@2026"),
+    ("joao.silva@medconnect.com", "Senha@2026"),
+    ("maria.santos@medconnect.com", "Senha@2026"),
+    ("pedro.lima@medconnect.com", "Senha@2026"),
+    ("ana.costa@medconnect.com", "Senha@2026"),
+    ("carlos.oliveira@medconnect.com", "Senha@2026"),
+    ("julia.mendes@medconnect.com", "Senha@2026"),
+    ("ricardo.ferreira@medconnect.com", "Senha@2026"),
+    ("lucas.barbosa@medconnect.com", "Senha@2026"),
+    ("fernanda.alves@medconnect.com", "Senha@2026"),
+]
+
+# Prisma's DayOfWeek enum, in date.weekday() order; availability windows use "HH:MM"
+DAY_NAMES = ("MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY", "SATURDAY", "SUNDAY")
+
+_ID_SEGMENT = re.compile(r"/(?:[0-9a-fA-F]{8}-[0-9a-fA-F-]{27}|[0-9a-fA-F]{24,}|\d+)(?=/|$)")
+
+
+def minutes(hhmm):
+    hours, _, mins = hhmm.partition(":")
+    return int(hours) * 60 + int(mins)
+
+
+def endpoint_label(method, path):
+    """Group key of a call: "POST /feed/posts/:id/like" for any post id."""
+    return f"{method} {_ID_SEGMENT.sub('/:id', path)}"
+
+
+def ascii_slug(text):
+    """'Débora' -> 'debora' (emails must be plain ASCII)."""
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().lower().replace(" ", "")
+
+
+# ─────────────────────────────────────────────────────────────
+# MÉTRICAS DE LATÊNCIA
+# ─────────────────────────────────────────────────────────────
+
+class LatencyHistogram:
+    """Log-scale latency histogram: fixed memory however many samples it counts.
+
+    Bucket i holds [MIN_SECONDS * GROWTH**i, MIN_SECONDS * GROWTH**(i + 1)), so a
+    percentile read back is within 1% of the exact one; count, mean and max
+    are exact.
+    """
+
+    MIN_SECONDS = 1e-6
+    GROWTH = 1.01
+    BUCKETS = 2100  # 1µs up to ~20 min; anything slower lands in the last bucket
+    _LOG_GROWTH = math.log(GROWTH)
+
+    def __init__(self):
+        self.counts = array("q", bytes(8 * self.BUCKETS))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        i = int(math.log(seconds / self.MIN_SECONDS) / self._LOG_GROWTH) if seconds > self.MIN_SECONDS else 0
+        self.counts[min(i, self.BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other):
+        counts = self.counts
+        for i, n in enumerate(other.counts):
+            if n:
+                counts[i] += n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def copy(self):
+        clone = LatencyHistogram()
+        clone.merge(self)
+        return clone
+
+    def percentile(self, p):
+        """Nearest-rank percentile, as the geometric middle of its bucket (never above the max)."""
+        rank = max(1, math.ceil(p / 100 * self.count))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(self.MIN_SECONDS * self.GROWTH ** (i + 0.5), self.max)
+        return self.max
+
+    def state(self):
+        return {"counts": base64.b64encode(self.counts.tobytes()).decode(),
+                "count": self.count, "total": self.total, "max": self.max}
+
+    @classmethod
+    def from_state(cls, state):
+        histogram = cls()
+        histogram.counts = array("q", base64.b64decode(state["counts"]))
+        histogram.count, histogram.total, histogram.max = state["count"], state["total"], state["max"]
+        return histogram
+
+
+class LatencyStats:
+    """Per-endpoint latency samples and error counts, safe to feed from worker threads.
+
+    Samples are kept in full (8 bytes each in an array) so the percentiles are
+    exact nearest-rank values, not estimates. With exact=False each endpoint
+    gets a LatencyHistogram instead, for recorders that see every request of
+    an unbounded run. total=False leaves out the "total" row, for groups that
+    time different things.
+    """
+
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self, exact=True, total=True):
+        self.exact = exact
+        self.total = total
+        self.samples = {}  # endpoint -> array('d') of seconds, or a LatencyHistogram if not exact
+        self.errors = {}   # endpoint -> failed calls
+        self.bytes = {}    # endpoint -> response bytes
+        self.started = time.perf_counter()
+        self.wall = None
+        self._lock = threading.Lock()
+
+    def add(self, endpoint, seconds, ok=True, nbytes=0):
+        with self._lock:
+            samples = self.samples.get(endpoint)
+            if samples is None:
+                samples = self.samples[endpoint] = array("d") if self.exact else LatencyHistogram()
+                self.errors[endpoint] = 0
+                self.bytes[endpoint] = 0
+            if self.exact:
+                samples.append(seconds)
+            else:
+                samples.add(seconds)
+            self.bytes[endpoint] += nbytes
+            if not ok:
+                self.errors[endpoint] += 1
+
+    def stop(self):
+        self.wall = time.perf_counter() - self.started
+
+    @staticmethod
+    def percentile(ordered, p):
+        """Nearest-rank percentile of an already sorted sequence."""
+        return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+    def summary(self):
+        """endpoint -> {requests, errors, bytes, rps, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}, plus a "total" row."""
+        wall = self.wall if self.wall is not None else time.perf_counter() - self.started
+        with self._lock:
+            if self.exact:
+                groups = {endpoint: sorted(samples) for endpoint, samples in self.samples.items()}
+            else:
+                groups = {endpoint: histogram.copy() for endpoint, histogram in self.samples.items()}
+            errors = dict(self.errors)
+            nbytes = dict(self.bytes)
+        if self.total and len(groups) > 1:
+            if self.exact:
+                groups["total"] = sorted(s for samples in groups.values() for s in samples)
+            else:
+                total = LatencyHistogram()
+                for histogram in groups.values():
+                    total.merge(histogram)
+                groups["total"] = total
+            errors["total"] = sum(errors.values())
+            nbytes["total"] = sum(nbytes.values())
+        result = {}
+        for endpoint, group in groups.items():
+            if self.exact:
+                count, total, top = len(group), sum(group), group[-1]
+                percentiles = [self.percentile(group, p) for p in self.PERCENTILES]
+            else:
+                count, total, top = group.count, group.total, group.max
+                percentiles = [group.percentile(p) for p in self.PERCENTILES]
+            row = {
+                "requests": count,
+                "errors": errors[endpoint],
+                "bytes": nbytes[endpoint],
+                "rps": round(count / wall, 2) if wall else 0.0,
+                "mean_ms": round(total / count * 1000, 2),
+            }
+            for p, value in zip(self.PERCENTILES, percentiles):
+                row[f"p{p}_ms"] = round(value * 1000, 2)
+            row["max_ms"] = round(top * 1000, 2)
+            result[endpoint] = row
+        return result
+
+    def print_table(self):
+        print(f"  {'Endpoint':<34} {'Req':>7} {'Erros':>6} {'Req/s':>8} "
+              f"{'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  (ms)")
+        for endpoint, row in self.summary().items():
+            print(f"  {endpoint:<34} {row['requests']:>7} {row['errors']:>6} {row['rps']:>8.1f} "
+                  f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f}")
+
+    def to_json(self, **extra):
+        return {**extra, "wall_s": round(self.wall or 0.0, 3), "endpoints": self.summary()}
+
+    def state(self):
+        """Raw samples (base64 of the float64 arrays, or histogram states) for merging in another process."""
+        with self._lock:
+            if self.exact:
+                samples = {key: base64.b64encode(samples.tobytes()).decode() for key, samples in self.samples.items()}
+            else:
+                samples = {key: histogram.state() for key, histogram in self.samples.items()}
+            return {"samples": samples, "errors": dict(self.errors), "bytes": dict(self.bytes)}
+
+    def merge(self, state):
+        """Add the samples of another LatencyStats.state() of the same kind; exact percentiles stay exact."""
+        with self._lock:
+            for key, encoded in state["samples"].items():
+                if self.exact:
+                    self.samples.setdefault(key, array("d")).frombytes(base64.b64decode(encoded))
+                else:
+                    self.samples.setdefault(key, LatencyHistogram()).merge(LatencyHistogram.from_state(encoded))
+                self.errors[key] = self.errors.get(key, 0) + state["errors"][key]
+                self.bytes[key] = self.bytes.get(key, 0) + state["bytes"][key]
@@ -0,0 +1,826 @@
+"""Datasets do seed-data.py: gerador sintético, specs JSON/YAML/JSONL e a fatia de cada shard."""
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import sys
+from array import array
+
+try:
+    import yaml  # only needed for YAML spec files
+except ImportError:
+    yaml = None
+
+from seed_common import DTO_FIELDS, EXISTING_ACCOUNTS, JOB_FIELDS, PROFILE_FIELDS, SPECIALTY_CODES, ascii_slug
+from seed_state import ByteArena, Registry, post_key
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_SPEC = os.path.join(SCRIPT_DIR, "seed-specs", "demo.json")
+
+FIRST_NAMES_M = ["Ademar", "Bruno", "Carlos", "Diego", "Eduardo", "Felipe", "Gustavo", "Henrique", "Iago", "João",
+                 "Leonardo", "Mateus", "Nelson", "Otávio", "Paulo", "Renato", "Samuel", "Tiago", "Vinícius", "Wagner"]
+FIRST_NAMES_F = ["Adriana", "Bianca", "Camila", "Débora", "Elisa", "Fernanda", "Giovana", "Heloísa", "Isabela", "Joana",
+                 "Karina", "Letícia", "Mariana", "Nathália", "Olívia", "Priscila", "Renata", "Simone", "Tatiana", "Viviane"]
+SURNAMES = ["Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes",
+            "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida", "Lopes", "Soares", "Fernandes", "Vieira", "Barbosa",
+            "Rocha", "Dias", "Nascimento", "Andrade", "Moreira", "Nunes", "Marques", "Machado", "Mendes", "Freitas"]
+# (city, state, DDD, university)
+CITIES = [
+    ("São Paulo", "SP", "11", "USP"), ("Campinas", "SP", "19", "UNICAMP"), ("Ribeirão Preto", "SP", "16", "USP-RP"),
+    ("Rio de Janeiro", "RJ", "21", "UFRJ"), ("Niterói", "RJ", "21", "UFF"), ("Belo Horizonte", "MG", "31", "UFMG"),
+    ("Uberlândia", "MG", "34", "UFU"), ("Porto Alegre", "RS", "51", "UFRGS"), ("Curitiba", "PR", "41", "UFPR"),
+    ("Londrina", "PR", "43", "UEL"), ("Florianópolis", "SC", "48", "UFSC"), ("Salvador", "BA", "71", "UFBA"),
+    ("Recife", "PE", "81", "UFPE"), ("Fortaleza", "CE", "85", "UFC"), ("Brasília", "DF", "61", "UnB"),
+    ("Goiânia", "GO", "62", "UFG"), ("Manaus", "AM", "92", "UFAM"), ("Belém", "PA", "91", "UFPA"),
+    ("Natal", "RN", "84", "UFRN"), ("Vitória", "ES", "27", "UFES"),
+]
+# Specialty -> (bio template, post tags, job title template)
+SPECIALTY_PROFILES = {
+    "Cardiologia": ("Cardiologista com {years} anos de experiência em {focus}.", ["cardiologia", "ECG", "prevenção"],
+                    ["hemodinâmica", "insuficiência cardíaca", "ecocardiografia"]),
+    "Neurologia": ("Neurologista com {years} anos de experiência em {focus}.", ["neurologia", "AVC", "cefaleia"],
+                   ["doenças neurodegenerativas", "epilepsia", "AVC"]),
+    "Cirurgia Geral": ("Cirurgião geral com {years} anos de experiência em {focus}.", ["cirurgia", "videolaparoscopia"],
+                       ["cirurgia minimamente invasiva", "trauma", "cirurgia do aparelho digestivo"]),
+    "Pediatria": ("Pediatra com {years} anos de experiência em {focus}.", ["pediatria", "neonatologia", "vacinação"],
+                  ["neonatologia", "puericultura", "emergência pediátrica"]),
+    "Ortopedia e Traumatologia": ("Ortopedista com {years} anos de experiência em {focus}.", ["ortopedia", "trauma"],
+                                  ["cirurgia do joelho", "coluna", "medicina esportiva"]),
+    "Dermatologia": ("Dermatologista com {years} anos de experiência em {focus}.", ["dermatologia", "melanoma"],
+                     ["dermatologia clínica", "dermatoscopia", "cirurgia dermatológica"]),
+    "Medicina Intensiva": ("Intensivista com {years} anos de experiência em {focus}.", ["UTI", "sepse", "ventilação"],
+                           ["UTI adulto", "sepse", "ventilação mecânica"]),
+    "Medicina de Emergência": ("Emergencista com {years} anos de experiência em {focus}.", ["emergência", "protocolo"],
+                               ["pronto-socorro", "trauma", "suporte avançado de vida"]),
+    "Clínica Médica": ("Clínico geral com {years} anos de experiência em {focus}.", ["clínica médica", "atenção primária"],
+                       ["medicina interna", "doenças crônicas", "ambulatório"]),
+}
+INSTITUTION_KINDS = [("HOSPITAL", "Hospital"), ("CLINICA", "Clínica"), ("PRONTO_SOCORRO", "UPA 24h"),
+                     ("LABORATORIO", "Laboratório"), ("UBS", "UBS")]
+INSTITUTION_PATRONS = ["São Lucas", "Santa Clara", "Santa Casa", "Bom Jesus", "Vida", "Esperança", "Santa Mônica",
+                       "São Camilo", "Nossa Senhora", "Central", "Regional", "Universitário"]
+POST_OPENERS = ["Caso interessante hoje no plantão:", "Compartilhando uma atualização de protocolo:",
+                "Dica rápida para colegas:", "Discussão da semana:", "Revisão de literatura:"]
+POST_BODIES = ["vale revisar a conduta em {focus}, os dados recentes mudam a prática.",
+               "a equipe implementou um novo fluxo para {focus} com ótimos resultados.",
+               "quem mais tem acompanhado a evolução das diretrizes de {focus}?",
+               "diagnóstico precoce em {focus} continua sendo o que mais impacta o desfecho."]
+JOB_KINDS = [("PLANTAO", "Plantão"), ("CONSULTA", "Consultas")]
+JOB_SHIFTS = ["DIURNO", "NOTURNO", "INTEGRAL", "FLEXIVEL"]
+COMMENTS = ["Excelente caso, doutor!", "Obrigado por compartilhar.", "Muito útil para a prática diária.",
+            "Tivemos um caso parecido no nosso serviço.", "Qual foi a conduta no seguimento?",
+            "Concordo, as diretrizes novas mudaram bastante a abordagem."]
+
+
+def parse_scale(spec):
+    """'doctors=100000,posts=1000000' -> {'doctors': 100000, 'posts': 1000000}."""
+    sizes = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        key, _, value = part.partition("=")
+        if key not in SyntheticDataset.DEFAULT_RATIOS and key != "doctors":
+            raise argparse.ArgumentTypeError(f"entidade desconhecida em --scale: {key!r}")
+        try:
+            sizes[key] = int(float(value))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"valor inválido em --scale: {part!r}")
+    return sizes
+
+
+# Engagement kinds with at most one event per actor and post (the backend stores a new
+# row for every bookmark call, so bookmarks are kept distinct too)
+DISTINCT_ENGAGEMENT = ("likes", "bookmarks")
+
+
+def engagement_sizes(sizes, n_posts, n_actors):
+    """`sizes` with likes and bookmarks capped at what distinct actors per post can produce."""
+    return {**sizes, **{key: min(sizes[key], n_posts * n_actors) for key in DISTINCT_ENGAGEMENT if key in sizes}}
+
+
+def zipf_counts(n, total, exponent, cap=None):
+    """Events per popularity rank (index r - 1), proportional to r**-exponent and summing to `total`.
+
+    Ranks whose share exceeds `cap` are held at it and the rest is spread
+    over the others; the fractions left by the floors go to the largest
+    remainders (ties to the more popular rank), so the sum is exact.
+    """
+    counts = array("l", [0]) * n
+    if cap is not None:
+        total = min(total, cap * n)
+    if not n or total <= 0:
+        return counts
+    weights = array("d", (r ** -exponent for r in range(1, n + 1)))
+    tail = math.fsum(weights)
+    saturated = 0
+    while cap is not None and saturated < n and (total - saturated * cap) * weights[saturated] / tail > cap:
+        counts[saturated] = cap
+        tail -= weights[saturated]
+        saturated += 1
+    rest = total - saturated * (cap or 0)
+    remainders = array("d", [0.0]) * n
+    for i in range(saturated, n):
+        expected = rest * weights[i] / tail
+        counts[i] = int(expected)
+        remainders[i] = expected - counts[i]
+    missing = max(0, min(n - saturated, rest - sum(counts[saturated:])))
+    if missing:
+        threshold = sorted(remainders[saturated:], reverse=True)[missing - 1]
+        for i in range(saturated, n):
+            if missing and remainders[i] > threshold:
+                counts[i] += 1
+                missing -= 1
+        for i in range(saturated, n):
+            if missing and remainders[i] == threshold:
+                counts[i] += 1
+                missing -= 1
+    return counts
+
+
+def zipf_engagement(posts, n_posts, sizes, actor_email, n_actors, rng_for, exponent):
+    """Yield like, comment and bookmark events for `posts`, each post's share following Zipf's law.
+
+    The post with popularity rank r gets zipf_counts()[r - 1] events of each
+    kind, so every kind adds up to exactly sizes[kind]. Ranks are spread over
+    the stream with a fixed stride instead of a stored shuffle, so the hot
+    posts are not all at the start. Likes and bookmarks come from distinct
+    actors per post, so they are capped at n_actors per post (and at
+    engagement_sizes() in total).
+    """
+    if not n_posts or not n_actors:
+        return
+    counts = {kind: zipf_counts(n_posts, sizes.get(size, 0), exponent,
+                                cap=n_actors if size in DISTINCT_ENGAGEMENT else None)
+              for kind, size in (("like", "likes"), ("comment", "comments"), ("bookmark", "bookmarks"))}
+    stride = int(n_posts * 0.618) | 1
+    while math.gcd(stride, n_posts) != 1:
+        stride += 2
+    for i, post in enumerate(posts):
+        rng = rng_for(i)
+        rank = (i * stride) % n_posts
+        key = post_key(post)
+        for kind in ("like", "comment", "bookmark"):
+            count = counts[kind][rank]
+            if kind == "comment":
+                actors = [rng.randrange(n_actors) for _ in range(count)]
+            else:
+                actors = rng.sample(range(n_actors), count)
+            for n, actor in enumerate(actors):
+                event = {"kind": kind, "post": key, "author": post["email"], "email": actor_email(actor), "n": n}
+                if kind == "comment":
+                    event["content"] = rng.choice(COMMENTS)
+                yield event
+
+
+def engagement_key(event):
+    """Journal key of an engagement event, unique within its kind."""
+    return f"{event['post']}|{event['email']}|{event['n']}"
+
+
+class SyntheticDataset:
+    """Deterministic generated dataset; every record is a pure function of (seed, kind, index).
+
+    Nothing is materialised: each method is a generator, so any range of any
+    entity can be regenerated on demand without holding the rest in memory.
+    """
+
+    # Per-doctor defaults for sizes not given in --scale
+    DEFAULT_RATIOS = {"institutions": 0.02, "jobs": 0.1, "connections": 5, "posts": 2,
+                      "likes": 10, "comments": 2, "bookmarks": 1}
+    CRM_BASE = 500000  # above the hand-written CRMs (2010xx)
+    EMAIL_CACHE_SIZE = 1 << 16
+
+    def __init__(self, sizes, seed=42, graph="powerlaw", exponent=2.5, rewire=0.1, zipf=1.1):
+        doctors = sizes.get("doctors", 1000)
+        self.sizes = {"doctors": doctors}
+        for key, ratio in self.DEFAULT_RATIOS.items():
+            self.sizes[key] = sizes.get(key, max(1, int(doctors * ratio)))
+        self.sizes = engagement_sizes(self.sizes, self.sizes["posts"], doctors)
+        self.seed = seed
+        self.graph = graph
+        self.exponent = exponent
+        self.rewire = rewire
+        self.zipf = zipf
+        self.spec_names = list(SPECIALTY_CODES)
+        self._emails = {}
+
+    def _rng(self, kind, i):
+        return random.Random(f"{self.seed}:{kind}:{i}")
+
+    def doctor_email(self, i):
+        # Bounded per-dataset cache: edges hit low-index hubs over and over, and each
+        # address costs a seeded Random
+        cached = self._emails.get(i)
+        if cached is None:
+            if len(self._emails) >= self.EMAIL_CACHE_SIZE:
+                self._emails.clear()
+            rng = self._rng("name", i)
+            first = rng.choice(FIRST_NAMES_M if i % 2 else FIRST_NAMES_F)
+            last = rng.choice(SURNAMES)
+            cached = self._emails[i] = (f"{ascii_slug(first)}.{ascii_slug(last)}.{i}@medconnect.com", first, last)
+        return cached
+
+    def doctor(self, i):
+        email, first, last = self.doctor_email(i)
+        rng = self._rng("doctor", i)
+        city, state, ddd, university = rng.choice(CITIES)
+        spec_name = self.spec_names[i % len(self.spec_names)]
+        bio, _, focuses = SPECIALTY_PROFILES[spec_name]
+        graduation = rng.randint(1985, 2020)
+        return {
+            "email": email, "password": "Senha@2026",
+            "fullName": f"{'Dr.' if i % 2 else 'Dra.'} {first} {last}",
+            "crm": str(self.CRM_BASE + i), "crmState": state,
+            "phone": f"{ddd}9{rng.randint(10000000, 99999999)}",
+            "city": city, "state": state,
+            "bio": bio.format(years=max(1, 2026 - graduation - 6), focus=rng.choice(focuses)),
+            "graduationYear": graduation, "universityName": university,
+            "specName": spec_name,
+        }
+
+    def doctors(self):
+        return (self.doctor(i) for i in range(self.sizes["doctors"]))
+
+    def first_email(self):
+        return self.doctor_email(0)[0]
+
+    def password(self, email):
+        return "Senha@2026"
+
+    def has_doctor(self, email):
+        return self.doctor_index(email) is not None
+
+    def doctor_index(self, email):
+        """Index of a generated doctor (it is part of the address), or None."""
+        local = email.partition("@")[0]
+        index = local.rpartition(".")[2]
+        if not index.isdigit() or int(index) >= self.sizes["doctors"]:
+            return None
+        return int(index) if self.doctor_email(int(index))[0] == email else None
+
+    def existing_accounts(self):
+        return iter(EXISTING_ACCOUNTS)
+
+    def foreign_accounts(self):
+        return iter(())
+
+    def specialty_assignments(self):
+        for i in range(self.sizes["doctors"]):
+            yield self.doctor_email(i)[0], self.spec_names[i % len(self.spec_names)]
+
+    def institutions(self):
+        for i in range(self.sizes["institutions"]):
+            rng = self._rng("institution", i)
+            inst_type, prefix = rng.choice(INSTITUTION_KINDS)
+            city, state, _, _ = rng.choice(CITIES)
+            yield {
+                "name": f"{prefix} {rng.choice(INSTITUTION_PATRONS)} de {city} {i:05d}",
+                "type": inst_type, "city": city, "state": state,
+                "description": f"{prefix} de referência em {city}/{state}.",
+                "neighborhood": "Centro",
+            }
+
+    def jobs(self):
+        for i in range(self.sizes["jobs"]):
+            rng = self._rng("job", i)
+            spec_name = rng.choice(self.spec_names)
+            _, _, focuses = SPECIALTY_PROFILES[spec_name]
+            job_type, label = rng.choice(JOB_KINDS)
+            city, state, _, _ = rng.choice(CITIES)
+            salary_min = rng.randrange(500, 4000, 100)
+            yield {
+                "title": f"{label} {spec_name} - {focuses[i % len(focuses)]} #{i}",
+                "type": job_type, "shift": rng.choice(JOB_SHIFTS), "city": city, "state": state,
+                "description": f"Vaga para atuação em {focuses[i % len(focuses)]} em {city}/{state}.",
+                "requirements": f"Título de especialista em {spec_name}",
+                "salaryMin": salary_min, "salaryMax": salary_min + rng.randrange(200, 1500, 100),
+                "specName": spec_name,
+            }
+
+    def edges(self):
+        """Yield (i, j) doctor index pairs, each unordered pair at most once.
+
+        powerlaw: every doctor i links to earlier doctors picked as int(i * U**g),
+        so low indices become hubs and the degree distribution follows a power
+        law with the requested exponent (must be > 2).
+        smallworld: Watts–Strogatz ring lattice; each forward edge is rewired to a
+        random doctor with probability `rewire`. A pair both ends pick is kept
+        only on its lower end, so (i, j) and (j, i) never both appear.
+        """
+        n = self.sizes["doctors"]
+        avg = self.sizes["connections"] / max(1, n)
+        if self.graph == "smallworld":
+            half = max(1, round(avg))
+            for i in range(n):
+                for j in self._ring_targets(i, n, half):
+                    if j > i or i not in self._ring_targets(j, n, half):
+                        yield i, j
+        else:
+            rank_exponent = 1 / (self.exponent - 1)
+            g = 1 / (1 - rank_exponent) if rank_exponent < 1 else 8.0
+            for i in range(1, n):
+                rng = self._rng("edge", i)
+                m = min(i, int(avg) + (rng.random() < avg - int(avg)))
+                targets = set()
+                for _ in range(m * 4):
+                    if len(targets) >= m:
+                        break
+                    targets.add(int(i * rng.random() ** g))
+                for j in targets:
+                    yield i, j
+
+    def _ring_targets(self, i, n, half):
+        """Distinct smallworld neighbours doctor i picks: its forward lattice edges, some rewired."""
+        rng = self._rng("edge", i)
+        targets = []
+        for step in range(1, half + 1):
+            j = (i + step) % n
+            if rng.random() < self.rewire:
+                j = rng.randrange(n)
+            if j != i and j not in targets:
+                targets.append(j)
+        return targets
+
+    def connections(self):
+        for i, j in self.edges():
+            yield self.doctor_email(i)[0], self.doctor_email(j)[0]
+
+    def posts(self):
+        n = self.sizes["doctors"]
+        for i in range(self.sizes["posts"]):
+            rng = self._rng("post", i)
+            author = rng.randrange(n)
+            spec_name = self.spec_names[author % len(self.spec_names)]
+            _, tags, focuses = SPECIALTY_PROFILES[spec_name]
+            focus = rng.choice(focuses)
+            yield {
+                "email": self.doctor_email(author)[0],
+                "content": f"{rng.choice(POST_OPENERS)} {rng.choice(POST_BODIES).format(focus=focus)} #{tags[0]}",
+                "tags": tags,
+                "index": i,
+            }
+
+    def engagement(self):
+        return zipf_engagement(self.posts(), self.sizes["posts"], self.sizes,
+                               lambda i: self.doctor_email(i)[0], self.sizes["doctors"],
+                               lambda i: self._rng("engagement", i), self.zipf)
+
+# Fields a spec record may carry per kind: (required, optional). They follow what the
+# helpers send (DTO_FIELDS), so a record that passes here cannot be a 400 later.
+SPEC_FIELDS = {
+    "doctor": (DTO_FIELDS["register"][0], {"phone", *PROFILE_FIELDS}),
+    "specialty": ({"email", "specialty"}, set()),
+    "institution": DTO_FIELDS["institution"],
+    "job": (DTO_FIELDS["job"][0], set(JOB_FIELDS) - DTO_FIELDS["job"][0] | {"specName"}),
+    "connection": ({"sender", "receiver"}, set()),
+    "post": ({"email"} | DTO_FIELDS["post"][0], {"tags"}),
+}
+# Non-string fields: name -> (accepted types, description); every other field is a string
+SPEC_TYPES = {
+    "graduationYear": (int, "inteiro"),
+    "salaryMin": ((int, float), "número"),
+    "salaryMax": ((int, float), "número"),
+    "latitude": ((int, float), "número"),
+    "longitude": ((int, float), "número"),
+    "tags": (list, "lista"),
+}
+SPEC_SETTINGS = {
+    "generate": {"doctors", "seed", "graph", "exponent", "rewire", *SyntheticDataset.DEFAULT_RATIOS},
+    "engagement": {"likes", "comments", "bookmarks"},
+}
+
+
+def spec_record_errors(kind, record):
+    """Problems of one spec record against SPEC_FIELDS: not an object, unknown or missing fields, wrong types."""
+    if not isinstance(record, dict):
+        return ["o registro deve ser um objeto"]
+    required, optional = SPEC_FIELDS[kind]
+    problems = []
+    for key, value in record.items():
+        if key not in required and key not in optional:
+            problems.append(f"campo desconhecido {key!r}")
+        elif value is not None:
+            types, description = SPEC_TYPES.get(key, (str, "texto"))
+            if not isinstance(value, types) or isinstance(value, bool):
+                problems.append(f"{key!r} deve ser {description}")
+    problems += [f"campo obrigatório {key!r} ausente" for key in sorted(required) if record.get(key) in (None, "")]
+    return problems
+
+
+class SpecDataset:
+    """Dataset described by a spec file (--spec): literal records, generator rules, or both.
+
+    A spec is a JSON document (YAML too, with PyYAML installed) like
+    seed-specs/demo.json, with any of these sections:
+
+        "doctors", "institutions", "jobs", "posts": lists of records (SPEC_FIELDS)
+        "specialties": {"Cardiologia": [email, ...]} or [{"email": ..., "specialty": ...}]
+        "connections": [[sender, receiver], ...] or [{"sender": ..., "receiver": ...}]
+        "generate": SyntheticDataset sizes and options, e.g. {"doctors": 100000, "graph": "powerlaw"}
+        "engagement": {"likes": N, "comments": N, "bookmarks": N} for the literal posts
+
+    A list section can also be {"file": "doctors.jsonl"}, and the spec itself
+    can be a .jsonl file; in both, every line is one record, and a .jsonl
+    spec names each line's section with "kind" (doctor, specialty,
+    institution, job, connection, post, generate, engagement). Literal
+    records come first, then the generated ones.
+
+    The constructor checks every record, and the references between them,
+    in one streaming pass per section and exits listing the first problems;
+    it keeps only the doctors' emails (a Registry whose handles are the
+    literal indexes) and passwords. JSONL records are re-read from disk by
+    every stream, so memory does not grow with the file.
+    """
+
+    SECTIONS = {"doctors": "doctor", "specialties": "specialty", "institutions": "institution",
+                "jobs": "job", "connections": "connection", "posts": "post"}
+    TOP_LEVEL = {"version", "description", *SECTIONS, *SPEC_SETTINGS}
+    MAX_ERRORS = 20
+
+    def __init__(self, path, scale=None, zipf=1.1, **options):
+        self.path = path
+        self.zipf = zipf
+        self.jsonl = path.endswith(".jsonl")
+        self.errors = []
+        self.error_count = 0
+        self.document = None if self.jsonl else self._load(path)
+        settings = self._settings()
+        generate = dict(settings.get("generate") or {})
+        # Generator options given on the command line (seed, graph, exponent, rewire) win over the spec's
+        options = {**{key: generate.pop(key) for key in ("seed", "graph", "exponent", "rewire") if key in generate},
+                   **options}
+        self.seed = options.get("seed", 42)
+        sizes = scale or generate  # --scale replaces the spec's sizes, the other ratios follow from it
+        self.generated = None
+        if sizes:
+            self.generated = SyntheticDataset(sizes, zipf=zipf, **options)
+        self.emails = Registry()
+        self.passwords = ByteArena()
+        counts = self._validate()
+        if self.errors:
+            more = self.error_count - len(self.errors)
+            sys.exit(f"Spec inválida ({self.error_count} problema(s)):\n  " + "\n  ".join(self.errors)
+                     + (f"\n  ... e mais {more}" if more else ""))
+        n_posts = counts["posts"]
+        engagement = {"likes": 4 * n_posts, "comments": n_posts, "bookmarks": n_posts // 2,
+                      **(settings.get("engagement") or {})}
+        self.literal_sizes = engagement_sizes({**counts, **engagement}, n_posts, counts["doctors"])
+        self.n_doctors = counts["doctors"]
+        self.sizes = {key: self.literal_sizes.get(key, 0) + (self.generated.sizes[key] if self.generated else 0)
+                      for key in ("doctors", "institutions", "jobs", "connections", "posts",
+                                  "likes", "comments", "bookmarks")}
+
+    def _error(self, location, message):
+        self.error_count += 1
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append(f"{location}: {message}")
+
+    @staticmethod
+    def _load(path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                if path.endswith((".yaml", ".yml")):
+                    if yaml is None:
+                        sys.exit(f"{path}: specs YAML precisam do pyyaml (pip install pyyaml)")
+                    document = yaml.safe_load(f)
+                else:
+                    document = json.load(f)
+        except Exception as e:  # OSError, ValueError from json, yaml.YAMLError
+            sys.exit(f"Spec {path}: {e}")
+        if not isinstance(document, dict):
+            sys.exit(f"Spec {path}: o documento deve ser um objeto com as seções {sorted(SpecDataset.TOP_LEVEL)}")
+        return document
+
+    @staticmethod
+    def _lines(path):
+        """(line number, record) of a JSONL file, read lazily; blank lines are skipped."""
+        with open(path, encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        yield number, json.loads(line)
+                    except ValueError as e:
+                        raise ValueError(f"{path}:{number}: JSON inválido ({e})")
+
+    def _settings(self):
+        """The generate / engagement sections, checked here since they size everything else."""
+        settings = {}
+        if self.jsonl:
+            kinds = set(self.SECTIONS.values())
+            try:
+                for number, record in self._lines(self.path):
+                    kind = record.get("kind") if isinstance(record, dict) else None
+                    if kind in SPEC_SETTINGS:
+                        settings.setdefault(kind, {}).update({k: v for k, v in record.items() if k != "kind"})
+                    elif kind not in kinds:
+                        self._error(f"{self.path}:{number}", f"'kind' deve ser um de {sorted(kinds | set(SPEC_SETTINGS))}")
+            except (OSError, ValueError) as e:
+                sys.exit(f"Spec {self.path}: {e}")
+        else:
+            for key in self.document:
+                if key not in self.TOP_LEVEL:
+                    self._error(self.path, f"seção desconhecida {key!r}")
+            settings = {key: self.document[key] for key in SPEC_SETTINGS if self.document.get(key) is not None}
+        for name, values in settings.items():
+            if not isinstance(values, dict):
+                self._error(f"{self.path}: {name}", "deve ser um objeto")
+                continue
+            for key, value in values.items():
+                if key not in SPEC_SETTINGS[name]:
+                    self._error(f"{self.path}: {name}", f"opção desconhecida {key!r}")
+                elif key == "graph":
+                    if value not in ("powerlaw", "smallworld"):
+                        self._error(f"{self.path}: {name}", "'graph' deve ser powerlaw ou smallworld")
+                elif key in ("exponent", "rewire"):
+                    if not isinstance(value, (int, float)) or isinstance(value, bool):
+                        self._error(f"{self.path}: {name}", f"{key!r} deve ser número")
+                elif not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                    self._error(f"{self.path}: {name}", f"{key!r} deve ser inteiro >= 0")
+        if self.errors:
+            return {}
+        return settings
+
+    def _section(self, section):
+        """Yield (location, raw record) of one section in file order, streaming JSONL line by line."""
+        kind = self.SECTIONS[section]
+        if self.jsonl:
+            for number, record in self._lines(self.path):
+                if isinstance(record, dict) and record.get("kind") == kind:
+                    yield f"{self.path}:{number}", {k: v for k, v in record.items() if k != "kind"}
+            return
+        items = self.document.get(section)
+        if items is None:
+            return
+        if isinstance(items, dict) and set(items) == {"file"}:
+            path = os.path.join(os.path.dirname(os.path.abspath(self.path)), items["file"])
+            for number, record in self._lines(path):
+                yield f"{path}:{number}", record
+        elif section == "specialties" and isinstance(items, dict):
+            for name, emails in items.items():
+                for i, email in enumerate(emails if isinstance(emails, list) else [emails]):
+                    yield f"{self.path}: specialties.{name}[{i}]", {"email": email, "specialty": name}
+        elif isinstance(items, list):
+            for i, record in enumerate(items):
+                yield f"{self.path}: {section}[{i}]", record
+        else:
+            raise ValueError(f"{self.path}: '{section}' deve ser uma lista ou {{\"file\": ...}}")
+
+    def _records(self, section):
+        for _, record in self._section(section):
+            if section == "connections" and isinstance(record, list) and len(record) == 2:
+                record = {"sender": record[0], "receiver": record[1]}
+            yield record
+
+    def _validate(self):
+        """Check every literal record; returns the per-section counts."""
+        counts = dict.fromkeys(self.SECTIONS, 0)
+        crms, names, titles = set(), set(), set()
+        existing = {email for email, _ in EXISTING_ACCOUNTS}
+        # Generated doctors register CRM_BASE + i; a literal CRM in that range would be a 409 later
+        crm_range = range(SyntheticDataset.CRM_BASE,
+                          SyntheticDataset.CRM_BASE + (self.generated.sizes["doctors"] if self.generated else 0))
+
+        def known(location, email):
+            if email not in existing and not self.has_doctor(email):
+                self._error(location, f"{email!r} não é um médico da spec nem uma conta do prisma/seed.ts")
+
+        for section, kind in self.SECTIONS.items():
+            try:
+                for location, record in self._section(section):
+                    if kind == "connection" and isinstance(record, list) and len(record) == 2:
+                        record = {"sender": record[0], "receiver": record[1]}
+                    counts[section] += 1
+                    problems = spec_record_errors(kind, record)
+                    for problem in problems:
+                        self._error(location, problem)
+                    if problems:
+                        continue
+                    if kind == "doctor":
+                        before = len(self.emails)
+                        handle = self.emails.handle(record["email"])
+                        if handle < before or record["email"] in existing:
+                            self._error(location, f"email repetido {record['email']!r}")
+                        if record["crm"] in crms:
+                            self._error(location, f"CRM repetido {record['crm']!r}")
+                        elif str(record["crm"]).isdigit() and int(record["crm"]) in crm_range:
+                            self._error(location, f"CRM {record['crm']!r} na faixa dos médicos gerados "
+                                                  f"({crm_range.start}-{crm_range.stop - 1})")
+                        crms.add(record["crm"])
+                        self.passwords.set(handle, record["password"].encode())
+                    elif kind == "specialty":
+                        known(location, record["email"])
+                        if record["specialty"] not in SPECIALTY_CODES:
+                            self._error(location, f"especialidade fora do catálogo {record['specialty']!r}")
+                    elif kind == "institution":
+                        if record["name"] in names:
+                            self._error(location, f"nome repetido {record['name']!r}")
+                        names.add(record["name"])
+                    elif kind == "job":
+                        if record["title"] in titles:
+                            self._error(location, f"título repetido {record['title']!r}")
+                        titles.add(record["title"])
+                        if record.get("specName") and record["specName"] not in SPECIALTY_CODES:
+                            self._error(location, f"especialidade fora do catálogo {record['specName']!r}")
+                    elif kind == "connection":
+                        known(location, record["sender"])
+                        known(location, record["receiver"])
+                        if record["sender"] == record["receiver"]:
+                            self._error(location, "conexão de um médico com ele mesmo")
+                    elif kind == "post":
+                        known(location, record["email"])
+            except (OSError, ValueError) as e:
+                self._error(self.path, str(e))
+        return counts
+
+    def doctors(self):
+        return itertools.chain(self._records("doctors"), self.generated.doctors() if self.generated else ())
+
+    def first_email(self):
+        return self.emails.key(0) if self.n_doctors else self.generated.first_email()
+
+    def password(self, email):
+        handle = self.emails.handle(email, create=False)
+        if handle is not None:
+            return self.passwords.get(handle).decode()
+        if self.generated and self.generated.has_doctor(email):
+            return self.generated.password(email)
+        return None
+
+    def has_doctor(self, email):
+        return self.doctor_index(email) is not None
+
+    def doctor_index(self, email):
+        """Literal doctors by file position, then the generated ones after them; None if unknown."""
+        handle = self.emails.handle(email, create=False)
+        if handle is not None:
+            return handle
+        index = self.generated.doctor_index(email) if self.generated else None
+        return None if index is None else len(self.emails) + index
+
+    def existing_accounts(self):
+        return iter(EXISTING_ACCOUNTS)
+
+    def foreign_accounts(self):
+        return iter(())
+
+    def specialty_assignments(self):
+        """Yield (email, specialty name) pairs."""
+        literal = ((record["email"], record["specialty"]) for record in self._records("specialties"))
+        return itertools.chain(literal, self.generated.specialty_assignments() if self.generated else ())
+
+    def institutions(self):
+        return itertools.chain(self._records("institutions"), self.generated.institutions() if self.generated else ())
+
+    def jobs(self):
+        return itertools.chain(self._records("jobs"), self.generated.jobs() if self.generated else ())
+
+    def connections(self):
+        literal = ((record["sender"], record["receiver"]) for record in self._records("connections"))
+        return itertools.chain(literal, self.generated.connections() if self.generated else ())
+
+    def _literal_posts(self):
+        """The spec's own posts, indexed apart from the generated ones ("spec:0", "spec:1", ...)."""
+        for i, record in enumerate(self._records("posts")):
+            yield {**record, "index": f"spec:{i}"}
+
+    def posts(self):
+        return itertools.chain(self._literal_posts(), self.generated.posts() if self.generated else ())
+
+    def engagement(self):
+        literal = zipf_engagement(self._literal_posts(), self.literal_sizes["posts"], self.literal_sizes,
+                                  self.emails.key, self.n_doctors, lambda i: random.Random(f"engagement:{i}"),
+                                  self.zipf)
+        return itertools.chain(literal, self.generated.engagement() if self.generated else ())
+
+class ShardView:
+    """One shard's part of a dataset, for --shards K --shard-index i.
+
+    Doctors are striped by index (i % K), so the powerlaw hubs at low indices
+    spread over every shard; accounts outside the dataset (EXISTING_ACCOUNTS)
+    belong to shard 0. Posts and their engagement go to the author's shard,
+    connections to the receiver's. The "main" phase does the work that only
+    involves the shard's own accounts; "reconcile", run once every shard has
+    finished main, does the cross-shard rest (requests from and engagement by
+    other shards' doctors), acting as those accounts through the token cache.
+    Every shard still generates the full streams and filters them, so the
+    split is the same whatever machine a shard runs on.
+    """
+
+    PHASES = ("main", "reconcile")
+
+    def __init__(self, dataset, shards, index, phase="main"):
+        self.dataset = dataset
+        self.shards = shards
+        self.index = index
+        self.phase = phase
+        self.sizes = dataset.sizes
+        self.zipf = dataset.zipf
+
+    def owner(self, email):
+        doctor = self.dataset.doctor_index(email)
+        return 0 if doctor is None else doctor % self.shards
+
+    def owns(self, email):
+        return self.owner(email) == self.index
+
+    def _striped(self, items):
+        return (item for i, item in enumerate(items) if i % self.shards == self.index)
+
+    def doctors(self):
+        return (doc for doc in self.dataset.doctors() if self.owns(doc["email"]))
+
+    def first_email(self):
+        return next(self.doctors())["email"]
+
+    def password(self, email):
+        return self.dataset.password(email)
+
+    def has_doctor(self, email):
+        return self.dataset.has_doctor(email)
+
+    def doctor_index(self, email):
+        return self.dataset.doctor_index(email)
+
+    def existing_accounts(self):
+        return self.dataset.existing_accounts() if self.index == 0 else iter(())
+
+    def specialty_assignments(self):
+        if self.phase != "main":
+            return iter(())
+        return ((email, spec) for email, spec in self.dataset.specialty_assignments() if self.owns(email))
+
+    def institutions(self):
+        return self._striped(self.dataset.institutions()) if self.phase == "main" else iter(())
+
+    def jobs(self):
+        return self._striped(self.dataset.jobs()) if self.phase == "main" else iter(())
+
+    def connections(self):
+        main = self.phase == "main"
+        return ((sender, receiver) for sender, receiver in self.dataset.connections()
+                if self.owns(receiver) and self.owns(sender) == main)
+
+    def posts(self):
+        return (post for post in self.dataset.posts() if self.owns(post["email"]))
+
+    def engagement(self):
+        main = self.phase == "main"
+        return (event for event in self.dataset.engagement()
+                if self.owns(event["author"]) and self.owns(event["email"]) == main)
+
+    def foreign_accounts(self):
+        """Other shards' accounts that this shard acts as in the reconcile phase, each once."""
+        if self.phase == "main":
+            return
+        seen = bytearray(self.sizes["doctors"])
+        others = set()
+        for emails in ((sender for sender, _ in self.connections()), (event["email"] for event in self.engagement())):
+            for email in emails:
+                doctor = self.dataset.doctor_index(email)
+                if doctor is None:
+                    if email in others:
+                        continue
+                    others.add(email)
+                elif seen[doctor]:
+                    continue
+                else:
+                    seen[doctor] = 1
+                yield email
+
+
+def build_dataset(args):
+    """The --spec file (seed-specs/demo.json by default), or only generated data for --scale without --spec."""
+    # Only the generator options given on the command line; the rest come from the spec or the defaults
+    options = {key: value for key, value in (("seed", args.seed), ("graph", args.graph),
+                                             ("exponent", args.graph_exponent), ("rewire", args.rewire))
+               if value is not None}
+    if args.spec is not None or args.scale is None:
+        dataset = SpecDataset(args.spec or DEFAULT_SPEC, scale=args.scale, zipf=args.zipf, **options)
+    else:
+        dataset = SyntheticDataset(args.scale, zipf=args.zipf, **options)
+    args.seed = dataset.seed  # bench, verify, agenda and chat draw their samples from the same seed
+    return dataset
+
+
+def dataset_options():
+    """Parent parser of the dataset options (--spec, --scale and the generator), shared by the subcommands."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--spec",
+                        help="Arquivo de spec do dataset (JSON, YAML ou JSONL; padrão: seed-specs/demo.json, "
+                             "ou nenhum com --scale)")
+    parser.add_argument("--scale", type=parse_scale,
+                        help="Gera dados sintéticos em vez da spec, ex.: doctors=100000,posts=1000000 "
+                             "(também institutions, jobs, connections, likes, comments, bookmarks); "
+                             "com --spec, substitui os tamanhos da seção generate da spec")
+    # No argparse defaults: a value given here overrides the spec's "generate", an absent one does not
+    parser.add_argument("--seed", type=int, help="Semente do gerador sintético (padrão: a da spec, ou 42)")
+    parser.add_argument("--graph", choices=["powerlaw", "smallworld"],
+                        help="Modelo do grafo social sintético (padrão: o da spec, ou powerlaw)")
+    parser.add_argument("--graph-exponent", type=float,
+                        help="Expoente da distribuição de grau no modelo powerlaw (> 2; padrão: o da spec, ou 2.5)")
+    parser.add_argument("--rewire", type=float,
+                        help="Probabilidade de religação no modelo smallworld (padrão: a da spec, ou 0.1)")
+    parser.add_argument("--zipf", type=float, default=1.1,
+                        help="Expoente de Zipf da popularidade dos posts (curtidas, comentários e favoritos)")
+    return parser
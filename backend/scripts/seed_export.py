@@ -0,0 +1,310 @@
+"""Export offline do seed-data.py: CSVs para COPY e neo4j-admin import."""
+import csv
+import functools
+import os
+import sys
+import time
+import uuid
+
+try:
+    import bcrypt  # only needed for the PostgreSQL password hashes
+except ImportError:
+    bcrypt = None
+
+from seed_common import SPECIALTY_CODES, ascii_slug
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+EXPORT_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_DNS, "seed.medconnect.com")
+DEFAULT_EXPORT_DIR = os.path.join(SCRIPT_DIR, "seed-export")
+EXPORT_FORMATS = ("postgres", "neo4j")
+INSTITUTION_ADMIN_PASSWORD = "Senha@2026"
+
+# Column lists follow prisma/schema.prisma; columns left out take their database defaults
+PG_TABLES = {
+    "specialties": ["id", "name", "code"],
+    "users": ["id", "email", "passwordHash", "role", "createdAt", "updatedAt"],
+    "doctors": ["id", "userId", "fullName", "crm", "crmState", "phone", "bio", "graduationYear",
+                "universityName", "city", "state", "createdAt", "updatedAt"],
+    "doctor_specialties": ["id", "doctorId", "specialtyId", "isPrimary"],
+    "institutions": ["id", "adminUserId", "name", "type", "description", "neighborhood", "city", "state",
+                     "createdAt", "updatedAt"],
+    "jobs": ["id", "institutionId", "title", "type", "description", "requirements", "salaryMin", "salaryMax",
+             "shift", "city", "state", "specialtyId", "createdAt", "updatedAt"],
+    "connection_requests": ["id", "senderId", "receiverId", "status", "createdAt", "updatedAt"],
+}
+
+# (file, label or relationship type, header) in the format of neo4j-admin database import
+NEO4J_NODES = {
+    "doctors": ("Doctor", ["pgId:ID(Doctor)", "fullName", "crm", "crmState", "city", "state", "graduationYear:int"]),
+    "specialties": ("Specialty", ["pgId:ID(Specialty)", "name"]),
+    "institutions": ("Institution", ["pgId:ID(Institution)", "name", "type", "city", "state"]),
+    "jobs": ("Job", ["pgId:ID(Job)", "title", "type", "city", "shift", "isActive:boolean"]),
+    "cities": ("City", ["name:ID(City)"]),
+    "states": ("State", ["code:ID(State)"]),
+}
+NEO4J_RELATIONSHIPS = {
+    "specializes_in": ("SPECIALIZES_IN", [":START_ID(Doctor)", ":END_ID(Specialty)", "isPrimary:boolean"]),
+    "connected_to": ("CONNECTED_TO", [":START_ID(Doctor)", ":END_ID(Doctor)", "since:datetime"]),
+    "posted": ("POSTED", [":START_ID(Institution)", ":END_ID(Job)"]),
+    "requires_specialty": ("REQUIRES_SPECIALTY", [":START_ID(Job)", ":END_ID(Specialty)"]),
+    "located_in": ("LOCATED_IN", [":START_ID(Doctor)", ":END_ID(City)"]),
+    "in_state": ("IN_STATE", [":START_ID(City)", ":END_ID(State)"]),
+}
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def export_id(kind, key):
+    """Deterministic UUID, so reruns, shards and both stores agree on every id."""
+    return str(uuid.uuid5(EXPORT_NAMESPACE, f"{kind}:{key}"))
+
+
+class PasswordHasher:
+    """bcrypt hash per distinct password, computed once: bcrypt is slow on purpose.
+
+    The backend hashes with 12 rounds; `fixed_hash` skips bcrypt entirely and
+    gives every account the same precomputed hash.
+    """
+
+    def __init__(self, rounds=12, fixed_hash=None):
+        self.rounds = rounds
+        self.fixed_hash = fixed_hash
+        self.hashes = {}
+
+    def __call__(self, password):
+        if self.fixed_hash:
+            return self.fixed_hash
+        hashed = self.hashes.get(password)
+        if hashed is None:
+            if bcrypt is None:
+                sys.exit("O export precisa do pacote bcrypt (pip install bcrypt) ou de --password-hash.")
+            hashed = bcrypt.hashpw(password.encode(), bcrypt.gensalt(self.rounds)).decode()
+            self.hashes[password] = hashed
+        return hashed
+
+
+class CsvTables:
+    """One CSV file per table under `directory`, opened on first row and written as rows arrive."""
+
+    def __init__(self, directory, headers):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.headers = headers
+        self.files = {}
+        self.writers = {}
+        self.rows = {}
+
+    def path(self, table):
+        return os.path.join(self.directory, f"{table}.csv")
+
+    def write(self, table, row):
+        writer = self.writers.get(table)
+        if writer is None:
+            f = self.files[table] = open(self.path(table), "w", newline="")
+            writer = self.writers[table] = csv.writer(f)
+            writer.writerow(self.headers[table])
+            self.rows[table] = 0
+        writer.writerow(row)
+        self.rows[table] += 1
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+
+
+def write_pg_load_script(tables):
+    """load.sql: \\copy every exported table in foreign-key order inside one transaction."""
+    lines = [
+        "-- Gerado por seed-data.py export. Rode num banco vazio com as migrations aplicadas:",
+        "--   npx prisma migrate reset --skip-seed",
+        "--   cd <este diretório> && psql \"$DATABASE_URL\" -f load.sql",
+        "BEGIN;",
+    ]
+    for table, columns in PG_TABLES.items():
+        if table not in tables.rows:
+            continue
+        column_list = ", ".join(f'"{c}"' for c in columns)
+        lines.append(f"\\copy {table} ({column_list}) FROM '{table}.csv' WITH (FORMAT csv, HEADER true)")
+    lines.append("COMMIT;")
+    with open(os.path.join(tables.directory, "load.sql"), "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def write_neo4j_import_script(tables):
+    """neo4j-import.sh: the neo4j-admin (5.x) offline import of every exported file."""
+    args = [f"--nodes={label}={name}.csv" for name, (label, _) in NEO4J_NODES.items() if name in tables.rows]
+    args += [f"--relationships={rel_type}={name}.csv"
+             for name, (rel_type, _) in NEO4J_RELATIONSHIPS.items() if name in tables.rows]
+    path = os.path.join(tables.directory, "neo4j-import.sh")
+    with open(path, "w") as f:
+        f.write("#!/bin/sh\n"
+                "# Gerado por seed-data.py export. Importação offline: pare o Neo4j antes de rodar.\n"
+                "cd \"$(dirname \"$0\")\"\n"
+                "neo4j-admin database import full neo4j --overwrite-destination=true \\\n  "
+                + " \\\n  ".join(args) + "\n")
+    os.chmod(path, 0o755)
+
+
+def export(args, dataset):
+    """Stream the dataset into bulk-load files without touching the API."""
+    print("=" * 60)
+    print("MedConnect - Export para carga direta")
+    print("Dataset: " + ", ".join(f"{k}={v}" for k, v in dataset.sizes.items()))
+    print(f"Formatos: {', '.join(args.format)} -> {args.out}")
+    print("=" * 60)
+    start = time.perf_counter()
+    now = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+    since = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    pg = neo = None
+    if "postgres" in args.format:
+        pg = CsvTables(os.path.join(args.out, "postgres"), PG_TABLES)
+    if "neo4j" in args.format:
+        neo = CsvTables(os.path.join(args.out, "neo4j"),
+                        {name: header for name, (_, header) in {**NEO4J_NODES, **NEO4J_RELATIONSHIPS}.items()})
+    if "postgres" in args.format and bcrypt is None and not args.password_hash:
+        sys.exit("O export precisa do pacote bcrypt (pip install bcrypt) ou de --password-hash.")
+    hash_password = PasswordHasher(args.bcrypt_rounds, args.password_hash)
+    specialties = {}  # name -> id; bounded by the specialty list
+    cities, states, places = set(), set(), set()  # bounded by the city list
+    skipped = 0
+
+    def specialty_id(name):
+        spec_id = specialties.get(name)
+        if spec_id is None:
+            spec_id = specialties[name] = export_id("specialty", name)
+            code = SPECIALTY_CODES.get(name) or ascii_slug(name).replace("-", "").upper()[:10]
+            if pg:
+                pg.write("specialties", [spec_id, name, code])
+            if neo:
+                neo.write("specialties", [spec_id, name])
+        return spec_id
+
+    print("\n[1/5] Médicos...")
+    for doc in dataset.doctors():
+        user_id = export_id("user", doc["email"])
+        doctor_id = export_id("doctor", doc["email"])
+        city, state = doc.get("city"), doc.get("state")
+        if pg:
+            pg.write("users", [user_id, doc["email"], hash_password(doc["password"]), "DOCTOR", now, now])
+            pg.write("doctors", [doctor_id, user_id, doc["fullName"], doc["crm"], doc["crmState"].upper(),
+                                 doc.get("phone"), doc.get("bio"), doc.get("graduationYear"),
+                                 doc.get("universityName"), city, state, now, now])
+        if neo:
+            neo.write("doctors", [doctor_id, doc["fullName"], doc["crm"], doc["crmState"].upper(),
+                                  city, state, doc.get("graduationYear")])
+            if city:
+                neo.write("located_in", [doctor_id, city])
+                if city not in cities:
+                    cities.add(city)
+                    neo.write("cities", [city])
+                if state and state not in states:
+                    states.add(state)
+                    neo.write("states", [state])
+                if state and (city, state) not in places:
+                    places.add((city, state))
+                    neo.write("in_state", [city, state])
+
+    print("[2/5] Especialidades...")
+    for email, spec_name in dataset.specialty_assignments():
+        doctor_id = export_id("doctor", email)
+        spec_id = specialty_id(spec_name)
+        if pg:
+            pg.write("doctor_specialties", [export_id("doctor_specialty", f"{email}|{spec_name}"),
+                                            doctor_id, spec_id, "true"])
+        if neo:
+            neo.write("specializes_in", [doctor_id, spec_id, "true"])
+
+    print("[3/5] Instituições...")
+    # institutions.adminUserId is unique, so every institution gets its own admin account
+    n_institutions = 0
+    for i, inst in enumerate(dataset.institutions()):
+        n_institutions += 1
+        inst_id = export_id("institution", i)
+        if pg:
+            admin_id = export_id("institution_admin", i)
+            pg.write("users", [admin_id, f"admin.instituicao.{i}@medconnect.com",
+                               hash_password(INSTITUTION_ADMIN_PASSWORD), "INSTITUTION_ADMIN", now, now])
+            pg.write("institutions", [inst_id, admin_id, inst["name"], inst["type"], inst.get("description"),
+                                      inst.get("neighborhood"), inst["city"], inst["state"], now, now])
+        if neo:
+            neo.write("institutions", [inst_id, inst["name"], inst["type"], inst["city"], inst["state"]])
+
+    print("[4/5] Vagas...")
+    for i, job in enumerate(dataset.jobs() if n_institutions else ()):
+        job_id = export_id("job", i)
+        inst_id = export_id("institution", i % n_institutions)
+        spec_id = specialty_id(job["specName"]) if job.get("specName") else None
+        if pg:
+            pg.write("jobs", [job_id, inst_id, job["title"], job["type"], job["description"],
+                              job.get("requirements"), job.get("salaryMin"), job.get("salaryMax"),
+                              job["shift"], job["city"], job["state"], spec_id, now, now])
+        if neo:
+            neo.write("jobs", [job_id, job["title"], job["type"], job["city"], job["shift"], "true"])
+            neo.write("posted", [inst_id, job_id])
+            if spec_id:
+                neo.write("requires_specialty", [job_id, spec_id])
+
+    print("[5/5] Conexões...")
+    for sender_email, receiver_email in dataset.connections():
+        # Accounts outside the dataset (e.g. the demo user) do not exist in an empty database
+        if not dataset.has_doctor(sender_email) or not dataset.has_doctor(receiver_email):
+            skipped += 1
+            continue
+        sender_id = export_id("doctor", sender_email)
+        receiver_id = export_id("doctor", receiver_email)
+        if pg:
+            pg.write("connection_requests", [export_id("connection", f"{sender_email}|{receiver_email}"),
+                                             sender_id, receiver_id, "ACCEPTED", now, now])
+        if neo:
+            # The backend stores an accepted connection as a pair of directed edges
+            neo.write("connected_to", [sender_id, receiver_id, since])
+            neo.write("connected_to", [receiver_id, sender_id, since])
+
+    for tables in (pg, neo):
+        if tables:
+            tables.close()
+    if pg:
+        write_pg_load_script(pg)
+    if neo:
+        write_neo4j_import_script(neo)
+
+    print("\n" + "=" * 60)
+    print("RESUMO DO EXPORT")
+    print("=" * 60)
+    for title, tables in (("PostgreSQL", pg), ("Neo4j", neo)):
+        if tables:
+            print(f"  {title} ({tables.directory}):")
+            for table, rows in tables.rows.items():
+                print(f"    {table + '.csv':<28} {rows:>10} linhas")
+    if skipped:
+        print(f"  ~ {skipped} conexões com contas fora do dataset ignoradas")
+    print(f"  Hashes bcrypt calculados: {len(hash_password.hashes)}")
+    print(f"  Tempo: {time.perf_counter() - start:.2f}s")
+    if pg:
+        print(f"  PostgreSQL: cd {pg.directory} && psql \"$DATABASE_URL\" -f load.sql")
+    if neo:
+        print(f"  Neo4j: {os.path.join(neo.directory, 'neo4j-import.sh')} (com o Neo4j parado)")
+    print("  Posts ficam no ScyllaDB e não fazem parte do export.")
+    print("=" * 60)
+
+
+def add_parser(commands, parents):
+    """The `export` subparser: the dataset options plus where and what to write."""
+    parser = commands.add_parser("export", parents=[parents.data], help="Gera CSVs para carga direta nos bancos",
+                                 description="Grava o dataset em CSVs para COPY no PostgreSQL e para "
+                                             "neo4j-admin import, sem passar pela API.")
+    parser.add_argument("--out", default=DEFAULT_EXPORT_DIR,
+                        help="Diretório de saída (subpastas postgres/ e neo4j/)")
+    parser.add_argument("--format", type=lambda spec: spec.split(","), default=list(EXPORT_FORMATS),
+                        help="Formatos separados por vírgula: postgres,neo4j")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12,
+                        help="Custo do bcrypt dos hashes de senha (o backend usa 12)")
+    parser.add_argument("--password-hash",
+                        help="Hash bcrypt pronto para todas as contas (dispensa o pacote bcrypt)")
+    return parser
+
+
+def check_args(parser, args):
+    """--format is a free comma list, so its formats are checked here."""
+    if not set(args.format) <= set(EXPORT_FORMATS):
+        parser.error(f"--format aceita apenas {','.join(EXPORT_FORMATS)}")
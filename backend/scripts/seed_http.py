@@ -0,0 +1,389 @@
+"""Cliente HTTP do seed-data.py: sessão com pool e retries, api() instrumentada e os endpoints usados."""
+import os
+import requests
+import threading
+import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from seed_common import JOB_FIELDS, PROFILE_FIELDS, endpoint_label
+
+
+# ─────────────────────────────────────────────────────────────
+# HTTP CLIENT
+# ─────────────────────────────────────────────────────────────
+
+# Overridden by --base-url / API_URL (same variable as the mobile app) and by --mock
+BASE = os.environ.get("API_URL", "http://localhost:3000/api/v1")
+
+HTTP_CONFIG = {
+    "pool_size": 16,         # keep-alive connections per host
+    "connect_timeout": 5.0,
+    "read_timeout": 30.0,
+    "retries": 3,
+    "backoff": 0.5,          # sleeps 0.5s, 1s, 2s, ... between attempts
+}
+
+_http_local = threading.local()
+_http_lock = threading.Lock()
+_http_session = None
+
+
+class SeedRetry(Retry):
+    """Retry idempotent calls on transient 5xx and any call on 429/503.
+
+    429 and 503 mean the backend refused the request before doing any work,
+    so even a POST is safe to resend. Read errors on POST are never retried.
+    """
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if status_code in (429, 503) and self.total:
+            return True
+        return super().is_retry(method, status_code, has_retry_after)
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        # Every retry is an overload signal, even when the retried call then succeeds
+        if CONTROLLER is not None:
+            CONTROLLER.congested(f"HTTP {response.status}" if response is not None else type(error).__name__)
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+
+def configure_http(**overrides):
+    """Override HTTP_CONFIG values and drop the current session so the next call rebuilds it."""
+    global _http_session
+    HTTP_CONFIG.update({k: v for k, v in overrides.items() if v is not None})
+    with _http_lock:
+        if _http_session is not None:
+            _http_session.close()
+        _http_session = None
+
+
+def http_session():
+    """Shared keep-alive session; urllib3 pools connections per host and is thread-safe."""
+    global _http_session
+    if _http_session is None:
+        with _http_lock:
+            if _http_session is None:
+                retry = SeedRetry(
+                    total=HTTP_CONFIG["retries"],
+                    backoff_factor=HTTP_CONFIG["backoff"],
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=HTTP_CONFIG["pool_size"],
+                    pool_block=True,
+                    max_retries=retry,
+                )
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _http_session = session
+    return _http_session
+
+
+def auth_headers(token):
+    """Authorization header for `token`, built once per token and thread."""
+    cache = getattr(_http_local, "auth_headers", None)
+    if cache is None:
+        cache = _http_local.auth_headers = {}
+    headers = cache.get(token)
+    if headers is None:
+        if len(cache) > 1024:
+            cache.clear()
+        headers = cache[token] = {"Authorization": f"Bearer {token}"}
+    return headers
+
+
+def warn(message, quiet=False):
+    """Print a WARN line unless `quiet`: the bench and agenda loads count failures instead."""
+    if not quiet:
+        print(f"  WARN: {message}")
+
+
+METRICS = None     # RequestMetrics installed by main(); api() reports every call to it
+CONTROLLER = None  # AdaptiveLimiter installed by main() with --adaptive; api() waits for a slot
+RECORDER = None    # TrafficRecorder installed by main() with --record; api() logs every call to it
+
+
+def set_step(label):
+    """Attribute the calls this thread makes from now on to seed step `label`."""
+    _http_local.step = label
+
+
+def current_step():
+    """Seed step the calls of this thread are attributed to, or None."""
+    return getattr(_http_local, "step", None)
+
+
+def received_bytes():
+    """Response body bytes this thread has read through api() so far."""
+    return getattr(_http_local, "received", 0)
+
+
+def api(method, path, token=None, quiet=False, **kwargs):
+    """Send `method path` to the API through the pooled session.
+
+    Returns the response, or None when no response arrived (a timeout, or a
+    connection error left after the retries): that is warned about like an
+    HTTP error (unless `quiet`) and recorded as status 0, so the caller's
+    task fails and the run goes on.
+    """
+    if token:
+        kwargs["headers"] = auth_headers(token)
+    kwargs.setdefault("timeout", (HTTP_CONFIG["connect_timeout"], HTTP_CONFIG["read_timeout"]))
+    if METRICS is None and CONTROLLER is None and RECORDER is None:
+        try:
+            r = http_session().request(method, f"{BASE}{path}", **kwargs)
+        except requests.RequestException as e:
+            warn(f"{method} {path}: {type(e).__name__} {str(e)[:100]}", quiet)
+            return None
+        _http_local.received = received_bytes() + len(r.content)
+        return r
+    if CONTROLLER is not None:
+        CONTROLLER.acquire()
+    start = time.perf_counter()
+    status = nbytes = 0
+    r = None
+    try:
+        r = http_session().request(method, f"{BASE}{path}", **kwargs)
+        status, nbytes = r.status_code, len(r.content)
+        _http_local.received = received_bytes() + nbytes
+        return r
+    except requests.RequestException as e:
+        warn(f"{method} {path}: {type(e).__name__} {str(e)[:100]}", quiet)
+        r = None
+        return None
+    finally:
+        duration = time.perf_counter() - start
+        if CONTROLLER is not None:
+            CONTROLLER.release(endpoint_label(method, path), duration, status)
+        if METRICS is not None:
+            METRICS.observe(method, path, status, nbytes, start, duration)
+        if RECORDER is not None:
+            RECORDER.record(method, path, token, kwargs, r, start, duration)
+
+
+# ─────────────────────────────────────────────────────────────
+# EXECUTION
+# ─────────────────────────────────────────────────────────────
+
+def register_doctor(doc):
+    """Register a doctor (login if it already exists), return the auth response or None."""
+    payload = {
+        "email": doc["email"],
+        "password": doc["password"],
+        "fullName": doc["fullName"],
+        "crm": doc["crm"],
+        "crmState": doc["crmState"],
+    }
+    if doc.get("phone"):
+        payload["phone"] = doc["phone"]
+
+    r = api("POST", "/auth/register", json=payload)
+    if r is None:
+        return None
+    if r.status_code == 201:
+        return r.json()
+    elif r.status_code == 409:
+        # Already exists, login
+        data = login(doc["email"], doc["password"])
+        if data:
+            return data
+    warn(f"Could not register/login {doc['email']}: {r.status_code} {r.text[:100]}")
+    return None
+
+def login(email, password):
+    """Login an existing account, return the auth response (accessToken, refreshToken, user) or None."""
+    r = api("POST", "/auth/login", json={"email": email, "password": password})
+    if r is not None and r.status_code == 200:
+        return r.json()
+    return None
+
+def update_profile(token, doc):
+    """Update doctor profile with city, state, bio etc. (PROFILE_FIELDS)."""
+    payload = {field: doc[field] for field in PROFILE_FIELDS if doc.get(field)}
+    if payload:
+        r = api("PUT", "/doctors/me", token, json=payload)
+        return r is not None and r.status_code in [200, 201]
+    return True
+
+def get_specialties(token):
+    """Get all specialties."""
+    r = api("GET", "/doctors/ref/specialties", token)
+    if r is not None and r.status_code == 200:
+        return r.json()
+    return []
+
+def add_specialty(token, specialty_id, is_primary=False):
+    """Add specialty to current doctor."""
+    r = api("POST", "/doctors/me/specialties", token,
+            json={"specialtyId": specialty_id, "isPrimary": is_primary})
+    return r is not None and r.status_code in [200, 201]
+
+def create_institution(token, inst):
+    """Create institution."""
+    r = api("POST", "/institutions", token, json=inst)
+    if r is None:
+        return None
+    if r.status_code == 201:
+        return r.json()["id"]
+    elif r.status_code == 409:
+        return "exists"
+    warn(f"Could not create institution {inst['name']}: {r.status_code} {r.text[:100]}")
+    return None
+
+def get_notifications(token, limit=30):
+    """Get the current doctor's notifications, newest first, or None."""
+    r = api("GET", "/notifications", token, params={"limit": limit})
+    if r is not None and r.status_code == 200:
+        return r.json()
+    return None
+
+def create_job(token, job, quiet=False):
+    """Create a job listing."""
+    r = api("POST", "/jobs", token, quiet=quiet, json=job)
+    if r is None:
+        return None
+    if r.status_code == 201:
+        return r.json()["id"]
+    warn(f"Could not create job {job['title']}: {r.status_code} {r.text[:100]}", quiet)
+    return None
+
+def send_connection(token, receiver_id):
+    """Send connection request."""
+    r = api("POST", f"/connections/request/{receiver_id}", token)
+    return r is not None and r.status_code in [200, 201]
+
+def accept_connection(token, request_id):
+    """Accept connection request."""
+    r = api("POST", f"/connections/accept/{request_id}", token)
+    return r is not None and r.status_code in [200, 201]
+
+def get_pending_requests(token):
+    """Get pending requests for current user."""
+    r = api("GET", "/connections/pending", token)
+    if r is not None and r.status_code == 200:
+        return r.json()
+    return []
+
+def create_post(token, content, tags=None):
+    """Create a post, return its postId or None."""
+    payload = {"content": content, "postType": "ARTICLE"}
+    if tags:
+        payload["tags"] = tags
+    r = api("POST", "/feed/posts", token, json=payload)
+    if r is not None and r.status_code in [200, 201]:
+        return r.json().get("postId")
+    return None
+
+def like_post(token, post_id, quiet=False):
+    """Like a post."""
+    r = api("POST", f"/feed/posts/{post_id}/like", token, quiet=quiet)
+    return r is not None and r.status_code in [200, 201]
+
+def comment_post(token, post_id, content):
+    """Comment on a post."""
+    r = api("POST", f"/feed/posts/{post_id}/comments", token, json={"content": content})
+    return r is not None and r.status_code in [200, 201]
+
+def bookmark_post(token, post_id):
+    """Bookmark a post (not idempotent: every call stores another bookmark)."""
+    r = api("POST", f"/feed/posts/{post_id}/bookmark", token)
+    return r is not None and r.status_code in [200, 201]
+
+def get_timeline(token, limit=20, before=None, quiet=False):
+    """Get the current doctor's timeline, return the list of posts or None."""
+    params = {"limit": limit}
+    if before:
+        params["before"] = before
+    r = api("GET", "/feed/timeline", token, quiet=quiet, params=params)
+    if r is not None and r.status_code == 200:
+        return r.json()
+    return None
+
+def get_trending(token, limit=20, quiet=False):
+    """Get trending tags and top posts ({tags, topPosts}) or None."""
+    r = api("GET", "/feed/trending", token, quiet=quiet, params={"limit": limit})
+    if r is not None and r.status_code == 200:
+        return r.json()
+    return None
+
+def get_suggestions(token, limit=10, quiet=False):
+    """Get graph-powered connection suggestions or None."""
+    r = api("GET", "/connections/suggestions", token, quiet=quiet, params={"limit": limit})
+    if r is not None and r.status_code == 200:
+        return r.json()
+    return None
+
+def job_payload(job, spec_name_to_id):
+    """CreateJobDto body for a dataset job, with its specialty name mapped to an id."""
+    payload = {field: job[field] for field in JOB_FIELDS if job.get(field) is not None}
+    if job.get("specName") and job["specName"] in spec_name_to_id:
+        payload["specialtyId"] = spec_name_to_id[job["specName"]]
+    return payload
+
+def register_patient(patient):
+    """Register a patient (login if it already exists), return the auth response or None."""
+    r = api("POST", "/auth/register-patient", json=patient)
+    if r is None:
+        return None
+    if r.status_code == 201:
+        return r.json()
+    elif r.status_code == 409:
+        data = login(patient["email"], patient["password"])
+        if data:
+            return data
+    warn(f"Could not register/login patient {patient['email']}: {r.status_code} {r.text[:100]}")
+    return None
+
+def get_workplaces(token):
+    """Get the current doctor's workplaces, or None."""
+    r = api("GET", "/workplaces", token)
+    if r is not None and r.status_code == 200:
+        return r.json()
+    return None
+
+def create_workplace(token, workplace):
+    """Create a workplace for the current doctor, return its id or None."""
+    r = api("POST", "/workplaces", token, json=workplace)
+    if r is None:
+        return None
+    if r.status_code == 201:
+        return r.json()["id"]
+    warn(f"Could not create workplace {workplace['name']}: {r.status_code} {r.text[:100]}")
+    return None
+
+def get_availability(token):
+    """Get the current doctor's availability windows, or None."""
+    r = api("GET", "/availability", token)
+    if r is not None and r.status_code == 200:
+        return r.json()
+    return None
+
+def create_availability(token, window):
+    """Add a weekly availability window to one of the current doctor's workplaces."""
+    r = api("POST", "/availability", token, json=window)
+    if r is None:
+        return False
+    if r.status_code == 201:
+        return True
+    warn(f"Could not add availability {window['dayOfWeek']} {window['startTime']}: {r.status_code} {r.text[:100]}")
+    return False
+
+def search_doctors(token, query, quiet=False):
+    """Search doctors with free slots near a point ({data, meta}), or None."""
+    r = api("POST", "/appointments/search-doctors", token, quiet=quiet, json=query)
+    if r is not None and r.status_code in [200, 201]:
+        return r.json()
+    return None
+
+def book_appointment(token, appointment, quiet=False):
+    """Book an appointment as the current patient; returns the response (201 booked, 409 slot taken)."""
+    return api("POST", "/appointments", token, quiet=quiet, json=appointment)
+
+def cancel_appointment(token, appointment_id, reason=None):
+    """Cancel an appointment as its patient or doctor."""
+    r = api("PATCH", f"/appointments/{appointment_id}/cancel", token, json={"reason": reason} if reason else {})
+    return r is not None and r.status_code == 200
@@ -0,0 +1,749 @@
+"""API fake do seed-data.py (subcomando mock e opção --mock): backend em memória, HTTP e gateway /chat."""
+import argparse
+import asyncio
+import base64
+import datetime
+import json
+import math
+import queue
+import random
+import threading
+import time
+import urllib.parse
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import aiohttp.web  # with socketio: the /chat gateway
+    import socketio
+except ImportError:
+    aiohttp = socketio = None
+
+from seed_chat import CHAT_NAMESPACE, CHAT_REQUIREMENT, chat_id
+from seed_common import DAY_NAMES, DTO_FIELDS, EXISTING_ACCOUNTS, SPECIALTY_CODES, endpoint_label, minutes
+from seed_export import export_id
+
+MOCK_PREFIX = "/api/v1"
+
+
+class MockError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class MockBackend:
+    """In-memory stand-in for the endpoints this script calls, with the backend's status codes.
+
+    Bodies are validated against DTO_FIELDS (400 on unknown or missing
+    fields), register answers 409 for a known e-mail or CRM, and a second
+    request between the same two doctors is a 409, as in ConnectionService.
+    Duplicate specialties are a 500 because the backend does not map that
+    Prisma error. Institutions and jobs are lenient: the real API allows one
+    institution per admin and takes the job's institution from the token.
+    The prisma/seed.ts accounts (EXISTING_ACCOUNTS) exist from the start.
+    The /graph endpoints stand in for the GDS results with degree in place
+    of PageRank and betweenness; communities and similarity are empty.
+    Appointments run the backend's checks in the same order, but under the
+    one lock, so unlike the real check-then-insert they never double-book;
+    search-doctors filters workplaces by great-circle distance. A new job
+    notifies every doctor of its city, like NotificationService, and
+    chat_message() backs the socket.io gateway of MockChatGateway.
+
+    Every response waits `latency` seconds plus an exponential tail of mean
+    `jitter`, and `error_rate` of the requests get a 503 before any work.
+    A handler that fails anyway answers 404 (unknown id), 400 (unparsable
+    value, e.g. ?limit=abc) or 500, never a dropped connection.
+    """
+
+    ACCESS_TTL = 900
+    TIMELINE_LIMIT = 20
+    INSTITUTIONS_PAGE = 20
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.users = {}        # email -> user
+        self.crms = set()
+        self.tokens = {}       # access token -> (user, exp)
+        self.doctors = {}      # doctorId -> profile
+        self.specialties = [{"id": export_id("specialty", name), "name": name, "code": code}
+                            for name, code in SPECIALTY_CODES.items()]
+        self.doctor_specialties = set()
+        self.institutions = []
+        self.jobs = {}
+        self.requests = {}     # requestId -> connection request
+        self.pairs = {}        # frozenset(doctor ids) -> requestId
+        self.connected = {}    # doctorId -> set of connected doctorIds (CONNECTED_TO, both ways)
+        self.posts = {}        # postId -> post
+        self.post_order = []
+        self.likes = set()
+        self.bookmarks = []
+        self.patients = {}     # patientId -> profile
+        self.cpfs = set()
+        self.workplaces = {}   # workplaceId -> workplace
+        self.availability = {}  # (doctorId, workplaceId, dayOfWeek) -> {startTime: availability}
+        self.appointments = {}  # appointmentId -> appointment
+        self.booked = {}       # (doctorId or patientId, scheduledAt) -> appointmentId, PENDING/CONFIRMED only
+        self.notifications = {}  # doctorId -> notifications, oldest first
+        self.chats = {}        # chatId -> messages sent
+        self.served = {}       # endpoint label -> responses
+        self.routes = [
+            ("POST", "/auth/register", False, self.register),
+            ("POST", "/auth/register-patient", False, self.register_patient),
+            ("POST", "/auth/login", False, self.login),
+            ("POST", "/auth/refresh", True, self.refresh),
+            ("GET", "/doctors/me", True, self.get_me),
+            ("PUT", "/doctors/me", True, self.update_me),
+            ("GET", "/doctors/ref/specialties", True, self.list_specialties),
+            ("POST", "/doctors/me/specialties", True, self.add_specialty),
+            ("POST", "/institutions", True, self.create_institution),
+            ("GET", "/institutions", True, self.list_institutions),
+            ("POST", "/jobs", True, self.create_job),
+            ("POST", "/connections/request/:id", True, self.send_request),
+            ("POST", "/connections/accept/:id", True, self.accept_request),
+            ("GET", "/connections/pending", True, self.pending_requests),
+            ("GET", "/connections/me", True, self.my_connections),
+            ("GET", "/connections/suggestions", True, self.suggestions),
+            ("GET", "/graph/influential", True, self.influential),
+            ("GET", "/graph/bridges", True, self.influential),
+            ("GET", "/graph/communities", True, self.no_results),
+            ("GET", "/graph/similar/:id", True, self.no_results),
+            ("GET", "/graph/community-peers", True, self.no_results),
+            ("POST", "/feed/posts", True, self.create_post),
+            ("GET", "/feed/timeline", True, self.timeline),
+            ("GET", "/feed/trending", True, self.trending),
+            ("POST", "/feed/posts/:id/like", True, self.like),
+            ("POST", "/feed/posts/:id/comments", True, self.comment),
+            ("POST", "/feed/posts/:id/bookmark", True, self.bookmark),
+            ("POST", "/workplaces", True, self.create_workplace),
+            ("GET", "/workplaces", True, self.my_workplaces),
+            ("POST", "/availability", True, self.create_availability),
+            ("GET", "/availability", True, self.my_availability),
+            ("POST", "/appointments/search-doctors", True, self.search_doctors),
+            ("POST", "/appointments", True, self.book_appointment),
+            ("PATCH", "/appointments/:id/cancel", True, self.cancel_appointment),
+            ("GET", "/notifications", True, self.list_notifications),
+        ]
+        self.route_index = {}
+        for method, pattern, auth, handler in self.routes:
+            self.route_index[f"{method} {pattern}"] = (auth, handler)
+        for i, (email, password) in enumerate(EXISTING_ACCOUNTS):
+            self.register(None, {"email": email, "password": password, "crm": f"{900000 + i}", "crmState": "SP",
+                                 "fullName": email.split("@")[0].replace(".", " ").title()}, {})
+
+    # --- plumbing ---
+
+    def _token(self, user):
+        payload = {"sub": user["id"], "email": user["email"], "doctorId": user["doctorId"],
+                   "exp": int(time.time()) + self.ACCESS_TTL, "jti": uuid.uuid4().hex}
+        body = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+        token = f"eyJhbGciOiJIUzI1NiJ9.{body}.mock"
+        self.tokens[token] = (user, payload["exp"])
+        return token
+
+    def _auth_response(self, user):
+        return {
+            "accessToken": self._token(user),
+            "refreshToken": uuid.uuid4().hex,
+            "user": {"id": user["id"], "email": user["email"], "role": user["role"], "doctorId": user["doctorId"],
+                     "patientId": user["patientId"]},
+        }
+
+    @staticmethod
+    def _validate(dto, body):
+        required, optional = DTO_FIELDS[dto]
+        if not isinstance(body, dict):
+            raise MockError(400, "Invalid JSON body")
+        errors = [f"property {key} should not exist" for key in body if key not in required | optional]
+        errors += [f"{key} should not be empty" for key in sorted(required) if body.get(key) in (None, "")]
+        if errors:
+            raise MockError(400, errors)
+        return body
+
+    def handle(self, method, path, query, auth_header, body):
+        """Return (status, response body) for one request; latency and errors are injected by the server."""
+        endpoint = endpoint_label(method, path)
+        route = self.route_index.get(endpoint)
+        if route is None:
+            return 404, {"statusCode": 404, "message": f"Cannot {method} {path}", "error": "Not Found"}
+        auth, handler = route
+        params = [segment for segment, pattern in zip(path.split("/"), endpoint.split(" ", 1)[1].split("/"))
+                  if pattern == ":id"]
+        try:
+            with self.lock:
+                self.served[endpoint] = self.served.get(endpoint, 0) + 1
+                user = None
+                if auth:
+                    token = auth_header[7:] if auth_header.startswith("Bearer ") else ""
+                    entry = self.tokens.get(token)
+                    if entry is None or entry[1] < time.time():
+                        raise MockError(401, "Unauthorized")
+                    user = entry[0]
+                status, result = handler(user, body, query, *params)
+        except MockError as e:
+            status = e.status
+            result = {"statusCode": e.status, "message": e.args[0]}
+        except KeyError as e:  # an id the handler looked up does not exist
+            status, result = 404, {"statusCode": 404, "message": f"Not found: {e.args[0]}", "error": "Not Found"}
+        except ValueError as e:  # e.g. ?limit=abc
+            status, result = 400, {"statusCode": 400, "message": str(e), "error": "Bad Request"}
+        except Exception as e:
+            status, result = 500, {"statusCode": 500, "message": f"{type(e).__name__}: {e}",
+                                   "error": "Internal Server Error"}
+        return status, result
+
+    # --- auth ---
+
+    def register(self, _, body, query):
+        body = self._validate("register", body)
+        if body["email"] in self.users:
+            raise MockError(409, "Email already registered")
+        crm = (body["crm"], body["crmState"].upper())
+        if crm in self.crms:
+            raise MockError(409, "CRM already registered")
+        self.crms.add(crm)
+        user = {"id": str(uuid.uuid4()), "email": body["email"], "password": body["password"],
+                "role": "DOCTOR", "doctorId": str(uuid.uuid4()), "patientId": None}
+        self.users[body["email"]] = user
+        self.doctors[user["doctorId"]] = {"id": user["doctorId"], "fullName": body["fullName"],
+                                          "crm": body["crm"], "crmState": crm[1], "phone": body.get("phone")}
+        return 201, self._auth_response(user)
+
+    def register_patient(self, _, body, query):
+        body = self._validate("register_patient", body)
+        if body["email"] in self.users:
+            raise MockError(409, "Email already registered")
+        if body.get("cpf"):
+            if body["cpf"] in self.cpfs:
+                raise MockError(409, "CPF already registered")
+            self.cpfs.add(body["cpf"])
+        user = {"id": str(uuid.uuid4()), "email": body["email"], "password": body["password"],
+                "role": "PATIENT", "doctorId": None, "patientId": str(uuid.uuid4())}
+        self.users[body["email"]] = user
+        self.patients[user["patientId"]] = {"id": user["patientId"], "fullName": body["fullName"],
+                                            "phone": body.get("phone")}
+        return 201, self._auth_response(user)
+
+    def login(self, _, body, query):
+        body = self._validate("login", body)
+        user = self.users.get(body["email"])
+        if user is None or user["password"] != body["password"]:
+            raise MockError(401, "Invalid credentials")
+        return 200, self._auth_response(user)
+
+    def refresh(self, user, body, query):
+        self._validate("refresh", body)
+        response = self._auth_response(user)
+        del response["user"]
+        return 200, response
+
+    # --- doctors ---
+
+    def _my_doctor(self, user):
+        doctor = self.doctors.get(user["doctorId"])
+        if doctor is None:  # a patient token: DoctorService.getProfile finds no doctor
+            raise MockError(404, "Doctor not found")
+        return doctor
+
+    def get_me(self, user, body, query):
+        return 200, self._my_doctor(user)
+
+    def update_me(self, user, body, query):
+        doctor = self._my_doctor(user)
+        doctor.update(self._validate("update_doctor", body))
+        return 200, doctor
+
+    def list_specialties(self, user, body, query):
+        return 200, self.specialties
+
+    def add_specialty(self, user, body, query):
+        body = self._validate("add_specialty", body)
+        key = (user["doctorId"], body["specialtyId"])
+        if key in self.doctor_specialties:
+            raise MockError(500, "Internal server error")
+        if not any(s["id"] == body["specialtyId"] for s in self.specialties):
+            raise MockError(500, "Internal server error")
+        self.doctor_specialties.add(key)
+        return 201, {"id": str(uuid.uuid4()), "doctorId": user["doctorId"], "specialtyId": body["specialtyId"],
+                     "isPrimary": bool(body.get("isPrimary"))}
+
+    # --- institutions and jobs ---
+
+    def create_institution(self, user, body, query):
+        institution = {"id": str(uuid.uuid4()), "adminUserId": user["id"], **self._validate("institution", body)}
+        self.institutions.append(institution)
+        return 201, institution
+
+    def list_institutions(self, user, body, query):
+        page = int(query.get("page", 1))
+        limit = int(query.get("limit", self.INSTITUTIONS_PAGE))
+        data = self.institutions[(page - 1) * limit:page * limit]
+        total = len(self.institutions)
+        return 200, {"data": data, "meta": {"total": total, "page": page, "limit": limit,
+                                            "totalPages": math.ceil(total / limit)}}
+
+    def create_job(self, user, body, query):
+        job = {"id": str(uuid.uuid4()), "isActive": True, **self._validate("job", body)}
+        self.jobs[job["id"]] = job
+        for doctor_id, doctor in self.doctors.items():
+            if doctor.get("city") == job["city"]:
+                self._notify(doctor_id, "JOB_CREATED", "Nova vaga disponível",
+                             f"Nova vaga: {job['title']} em {job['city']}.", {"jobId": job["id"]})
+        return 201, job
+
+    # --- connections ---
+
+    def send_request(self, user, body, query, receiver_id):
+        sender_id = user["doctorId"]
+        if sender_id == receiver_id:
+            raise MockError(400, "Cannot connect to yourself")
+        if receiver_id not in self.doctors:
+            raise MockError(500, "Internal server error")  # foreign key violation on the real API
+        existing = self.requests.get(self.pairs.get(frozenset((sender_id, receiver_id))))
+        if existing and existing["status"] == "ACCEPTED":
+            raise MockError(409, "Already connected")
+        if existing and existing["status"] == "PENDING":
+            raise MockError(409, "Connection request already pending")
+        request = {"id": str(uuid.uuid4()), "senderId": sender_id, "receiverId": receiver_id,
+                   "status": "PENDING", "createdAt": time.time()}
+        self.requests[request["id"]] = request
+        self.pairs[frozenset((sender_id, receiver_id))] = request["id"]
+        return 201, request
+
+    def accept_request(self, user, body, query, request_id):
+        request = self.requests.get(request_id)
+        if request is None:
+            raise MockError(404, "Request not found")
+        if request["receiverId"] != user["doctorId"]:
+            raise MockError(400, "Not your request to accept")
+        if request["status"] != "PENDING":
+            raise MockError(400, "Request is no longer pending")
+        request["status"] = "ACCEPTED"
+        self.connected.setdefault(request["senderId"], set()).add(request["receiverId"])
+        self.connected.setdefault(request["receiverId"], set()).add(request["senderId"])
+        return 201, {"message": "Connection accepted"}
+
+    def pending_requests(self, user, body, query):
+        doctor_id = user["doctorId"]
+        pending = [r for r in self.requests.values() if r["receiverId"] == doctor_id and r["status"] == "PENDING"]
+        return 200, [{**r, "sender": {"id": r["senderId"], "fullName": self.doctors[r["senderId"]]["fullName"]}}
+                     for r in pending]
+
+    def _doctor_row(self, doctor_id):
+        doctor = self.doctors[doctor_id]
+        return {"id": doctor_id, "fullName": doctor["fullName"], "crm": doctor.get("crm"),
+                "crmState": doctor.get("crmState"), "profilePicUrl": None}
+
+    def my_connections(self, user, body, query):
+        return 200, [self._doctor_row(other) for other in self.connected.get(user["doctorId"], ())]
+
+    def suggestions(self, user, body, query):
+        """Friends of friends ranked by mutual connections, like the graph query."""
+        doctor_id = user["doctorId"]
+        friends = self.connected.get(doctor_id, set())
+        mutual = {}
+        for friend in friends:
+            for other in self.connected.get(friend, ()):
+                if other != doctor_id and other not in friends:
+                    mutual[other] = mutual.get(other, 0) + 1
+        ranked = sorted(mutual.items(), key=lambda item: -item[1])[:int(query.get("limit", 10))]
+        return 200, [{**self._doctor_row(other), "mutualConnections": count} for other, count in ranked]
+
+    def influential(self, user, body, query):
+        ranked = sorted(self.connected.items(), key=lambda item: -len(item[1]))[:int(query.get("limit", 10))]
+        return 200, [{"id": doctor_id, "name": self.doctors[doctor_id]["fullName"], "pageRank": len(friends),
+                      "betweenness": len(friends), "communityId": None, "specialties": []}
+                     for doctor_id, friends in ranked]
+
+    def no_results(self, user, body, query, *params):
+        return 200, []
+
+    # --- feed ---
+
+    def create_post(self, user, body, query):
+        body = self._validate("post", body)
+        post = {"postId": str(uuid.uuid4()), "authorId": user["doctorId"], "content": body["content"],
+                "postType": body.get("postType", "TEXT"), "tags": body.get("tags") or [],
+                "likesCount": 0, "commentsCount": 0, "createdAt": time.time()}
+        self.posts[post["postId"]] = post
+        self.post_order.append(post["postId"])
+        return 201, post
+
+    def timeline(self, user, body, query):
+        limit = int(query.get("limit", self.TIMELINE_LIMIT))
+        return 200, [self.posts[post_id] for post_id in self.post_order[-limit:][::-1]]
+
+    def trending(self, user, body, query):
+        limit = int(query.get("limit", 20))
+        top = sorted(self.posts.values(), key=lambda p: -p["likesCount"])[:limit]
+        tags = {}
+        for post in self.posts.values():
+            for tag in post["tags"]:
+                tags[tag] = tags.get(tag, 0) + 1
+        return 200, {"tags": [{"tag": tag, "count": count}
+                              for tag, count in sorted(tags.items(), key=lambda item: -item[1])[:limit]],
+                     "topPosts": top}
+
+    def like(self, user, body, query, post_id):
+        post = self.posts.get(post_id)
+        if post is None:
+            raise MockError(404, "Post not found")
+        # likes_by_post is keyed by (post, user), so a repeated like is an idempotent upsert
+        if (post_id, user["doctorId"]) not in self.likes:
+            self.likes.add((post_id, user["doctorId"]))
+            post["likesCount"] += 1
+        return 201, {"message": "Post liked"}
+
+    def comment(self, user, body, query, post_id):
+        body = self._validate("comment", body)
+        post = self.posts.get(post_id)
+        if post is None:
+            raise MockError(404, "Post not found")
+        post["commentsCount"] += 1
+        return 201, {"commentId": str(uuid.uuid4()), "postId": post_id, "authorId": user["doctorId"],
+                     "content": body["content"], "createdAt": time.time()}
+
+    def bookmark(self, user, body, query, post_id):
+        # bookmarks_by_user is keyed by bookmarked_at, so every call adds a row
+        self.bookmarks.append((user["doctorId"], post_id))
+        return 201, {"status": "bookmarked"}
+
+
+    # --- notifications and chat ---
+
+    def _notify(self, doctor_id, kind, title, body, data):
+        self.notifications.setdefault(doctor_id, []).append({
+            "notificationId": str(uuid.uuid4()), "type": kind, "title": title, "body": body, "data": data,
+            "isRead": False, "createdAt": datetime.datetime.now(datetime.timezone.utc).isoformat()})
+
+    def list_notifications(self, user, body, query):
+        limit = int(query.get("limit", 30))
+        return 200, self.notifications.get(user["doctorId"], [])[::-1][:limit]
+
+    def chat_message(self, sender_id, payload):
+        """The message ChatService.sendMessage stores and returns; raises MockError like handle()."""
+        with self.lock:
+            self.served["WS send_message"] = self.served.get("WS send_message", 0) + 1
+            payload = self._validate("chat_message", payload)
+            message = {"messageId": str(uuid.uuid4()),
+                       "chatId": payload.get("chatId") or chat_id(sender_id, payload["receiverId"]),
+                       "senderId": sender_id, "content": payload["content"],
+                       "messageType": payload.get("messageType") or "TEXT", "mediaUrl": payload.get("mediaUrl"),
+                       "sentAt": datetime.datetime.now(datetime.timezone.utc).isoformat(), "isRead": False}
+            self.chats[message["chatId"]] = self.chats.get(message["chatId"], 0) + 1
+            return message
+
+    # --- workplaces, availability and appointments ---
+
+    @staticmethod
+    def _profile_id(user, key):
+        """The doctorId or patientId the route needs; Prisma rejects the missing id on the real API."""
+        if not user[key]:
+            raise MockError(500, "Internal server error")
+        return user[key]
+
+    @staticmethod
+    def _scheduled_at(value):
+        """Parse an ISO date like `new Date()` and return it with its toISOString() key."""
+        try:
+            when = datetime.datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            raise MockError(400, ["scheduledAt must be a valid ISO 8601 date string"])
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=datetime.timezone.utc)
+        when = when.astimezone(datetime.timezone.utc)
+        return when, when.strftime("%Y-%m-%dT%H:%M:%S.") + f"{when.microsecond // 1000:03d}Z"
+
+    def create_workplace(self, user, body, query):
+        doctor_id = self._profile_id(user, "doctorId")
+        workplace = {"id": str(uuid.uuid4()), "doctorId": doctor_id, "isActive": True,
+                     **self._validate("workplace", body)}
+        self.workplaces[workplace["id"]] = workplace
+        return 201, workplace
+
+    def my_workplaces(self, user, body, query):
+        doctor_id = self._profile_id(user, "doctorId")
+        return 200, [w for w in self.workplaces.values() if w["doctorId"] == doctor_id]
+
+    def create_availability(self, user, body, query):
+        doctor_id = self._profile_id(user, "doctorId")
+        body = self._validate("availability", body)
+        workplace = self.workplaces.get(body["workplaceId"])
+        if workplace is None:
+            raise MockError(404, "Workplace not found")
+        if workplace["doctorId"] != doctor_id:
+            raise MockError(403, "Not your workplace")
+        if body["startTime"] >= body["endTime"]:
+            raise MockError(400, "Start time must be before end time")
+        windows = self.availability.setdefault((doctor_id, workplace["id"], body["dayOfWeek"]), {})
+        if body["startTime"] in windows:
+            raise MockError(500, "Internal server error")  # unique key the backend does not map
+        availability = {"id": str(uuid.uuid4()), "doctorId": doctor_id, **body,
+                        "slotDurationMin": body.get("slotDurationMin") or 30, "isActive": True}
+        windows[body["startTime"]] = availability
+        return 201, availability
+
+    def my_availability(self, user, body, query):
+        doctor_id = self._profile_id(user, "doctorId")
+        return 200, [a for (owner, _, _), windows in self.availability.items() if owner == doctor_id
+                     for a in windows.values()]
+
+    def search_doctors(self, user, body, query):
+        body = self._validate("search_doctors", body)
+        latitude, longitude = math.radians(body["latitude"]), math.radians(body["longitude"])
+        date = body.get("date")
+        days = [DAY_NAMES[self._scheduled_at(date)[0].weekday()]] if date else DAY_NAMES
+        preferred = minutes(body["preferredTime"]) if body.get("preferredTime") else None
+        results = []
+        for workplace in self.workplaces.values():
+            lat, lon = math.radians(workplace["latitude"]), math.radians(workplace["longitude"])
+            distance = 12742 * math.asin(math.sqrt(math.sin((lat - latitude) / 2) ** 2 + math.cos(latitude)
+                                                   * math.cos(lat) * math.sin((lon - longitude) / 2) ** 2))
+            if distance > body.get("radiusKm", 10):
+                continue
+            slots = []
+            for day in days:
+                for a in self.availability.get((workplace["doctorId"], workplace["id"], day), {}).values():
+                    for minute in range(minutes(a["startTime"]), minutes(a["endTime"]), a["slotDurationMin"]):
+                        slot = f"{minute // 60:02d}:{minute % 60:02d}"
+                        if preferred is not None and abs(minute - preferred) > 120:
+                            continue
+                        if date and (workplace["doctorId"], f"{date[:10]}T{slot}:00.000Z") in self.booked:
+                            continue
+                        slots.append(slot)
+            if slots:
+                results.append({"doctor": self._doctor_row(workplace["doctorId"]), "workplace": workplace,
+                                "distanceKm": round(distance, 1), "availableSlots": slots, "date": date})
+        results.sort(key=lambda item: item["distanceKm"])
+        page, limit = body.get("page", 1), body.get("limit", 20)
+        return 201, {"data": results[(page - 1) * limit:page * limit],
+                     "meta": {"total": len(results), "page": page, "limit": limit,
+                              "totalPages": math.ceil(len(results) / limit)}}
+
+    def book_appointment(self, user, body, query):
+        patient_id = self._profile_id(user, "patientId")
+        body = self._validate("appointment", body)
+        doctor_id = body["doctorId"]
+        if doctor_id not in self.doctors:
+            raise MockError(404, "Doctor not found")
+        workplace = self.workplaces.get(body["workplaceId"])
+        if workplace is None:
+            raise MockError(404, "Workplace not found")
+        if workplace["doctorId"] != doctor_id:
+            raise MockError(400, "Workplace does not belong to this doctor")
+        when, scheduled_at = self._scheduled_at(body["scheduledAt"])
+        if when <= datetime.datetime.now(datetime.timezone.utc):
+            raise MockError(400, "Cannot schedule in the past")
+        hhmm = when.strftime("%H:%M")
+        windows = self.availability.get((doctor_id, workplace["id"], DAY_NAMES[when.weekday()]), {}).values()
+        availability = next((a for a in windows if a["startTime"] <= hhmm < a["endTime"] and a["isActive"]), None)
+        if availability is None:
+            raise MockError(400, "Doctor is not available at this time and location")
+        if (doctor_id, scheduled_at) in self.booked:
+            raise MockError(409, "This time slot is already booked")
+        if (patient_id, scheduled_at) in self.booked:
+            raise MockError(409, "You already have an appointment at this time")
+        appointment = {"id": str(uuid.uuid4()), "patientId": patient_id, "doctorId": doctor_id,
+                       "workplaceId": workplace["id"], "scheduledAt": scheduled_at, "status": "PENDING",
+                       "type": body.get("type", "PRESENCIAL"), "reason": body.get("reason"),
+                       "durationMin": availability["slotDurationMin"]}
+        self.appointments[appointment["id"]] = appointment
+        self.booked[(doctor_id, scheduled_at)] = self.booked[(patient_id, scheduled_at)] = appointment["id"]
+        return 201, appointment
+
+    def cancel_appointment(self, user, body, query, appointment_id):
+        body = self._validate("cancel_appointment", body)
+        appointment = self.appointments.get(appointment_id)
+        if appointment is None:
+            raise MockError(404, "Appointment not found")
+        is_patient = user["patientId"] is not None and appointment["patientId"] == user["patientId"]
+        if not is_patient and (user["doctorId"] is None or appointment["doctorId"] != user["doctorId"]):
+            raise MockError(403, "Not your appointment")
+        if appointment["status"].startswith("CANCELLED"):
+            raise MockError(400, "Appointment already cancelled")
+        if appointment["status"] == "COMPLETED":
+            raise MockError(400, "Cannot cancel a completed appointment")
+        appointment.update(status="CANCELLED_BY_PATIENT" if is_patient else "CANCELLED_BY_DOCTOR",
+                           cancelledAt=time.time(), cancelReason=body.get("reason"))
+        for owner in (appointment["doctorId"], appointment["patientId"]):
+            self.booked.pop((owner, appointment["scheduledAt"]), None)
+        return 200, appointment
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real server behind the pooled session
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+    backend = None                 # set on the subclass built by start_mock_server()
+
+    def log_message(self, *args):
+        pass
+
+    def _serve(self):
+        backend = self.backend
+        delay = backend.latency + (backend.rng.expovariate(1 / backend.jitter) if backend.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        path, _, query_string = self.path.partition("?")
+        if not path.startswith(MOCK_PREFIX):
+            status, result = 404, {"statusCode": 404, "message": "Not Found"}
+        elif backend.error_rate and backend.rng.random() < backend.error_rate:
+            status, result = 503, {"statusCode": 503, "message": "Service Unavailable (mock)"}
+        else:
+            try:
+                body = json.loads(raw) if raw else {}
+            except ValueError:
+                body = None
+            query = dict(urllib.parse.parse_qsl(query_string, keep_blank_values=True))
+            status, result = backend.handle(self.command, path[len(MOCK_PREFIX):], query,
+                                            self.headers.get("Authorization", ""), body)
+        data = json.dumps(result).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_PATCH = _serve
+
+
+def start_mock_server(backend, host="127.0.0.1", port=0):
+    """Serve `backend` from a daemon thread; returns (server, base URL). Port 0 picks a free one."""
+    handler = type("BoundMockHandler", (MockHandler,), {"backend": backend})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mock-api", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}{MOCK_PREFIX}"
+
+
+class MockChatGateway:
+    """The /chat namespace of ChatGateway on a socket.io server of its own (python-socketio + aiohttp).
+
+    Like the real gateway it trusts the handshake's ?userId= and joins the
+    socket to room user:<userId>. send_message acks with the message, emits
+    new_message to the receiver's room and message_sent to the sender.
+    The backend's latency applies to every message and its error rate drops
+    messages with an `exception` event and no ack, as a failing Nest handler does.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.sio = socketio.AsyncServer(async_mode="aiohttp", cors_allowed_origins="*")
+        self.sio.on("connect", self.connect, namespace=CHAT_NAMESPACE)
+        self.sio.on("send_message", self.send_message, namespace=CHAT_NAMESPACE)
+        self.app = aiohttp.web.Application()
+        self.sio.attach(self.app)
+
+    async def connect(self, sid, environ, auth=None):
+        query = dict(urllib.parse.parse_qsl(environ.get("QUERY_STRING", ""), keep_blank_values=True))
+        if not query.get("userId"):
+            return False
+        await self.sio.save_session(sid, {"userId": query["userId"]}, namespace=CHAT_NAMESPACE)
+        await self.sio.enter_room(sid, f"user:{query['userId']}", namespace=CHAT_NAMESPACE)
+
+    async def send_message(self, sid, payload):
+        backend = self.backend
+        delay = backend.latency + (backend.rng.expovariate(1 / backend.jitter) if backend.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        session = await self.sio.get_session(sid, namespace=CHAT_NAMESPACE)
+        try:
+            if backend.error_rate and backend.rng.random() < backend.error_rate:
+                raise MockError(503, "Service Unavailable (mock)")
+            message = backend.chat_message(session["userId"], payload)
+        except MockError as e:
+            await self.sio.emit("exception", {"status": "error", "message": e.args[0]}, to=sid,
+                                namespace=CHAT_NAMESPACE)
+            return None
+        await self.sio.emit("new_message", message, room=f"user:{payload['receiverId']}", namespace=CHAT_NAMESPACE)
+        await self.sio.emit("message_sent", message, to=sid, namespace=CHAT_NAMESPACE)
+        return message
+
+
+def start_mock_gateway(backend, host="127.0.0.1", port=0):
+    """Serve MockChatGateway from a daemon thread with its own event loop; returns its URL."""
+    gateway = MockChatGateway(backend)
+    ready = queue.Queue()
+
+    def run():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            runner = aiohttp.web.AppRunner(gateway.app, handle_signals=False)
+            loop.run_until_complete(runner.setup())
+            loop.run_until_complete(aiohttp.web.TCPSite(runner, host, port).start())
+        except OSError as e:
+            ready.put(e)
+            return
+        ready.put(runner.addresses[0][1])
+        loop.run_forever()
+
+    threading.Thread(target=run, name="mock-chat", daemon=True).start()
+    bound = ready.get()
+    if isinstance(bound, OSError):
+        raise bound
+    return f"http://{host}:{bound}"
+
+
+def build_mock(args):
+    return MockBackend(latency=args.mock_latency / 1000, jitter=args.mock_jitter / 1000,
+                       error_rate=args.mock_error_rate)
+
+
+def print_mock_stats(backend):
+    print(f"  Mock: {sum(backend.served.values())} requisições atendidas")
+    for endpoint, count in sorted(backend.served.items(), key=lambda item: -item[1]):
+        print(f"    {endpoint:<34} {count:>8}")
+
+
+def serve_mock(args):
+    """`mock` subcommand: run the stand-in API in the foreground until Ctrl+C."""
+    backend = build_mock(args)
+    server, base = start_mock_server(backend, args.host, args.port)
+    print(f"Mock da API MedConnect em {base} (latência {args.mock_latency:g}ms "
+          f"+ cauda {args.mock_jitter:g}ms, erro {args.mock_error_rate:.1%}). Ctrl+C para sair.")
+    print(f"  Use: python3 seed-data.py --base-url {base}")
+    if socketio is not None:
+        socket_url = start_mock_gateway(backend, args.host, args.chat_port)
+        print(f"  Gateway {CHAT_NAMESPACE} em {socket_url}: python3 seed-data.py chat --base-url {base} "
+              f"--socket-url {socket_url}")
+    else:
+        print(f"  Gateway {CHAT_NAMESPACE} desativado: {CHAT_REQUIREMENT}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        print()
+        print_mock_stats(backend)
+
+
+def mock_options():
+    """Parent parser of the fault injection options, for the mock subcommand and every --mock run."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--mock-latency", type=float, default=0.0,
+                        help="Latência fixa injetada em cada resposta do mock, em ms")
+    parser.add_argument("--mock-jitter", type=float, default=0.0,
+                        help="Média da cauda exponencial somada à latência do mock, em ms")
+    parser.add_argument("--mock-error-rate", type=float, default=0.0,
+                        help="Fração das requisições que o mock responde com 503 (0 a 1)")
+    return parser
+
+
+def add_parser(commands, parents):
+    """The `mock` subparser: listen address and ports of the standalone mock."""
+    parser = commands.add_parser("mock", parents=[parents.mock], help="Sobe só o mock da API",
+                                 description="Servidor HTTP em memória com os endpoints que este script usa, "
+                                             "para testar seed e bench sem o backend.")
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço de escuta")
+    parser.add_argument("--port", type=int, default=3000, help="Porta de escuta")
+    parser.add_argument("--chat-port", type=int, default=3001,
+                        help="Porta do gateway socket.io /chat (precisa do python-socketio)")
+    return parser
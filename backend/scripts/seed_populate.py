@@ -0,0 +1,453 @@
+"""Subcomando seed do seed-data.py: popula o backend como um grafo de tarefas."""
+from array import array
+
+import seed_http  # for CONTROLLER, which main() sets
+import seed_verify
+from seed_datasets import ShardView, engagement_key
+from seed_http import (accept_connection, add_specialty, api, bookmark_post, comment_post, create_institution,
+                       create_job, create_post, get_pending_requests, get_specialties, job_payload, like_post, login,
+                       register_doctor, send_connection, update_profile)
+from seed_state import DEFAULT_JOURNAL, ByteArena, post_key, print_footprint
+from seed_tasks import print_adaptive
+
+
+def seed(args, graph, dataset, journal, tokens):
+    """Run the seed against BASE as a task graph: every task starts as soon as its inputs exist.
+
+    Doctors and posts are keyed by their Registry handle (resolved once the
+    entity exists; its server id is in the registry). The named keys are
+    "account" (any email we can act as), "admin" (the account that creates
+    institutions and jobs) and "specialties" (the name -> id map).
+    """
+    print("=" * 60)
+    print("MedConnect - Seed de Dados Massivo")
+    print(f"Concorrência: {args.concurrency}" + (" (retomando do journal)" if args.resume else ""))
+    print("Dataset: " + ", ".join(f"{k}={v}" for k, v in dataset.sizes.items()))
+    if args.shard_index is not None:
+        print(f"Shard: {args.shard_index} de {args.shards} (fase {args.shard_phase})")
+    print("=" * 60)
+
+    registry = tokens.registry  # emails and post keys -> handles; tokens come from `tokens`
+    spec_name_to_id = {}
+    inst_name_to_id = {}
+    counts = {"doctors": 0, "jobs": 0, "connections": 0, "posts": 0, "like": 0, "comment": 0, "bookmark": 0}
+    tokens.probe(dataset.first_email())
+    print("\nExecutando as etapas [1/7]..[7/7] como grafo de dependências...")
+
+    def doctor_key(email):
+        return registry.handle(email)
+
+    def doctor_id(email):
+        return registry.id(registry.handle(email))
+
+    def pick_admin():
+        # Use the demo user for institutions and jobs once we know whether it logged in
+        if graph.get("admin") is None and graph.get("done:[1/7] login") and graph.get("account"):
+            demo = "demo@medconnect.com"
+            graph.resolve("admin", demo if graph.get(doctor_key(demo)) else graph.get("account"))
+
+    def known_doctor(email, server_id):
+        handle = doctor_key(email)
+        if not graph.get(handle):
+            counts["doctors"] += 1
+        registry.set_id(handle, server_id)
+        graph.resolve(handle)
+        graph.resolve("account", email)
+        pick_admin()
+
+    # --- Step 1: Register new doctors ---
+    def unregistered():
+        """Doctors not yet known; journaled or token-cached ones are restored without any request."""
+        for doc in dataset.doctors():
+            email = doc["email"]
+            entry = journal.get("doctor", email)
+            if entry:
+                known_doctor(email, entry[0])
+                journal.count_skipped("doctor")
+                continue
+            cached_id = tokens.doctor_id(email)
+            if cached_id:
+                journal.record("doctor", email, cached_id)
+                known_doctor(email, cached_id)
+                continue
+            yield doc
+
+    def registered(doc, auth):
+        if auth and auth["user"].get("doctorId"):
+            tokens.store(doc["email"], auth)
+            journal.record("doctor", doc["email"], auth["user"]["doctorId"])
+            known_doctor(doc["email"], auth["user"]["doctorId"])
+            print(f"  [1/7] ✓ {doc['fullName']} ({doc['email']})")
+        else:
+            graph.fail(doctor_key(doc["email"]))
+            print(f"  [1/7] ✗ {doc['fullName']} - FALHOU")
+
+    graph.add("[1/7]", register_doctor, unregistered(), on_result=registered)
+
+    # Login demo user and existing doctors
+    def not_logged_in():
+        for email, password in dataset.existing_accounts():
+            cached_id = tokens.doctor_id(email)
+            if cached_id:
+                known_doctor(email, cached_id)
+            else:
+                yield email, password
+
+    def logged_in(account, auth):
+        if auth:
+            tokens.store(account[0], auth)
+            known_doctor(account[0], auth["user"]["doctorId"])
+            if account[0] == "demo@medconnect.com":
+                print("  [1/7] ✓ Demo user logged in")
+        else:
+            graph.fail(doctor_key(account[0]))
+
+    graph.add("[1/7] login", lambda acc: login(*acc), not_logged_in(), on_result=logged_in,
+              on_drained=pick_admin)
+
+    # Accounts of other shards this shard acts as (only in the reconcile phase of --shards)
+    def foreign_ready(email, token):
+        handle = doctor_key(email)
+        if token and registry.id(handle):
+            graph.resolve(handle)
+        else:
+            graph.fail(handle)
+            print(f"  [1/7] ✗ {email} (outro shard) - sem token")
+
+    if args.shard_phase == "reconcile":
+        graph.add("[1/7] outro shard", tokens.token, dataset.foreign_accounts(), on_result=foreign_ready)
+
+    # --- Step 2: Update profiles ---
+    def profile_updated(doc, ok):
+        if ok:
+            journal.record("profile", doc["email"])
+            print(f"  [2/7] ✓ {doc['fullName']} - perfil atualizado")
+        else:
+            print(f"  [2/7] ✗ {doc['fullName']} - falha ao atualizar")
+
+    graph.add("[2/7]", lambda doc: update_profile(tokens.token(doc["email"]), doc),
+              journal.pending("profile", dataset.doctors(), key=lambda doc: doc["email"]),
+              needs=lambda doc: (doctor_key(doc["email"]),), on_result=profile_updated)
+
+    # --- Step 3: Assign specialties ---
+    def specialties_loaded(_, specialties):
+        spec_name_to_id.update({s["name"]: s["id"] for s in specialties})
+        print(f"  [3/7] Especialidades disponíveis: {list(spec_name_to_id.keys())}")
+        graph.resolve("specialties", spec_name_to_id)
+
+    # Any token can read the specialty list
+    graph.add("[3/7] catálogo", lambda _: get_specialties(tokens.token(graph.get("account"))), [None],
+              needs=lambda _: ("account",), on_result=specialties_loaded)
+
+    def assignments():
+        """Yield (email, spec_name, spec_id); read only once the specialty map exists."""
+        missing = set()
+        for email, spec_name in dataset.specialty_assignments():
+            spec_id = spec_name_to_id.get(spec_name)
+            if not spec_id:
+                if spec_name not in missing:
+                    missing.add(spec_name)
+                    print(f"  [3/7] ✗ Especialidade '{spec_name}' não encontrada")
+                continue
+            yield email, spec_name, spec_id
+
+    def specialty_added(assignment, ok):
+        email, spec_name, spec_id = assignment
+        if ok:
+            journal.record("specialty", f"{email}|{spec_name}", spec_id)
+            print(f"  [3/7] ✓ {email} -> {spec_name}")
+        else:
+            print(f"  [3/7] ✗ {email} -> {spec_name} (pode já existir)")
+
+    graph.add("[3/7]", lambda a: add_specialty(tokens.token(a[0]), a[2], is_primary=True),
+              journal.pending("specialty", assignments(), key=lambda a: f"{a[0]}|{a[1]}"),
+              needs=lambda a: (doctor_key(a[0]),), after=("specialties",), on_result=specialty_added)
+
+    # --- Step 4: Create institutions ---
+    def institution_created(inst, inst_id):
+        if inst_id and inst_id != "exists":
+            journal.record("institution", inst["name"], inst_id)
+            print(f"  [4/7] ✓ {inst['name']} ({inst['city']}/{inst['state']})")
+        elif inst_id == "exists":
+            journal.record("institution", inst["name"])
+            print(f"  [4/7] ~ {inst['name']} (já existe)")
+        else:
+            print(f"  [4/7] ✗ {inst['name']} - FALHOU")
+
+    graph.add("[4/7]", lambda inst: create_institution(tokens.token(graph.get("admin")), inst),
+              journal.pending("institution", dataset.institutions(), key=lambda inst: inst["name"]),
+              needs=lambda _: ("admin",), on_result=institution_created)
+
+    def list_institutions(_):
+        r = api("GET", "/institutions", tokens.token(graph.get("admin")))
+        return r.json() if r is not None and r.status_code == 200 else []
+
+    def institutions_listed(_, all_institutions):
+        if isinstance(all_institutions, dict) and "data" in all_institutions:
+            all_institutions = all_institutions["data"]
+        inst_name_to_id.update({i["name"]: i["id"] for i in all_institutions if isinstance(i, dict)})
+        print(f"  [4/7] Total de instituições: {len(inst_name_to_id)}")
+
+    graph.add("[4/7] lista", list_institutions, [None], needs=lambda _: ("admin",), after=("done:[4/7]",),
+              on_result=institutions_listed)
+
+    # --- Step 5: Create jobs ---
+    # POST /jobs takes the institution from the caller's token (@CurrentUser('institutionId')),
+    # so a job only waits for the admin account and the specialty map.
+    def job_created(job, job_id):
+        if job_id:
+            counts["jobs"] += 1
+            journal.record("job", job["title"], job_id)
+            print(f"  [5/7] ✓ {job['title']}")
+        else:
+            print(f"  [5/7] ✗ {job['title']}")
+
+    # create_job has no 409 on the backend, so the journal is what prevents duplicates on rerun
+    graph.add("[5/7]", lambda job: create_job(tokens.token(graph.get("admin")), job_payload(job, spec_name_to_id)),
+              journal.pending("job", dataset.jobs(), key=lambda job: job["title"]),
+              needs=lambda _: ("admin",), after=("specialties",), on_result=job_created)
+
+    # --- Step 6: Create connections ---
+    # Batched instead of send/fetch-pending/accept per pair: send every request,
+    # fetch each receiver's pending list once (indexed by senderId), then accept
+    # the matches in bulk. Each phase needs the previous one complete.
+    # Pairs whose send failed are kept: a 409 may mean a request left pending by an earlier run.
+    expected = {}  # receiver handle -> array of sender handles
+    accept_senders, accept_receivers = array("q"), array("q")
+    accept_requests = ByteArena()  # request ids, parallel to the two arrays above
+
+    def expect(sender_email, receiver_email):
+        senders = expected.get(doctor_key(receiver_email))
+        if senders is None:
+            senders = expected[doctor_key(receiver_email)] = array("q")
+        senders.append(doctor_key(sender_email))
+
+    def pairs_to_send():
+        """Skip accepted pairs; pairs already sent go straight to the accept phase."""
+        for pair in journal.pending("connection", dataset.connections(), key="|".join):
+            if journal.get("connection_sent", "|".join(pair)) is not None:
+                expect(*pair)
+                continue
+            yield pair
+
+    def connection_sent(pair, ok):
+        sender_email, receiver_email = pair
+        expect(sender_email, receiver_email)
+        if ok:
+            journal.record("connection_sent", f"{sender_email}|{receiver_email}")
+        else:
+            print(f"  [6/7] ~ {sender_email} -> {receiver_email} (já existe ou falhou)")
+
+    graph.add("[6/7] envio", lambda pair: send_connection(tokens.token(pair[0]), doctor_id(pair[1])),
+              pairs_to_send(), needs=lambda pair: (doctor_key(pair[0]), doctor_key(pair[1])),
+              on_result=connection_sent,
+              on_blocked=lambda pair: print(f"  [6/7] ✗ {pair[0]} -> {pair[1]} (token/id missing)"))
+
+    def receivers():
+        yield from list(expected)
+
+    def pending_by_sender(receiver):
+        return {req["senderId"]: req["id"] for req in get_pending_requests(tokens.token(registry.key(receiver)))
+                if req["status"] == "PENDING"}
+
+    def pending_loaded(receiver, pending):
+        for sender in expected.pop(receiver):
+            request_id = pending.get(registry.id(sender))
+            if request_id:
+                accept_requests.set(len(accept_senders), request_id.encode())
+                accept_senders.append(sender)
+                accept_receivers.append(receiver)
+
+    graph.add("[6/7] pendentes", pending_by_sender, receivers(), needs=lambda receiver: (receiver,),
+              after=("done:[6/7] envio",), on_result=pending_loaded)
+
+    def accepted(item, ok):
+        sender_email, receiver_email = registry.key(item[0]), registry.key(item[1])
+        if ok:
+            counts["connections"] += 1
+            journal.record("connection", f"{sender_email}|{receiver_email}")
+            print(f"  [6/7] ✓ {sender_email} <-> {receiver_email}")
+        else:
+            print(f"  [6/7] ✗ Accept failed: {sender_email} <-> {receiver_email}")
+
+    def accepts_to_send():
+        for i in range(len(accept_senders)):
+            yield accept_senders[i], accept_receivers[i], accept_requests.get(i).decode()
+
+    graph.add("[6/7] aceite", lambda item: accept_connection(tokens.token(registry.key(item[1])), item[2]),
+              accepts_to_send(), after=("done:[6/7] pendentes",), on_result=accepted)
+
+    # --- Step 7: Create posts ---
+    def post_ref(key):
+        return registry.handle(key)
+
+    def unposted():
+        """Posts not in the journal; journaled ones only publish their id for the engagement below."""
+        for post in dataset.posts():
+            key = post_key(post)
+            entry = journal.get("post", key)
+            if entry:
+                registry.set_id(post_ref(key), entry[0])
+                graph.resolve(post_ref(key))
+                journal.count_skipped("post")
+                continue
+            yield post
+
+    def post_created(post, post_id):
+        if post_id:
+            counts["posts"] += 1
+            journal.record("post", post_key(post), post_id)
+            registry.set_id(post_ref(post_key(post)), post_id)
+            graph.resolve(post_ref(post_key(post)))
+            print(f"  [7/7] ✓ Post por {post['email'][:30]}...")
+        else:
+            graph.fail(post_ref(post_key(post)))
+            print(f"  [7/7] ✗ Post por {post['email']} - FALHOU")
+
+    def post_blocked(post):
+        graph.fail(post_ref(post_key(post)))
+        print(f"  [7/7] ✗ {post['email']} - token não encontrado")
+
+    graph.add("[7/7]", lambda post: create_post(tokens.token(post["email"]), post["content"], post.get("tags")),
+              unposted(), needs=lambda post: (doctor_key(post["email"]),), on_result=post_created,
+              on_blocked=post_blocked)
+
+    # Likes, comments and bookmarks start as soon as their post exists, paced by the graph
+    # with --engagement-rps. Only failures are printed: there are several per post and the
+    # summary has the totals.
+    engage_calls = {
+        "like": lambda token, post_id, event: like_post(token, post_id),
+        "comment": lambda token, post_id, event: comment_post(token, post_id, event["content"]),
+        "bookmark": lambda token, post_id, event: bookmark_post(token, post_id),
+    }
+
+    def unengaged():
+        for event in dataset.engagement():
+            if journal.get(event["kind"], engagement_key(event)) is not None:
+                journal.count_skipped(event["kind"])
+                continue
+            yield event
+
+    def engage(event):
+        return engage_calls[event["kind"]](tokens.token(event["email"]), registry.id(post_ref(event["post"])), event)
+
+    def engaged(event, ok):
+        if ok:
+            counts[event["kind"]] += 1
+            journal.record(event["kind"], engagement_key(event))
+        else:
+            print(f"  [7/7] ✗ {event['kind']} de {event['email']} em {registry.id(post_ref(event['post']))}")
+
+    graph.add("[7/7] engajamento", engage, unengaged(),
+              needs=lambda event: (post_ref(event["post"]), doctor_key(event["email"])), on_result=engaged,
+              rate=args.engagement_rps)
+
+    graph.run()
+
+    for label in graph.not_started():
+        print(f"  ✗ {label}: não executada (dependências indisponíveis)")
+    for kind, label in (("doctor", "[1/7]"), ("profile", "[2/7]"), ("specialty", "[3/7]"),
+                        ("institution", "[4/7]"), ("job", "[5/7]"), ("connection", "[6/7]"), ("post", "[7/7]"),
+                        ("like", "[7/7] curtidas"), ("comment", "[7/7] comentários"), ("bookmark", "[7/7] favoritos")):
+        journal.print_skipped(kind, label)
+    if tokens.stats["cache"]:
+        print(f"  ↷ {tokens.stats['cache']} contas já no cache de tokens (sem login)")
+
+    return {
+        "counts": counts,
+        "skipped": journal.skipped,
+        "tokens": tokens.stats,
+        "institutions": len(inst_name_to_id),
+        "sizes": dataset.sizes,
+        "zipf": dataset.zipf,
+        "entities": len(registry),
+        "footprint": {**registry.footprint(), **tokens.footprint()},
+        "adaptive": seed_http.CONTROLLER.summary() if seed_http.CONTROLLER else None,
+    }
+
+def print_seed_summary(args, report, graph, metrics):
+    """Final report of a seed run, or of the merged shards of one."""
+    counts, skipped, sizes, token_stats = report["counts"], report["skipped"], report["sizes"], report["tokens"]
+    print("\n" + "=" * 60)
+    print("RESUMO DO SEED")
+    print("=" * 60)
+    print(f"  Médicos registrados: {counts['doctors']}")
+    print(f"  Instituições: {report['institutions']}")
+
+    def created(count, kind, planned):
+        previous = skipped.get(kind, 0)
+        return f"{count}" + (f" (+{previous} do journal)" if previous else "") + f" de {planned}"
+
+    print(f"  Vagas criadas: {created(counts['jobs'], 'job', sizes['jobs'])}")
+    print(f"  Conexões aceitas: {created(counts['connections'], 'connection', sizes['connections'])}")
+    print(f"  Posts criados: {created(counts['posts'], 'post', sizes['posts'])}")
+    print(f"  Curtidas: {created(counts['like'], 'like', sizes['likes'])}, "
+          f"comentários: {created(counts['comment'], 'comment', sizes['comments'])}, "
+          f"favoritos: {created(counts['bookmark'], 'bookmark', sizes['bookmarks'])} "
+          f"(Zipf {report['zipf']:g})")
+    print(f"  Tokens: {token_stats['cache']} do cache, {token_stats['refresh']} renovados, "
+          f"{token_stats['login']} logins sob demanda")
+    print_footprint(report["footprint"], report["entities"])
+    print("-" * 60)
+    print("  Tempo por etapa (sequencial estimado = soma do tempo das chamadas)")
+    graph.print_speedup()
+    if metrics is not None:
+        print("-" * 60)
+        print("  Latência por etapa (por requisição HTTP, em ms)")
+        metrics.print_steps(graph)
+        if report["adaptive"]:
+            print("-" * 60)
+            print_adaptive(report["adaptive"])
+        if args.metrics_json:
+            metrics.write_json(args.metrics_json, graph, adaptive=report["adaptive"])
+            print(f"  Métricas JSON: {args.metrics_json}")
+        if args.metrics_csv:
+            print(f"  Requisições CSV: {args.metrics_csv}")
+        if args.trace_out:
+            print(f"  Trace (chrome://tracing ou ui.perfetto.dev): {args.trace_out}")
+    print("=" * 60)
+
+
+def add_parser(commands, parents):
+    """The `seed` subparser, also the default command: resume, metrics sinks and shards."""
+    parser = commands.add_parser("seed", parents=[parents.http, parents.data, parents.mock, parents.checks], help="Popula o backend (padrão)",
+                                 description="Popula o backend com médicos, instituições, vagas, conexões e posts.")
+    parser.add_argument("--verify", action="store_true",
+                        help="Ao final, roda o subcomando verify sobre o que foi semeado")
+    parser.add_argument("--resume", action="store_true",
+                        help="Retoma um seed interrompido, pulando o que já consta no journal")
+    parser.add_argument("--journal", default=DEFAULT_JOURNAL,
+                        help="Arquivo SQLite do journal de checkpoints")
+    parser.add_argument("--engagement-rps", type=float,
+                        help="Limite de requisições/s de curtidas, comentários e favoritos (padrão: sem limite)")
+    parser.add_argument("--metrics-json",
+                        help="Exporta o resumo de latência por etapa e por endpoint em JSON")
+    parser.add_argument("--metrics-csv",
+                        help="Exporta uma linha por requisição (etapa, endpoint, status, bytes, duração) em CSV")
+    parser.add_argument("--trace-out",
+                        help="Exporta as requisições como trace do Chrome (chrome://tracing / Perfetto)")
+    parser.add_argument("--shards", type=int, default=1,
+                        help="Divide o dataset em K shards; sem --shard-index roda os K em processos locais")
+    parser.add_argument("--shard-index", type=int,
+                        help="Roda só o shard i (0..K-1), ex.: um por máquina; junte os relatórios com `report`")
+    parser.add_argument("--shard-phase", choices=ShardView.PHASES, default="main",
+                        help="main: dados do próprio shard; reconcile: arestas entre shards, "
+                             "depois que todos terminaram a main")
+    parser.add_argument("--shard-report",
+                        help="Grava o relatório deste shard em JSON, para o subcomando report")
+    return parser
+
+
+def check_args(parser, args):
+    """The verify checks (for --verify) plus the engagement and shard options."""
+    seed_verify.check_args(parser, args)
+    if args.engagement_rps is not None and args.engagement_rps <= 0:
+        parser.error("--engagement-rps deve ser maior que 0")
+    if args.verify and args.shards > 1:
+        parser.error("--verify não combina com --shards; rode verify depois dos shards")
+    if args.record and args.shards > 1 and args.shard_index is None:
+        parser.error("--record não combina com --shards; grave cada shard com --shard-index")
+    if args.shards < 1:
+        parser.error("--shards deve ser pelo menos 1")
+    if args.shard_index is not None and not 0 <= args.shard_index < args.shards:
+        parser.error("--shard-index deve estar entre 0 e --shards - 1")
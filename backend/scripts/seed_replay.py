@@ -0,0 +1,357 @@
+"""Gravação de tráfego (--record) e subcomando replay do seed-data.py."""
+import gzip
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import seed_http  # for BASE, which main() sets
+from seed_common import LatencyStats, endpoint_label
+from seed_http import api
+from seed_state import Registry
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_REPLAY_REPORT = os.path.join(SCRIPT_DIR, "replay-report.json")
+TRAFFIC_LOG_VERSION = 1
+_REF = re.compile(r"\{\{(\d+)\}\}")
+_PATH_PART = re.compile(r"[^/?&=]+")
+
+
+def open_traffic_log(path, mode):
+    """Text handle on a traffic log, gzip-compressed when the name ends in .gz."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class TrafficRecorder:
+    """Writes every api() call to a JSONL log that the replay subcommand re-issues.
+
+    After a header line, one line per request in completion order:
+
+        {"t": start offset in s, "m": method, "p": path, "a": token, "q": params,
+         "b": JSON body, "s": status, "ms": duration, "d": [[response path, ref], ...]}
+
+    Ids and tokens are what changes from one backend to the next, so each
+    "id", "*Id", accessToken or refreshToken value first seen in a response
+    gets a ref (its handle in a Registry) and is written as "{{ref}}"
+    wherever a later request sends it; "d" lists where in the response each
+    ref was defined. A request can only send a value once the response that
+    carried it has arrived, so definitions always come first in the file.
+    """
+
+    CAPTURED = ("accessToken", "refreshToken")
+    MIN_CAPTURED = 8  # shorter values ("SP", "1") are too likely to be something else
+
+    def __init__(self, path, command):
+        self.path = path
+        self.refs = Registry()
+        self.origin = time.perf_counter()
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = open_traffic_log(path, "w")
+        self._write({"version": TRAFFIC_LOG_VERSION, "command": command, "base": seed_http.BASE,
+                     "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S")})
+
+    def _write(self, entry):
+        self._file.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def _ref(self, value):
+        handle = self.refs.handle(value, create=False)
+        return value if handle is None else f"{{{{{handle}}}}}"
+
+    def _rewrite(self, value):
+        """`value` with every known id or token replaced by its "{{ref}}"."""
+        if isinstance(value, str):
+            return self._ref(value)
+        if isinstance(value, dict):
+            return {key: self._rewrite(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._rewrite(item) for item in value]
+        return value
+
+    def _capture(self, value, where, defined):
+        """Give a ref to each new id or token in a response body, appending [path, ref] to `defined`."""
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if isinstance(item, str):
+                    if ((key == "id" or key.endswith("Id") or key in self.CAPTURED)
+                            and len(item) >= self.MIN_CAPTURED and self.refs.handle(item, create=False) is None):
+                        defined.append([where + [key], self.refs.handle(item)])
+                elif isinstance(item, (dict, list)):
+                    self._capture(item, where + [key], defined)
+        elif isinstance(value, list):
+            for i, item in enumerate(value):
+                self._capture(item, where + [i], defined)
+
+    def record(self, method, path, token, kwargs, response, start, duration):
+        body = None
+        if response is not None and response.status_code < 400 and response.content:
+            try:
+                body = response.json()
+            except ValueError:
+                pass
+        with self._lock:
+            entry = {"t": round(start - self.origin, 4), "m": method,
+                     "p": _PATH_PART.sub(lambda m: self._ref(m.group()), path)}
+            if token:
+                entry["a"] = self._ref(token)
+            if kwargs.get("params"):
+                entry["q"] = self._rewrite(kwargs["params"])
+            if kwargs.get("json") is not None:
+                entry["b"] = self._rewrite(kwargs["json"])
+            entry["s"] = response.status_code if response is not None else 0
+            entry["ms"] = round(duration * 1000, 2)
+            defined = []
+            if body is not None:
+                self._capture(body, [], defined)
+            if defined:
+                entry["d"] = defined
+            self._write(entry)
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def read_traffic_log(path):
+    """(header, entries) of a --record log; the entries are read lazily."""
+    f = open_traffic_log(path, "r")
+    try:
+        header = json.loads(f.readline())
+    except ValueError:
+        f.close()
+        sys.exit(f"{path}: não é um log gravado com --record")
+    if header.get("version") != TRAFFIC_LOG_VERSION:
+        f.close()
+        sys.exit(f"{path}: versão de log {header.get('version')!r} não suportada")
+
+    def entries():
+        with f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    return header, entries()
+
+
+class ReplayRefs:
+    """Values bound to a log's refs as the replayed responses arrive (None when one did not have it)."""
+
+    def __init__(self):
+        self.values = {}
+        self._cond = threading.Condition()
+
+    def bind(self, ref, value):
+        with self._cond:
+            self.values[ref] = value
+            self._cond.notify_all()
+
+    def _value(self, ref):
+        with self._cond:
+            self._cond.wait_for(lambda: ref in self.values)
+            value = self.values[ref]
+        if value is None:
+            raise LookupError(ref)
+        return value
+
+    def resolve(self, value):
+        """`value` with its "{{ref}}"s replaced, waiting for their responses; LookupError if one is missing."""
+        if isinstance(value, str):
+            return _REF.sub(lambda m: str(self._value(int(m.group(1)))), value) if "{{" in value else value
+        if isinstance(value, dict):
+            return {key: self.resolve(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.resolve(item) for item in value]
+        return value
+
+
+def response_value(body, where):
+    """The value at `where` (keys and list indexes) in a parsed response, or None."""
+    for step in where:
+        try:
+            body = body[step]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return body if isinstance(body, str) else None
+
+
+def percent_change(old, new):
+    return f"{(new - old) / old * 100:+.0f}%" if old else "—"
+
+
+def print_replay_diff(baseline, current):
+    """p50 and p95 per endpoint: baseline, this replay and the relative change.
+
+    No per-endpoint req/s: the endpoints interleave over the whole run, so a
+    rate over the run's wall time would only repeat the overall change.
+    """
+    print(f"  {'Endpoint':<34} {'Req':>6} {'p50 base':>9} {'p50':>8} {'Δ':>6} "
+          f"{'p95 base':>9} {'p95':>8} {'Δ':>6}")
+    for endpoint, row in current.items():
+        base = baseline.get(endpoint)
+        if base is None:
+            print(f"  {endpoint:<34} {row['requests']:>6} {'—':>9} {row['p50_ms']:>8.1f} {'':>6} "
+                  f"{'—':>9} {row['p95_ms']:>8.1f}")
+            continue
+        print(f"  {endpoint:<34} {row['requests']:>6} {base['p50_ms']:>9.1f} {row['p50_ms']:>8.1f} "
+              f"{percent_change(base['p50_ms'], row['p50_ms']):>6} {base['p95_ms']:>9.1f} {row['p95_ms']:>8.1f} "
+              f"{percent_change(base['p95_ms'], row['p95_ms']):>6}")
+
+
+def replay(args, metrics):
+    """Re-issue a --record log against BASE and compare latency and throughput with a baseline.
+
+    Entries are dispatched in file order, at the recorded start offsets
+    divided by --speed (0: as fast as the --concurrency slots allow). A
+    request waits for the responses that define its refs; if one of them
+    came back without the value, the request is skipped and counted.
+    Latencies are read from `metrics`, the RequestMetrics api() reports to.
+    """
+    header, entries = read_traffic_log(args.log)
+    speed = args.speed
+    print("=" * 60)
+    print("MedConnect - Replay")
+    print(f"Log: {args.log} ({header.get('command')} gravado em {header.get('recorded_at')} contra {header.get('base')})")
+    pace = "máximo" if not speed else "original" if speed == 1 else f"{speed:g}x"
+    print(f"Ritmo: {pace}, concorrência: {args.concurrency}")
+    print("=" * 60)
+
+    refs = ReplayRefs()
+    recorded = LatencyStats()  # the log's own timings: the baseline when there is no --baseline
+    slots = threading.BoundedSemaphore(args.concurrency)
+    lock = threading.Lock()
+    counts = {"requests": 0, "unresolved": 0, "failed": 0}
+    mismatches = {}  # endpoint -> {"recorded -> replayed": n}
+    recorded_wall = lag = 0.0
+
+    def run(entry):
+        body = None
+        try:
+            try:
+                token = refs.resolve(entry.get("a"))
+                path = refs.resolve(entry["p"])
+                kwargs = {key: refs.resolve(entry[field]) for field, key in (("q", "params"), ("b", "json"))
+                          if field in entry}
+            except LookupError:
+                with lock:
+                    counts["unresolved"] += 1
+                return
+            r = api(entry["m"], path, token, **kwargs)
+            status = r.status_code if r is not None else 0
+            if entry.get("d") and r is not None and status < 400:
+                try:
+                    body = r.json()
+                except ValueError:
+                    pass
+            if status != entry["s"]:
+                endpoint = endpoint_label(entry["m"], _REF.sub(":id", entry["p"]))
+                change = f"{entry['s']} -> {status}"
+                with lock:
+                    per_endpoint = mismatches.setdefault(endpoint, {})
+                    per_endpoint[change] = per_endpoint.get(change, 0) + 1
+                    counts["failed"] += not 0 < status < 400
+        finally:
+            for where, ref in entry.get("d", ()):
+                refs.bind(ref, response_value(body, where))
+            slots.release()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for entry in entries:
+            recorded.add(endpoint_label(entry["m"], _REF.sub(":id", entry["p"])), entry["ms"] / 1000,
+                         0 < entry["s"] < 400)
+            recorded_wall = max(recorded_wall, entry["t"] + entry["ms"] / 1000)
+            if speed:
+                delay = start + entry["t"] / speed - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            slots.acquire()
+            if speed:
+                lag = max(lag, time.perf_counter() - (start + entry["t"] / speed))
+            counts["requests"] += 1
+            pool.submit(run, entry)
+    metrics.by_endpoint.stop()
+    recorded.wall = recorded_wall
+
+    current = metrics.by_endpoint.summary()
+    wall = metrics.by_endpoint.wall
+    if args.baseline:
+        with open(args.baseline) as f:
+            previous = json.load(f)
+        baseline, source = previous["endpoints"], args.baseline
+        baseline_rps = previous["requests"] / previous["wall_s"] if previous.get("wall_s") else 0.0
+    else:
+        baseline, source = recorded.summary(), "tempos gravados no log"
+        baseline_rps = counts["requests"] / recorded_wall if recorded_wall else 0.0
+    rps = counts["requests"] / wall if wall else 0.0
+    print("\n" + "=" * 60)
+    print("RESULTADO DO REPLAY")
+    print("=" * 60)
+    print(f"  Requisições: {counts['requests']} em {wall:.2f}s "
+          f"(gravado: {recorded_wall:.2f}s), comparando com {source}")
+    print(f"  Vazão: {rps:.1f} req/s (base: {baseline_rps:.1f} req/s, {percent_change(baseline_rps, rps)})")
+    print_replay_diff(baseline, current)
+    if counts["unresolved"]:
+        print(f"  ! {counts['unresolved']} requisições puladas: dependiam de um id que o replay não recebeu")
+    if mismatches:
+        total = sum(n for per_endpoint in mismatches.values() for n in per_endpoint.values())
+        print(f"  ! {total} respostas com status diferente do gravado ({counts['failed']} falhas):")
+        for endpoint, per_endpoint in sorted(mismatches.items()):
+            print(f"      {endpoint}: " + ", ".join(f"{change} ×{n}" for change, n in per_endpoint.items()))
+    if speed:
+        print(f"  Atraso máximo em relação ao ritmo gravado: {lag * 1000:.0f} ms")
+    report = metrics.by_endpoint.to_json(
+        base=seed_http.BASE,
+        log=args.log,
+        speed=speed,
+        concurrency=args.concurrency,
+        requests=counts["requests"],
+        unresolved=counts["unresolved"],
+        status_mismatches=mismatches,
+        lag_ms=round(lag * 1000, 1) if speed else None,
+        baseline=source,
+        rps=round(rps, 2),
+        baseline_rps=round(baseline_rps, 2),
+        changes={endpoint: {f"{key.split('_')[0]}_pct": round((row[key] - baseline[endpoint][key]) / baseline[endpoint][key] * 100, 1)
+                            for key in ("p50_ms", "p95_ms") if baseline[endpoint][key]}
+                 for endpoint, row in current.items() if endpoint in baseline},
+    )
+    if args.replay_json == "-":
+        print(json.dumps(report, indent=2))
+    elif args.replay_json:
+        with open(args.replay_json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"  Relatório JSON: {args.replay_json}")
+    print("=" * 60)
+
+
+def add_parser(commands, parents):
+    """The `replay` subparser: the log to re-issue and how fast."""
+    parser = commands.add_parser("replay", parents=[parents.http, parents.mock], help="Repete um log gravado com --record",
+                                 description="Reenvia as requisições de um log de --record contra um backend "
+                                             "novo, trocando ids e tokens pelos das novas respostas, e compara "
+                                             "latência e vazão com uma linha de base.")
+    parser.add_argument("log", help="Log gravado com --record")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Ritmo em relação ao gravado: 1 = original, N = N vezes mais rápido, "
+                             "0 = o mais rápido possível")
+    parser.add_argument("--baseline",
+                        help="Relatório JSON com \"endpoints\" (replay, bench ou --metrics-json) para comparar; "
+                             "padrão: os tempos gravados no log")
+    parser.add_argument("--replay-json", default=DEFAULT_REPLAY_REPORT,
+                        help="Arquivo do relatório JSON do replay ('-' imprime no stdout, '' desativa)")
+    return parser
+
+
+def check_args(parser, args):
+    """--speed is a multiplier, so only 0 (as fast as possible) or above makes sense."""
+    if args.speed < 0:
+        parser.error("--speed deve ser 0 (máximo) ou maior")
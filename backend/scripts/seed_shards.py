@@ -0,0 +1,189 @@
+"""Shards do seed-data.py (--shards, --shard-index) e o subcomando report, que junta os relatórios."""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import seed_http  # for BASE, which main() sets (and report takes from the shard files)
+from seed_bench import RequestMetrics
+from seed_datasets import ShardView
+from seed_populate import print_seed_summary
+from seed_tasks import TaskGraph
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def shard_path(path, index, phase="main"):
+    """`path` with a .shard<i> suffix before its extension (plus the phase, if not main)."""
+    if not path or path == ":memory:":
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.shard{index}{'' if phase == 'main' else '.' + phase}{ext}"
+
+def write_shard_report(path, args, report, graph, metrics):
+    """Everything the launcher or `report` needs to merge this shard into the overall summary."""
+    with open(path, "w") as f:
+        json.dump({"base": seed_http.BASE, "shard": args.shard_index, "shards": args.shards, "phase": args.shard_phase,
+                   "report": report, "steps": graph.steps, "wall": graph.wall, "metrics": metrics.state()}, f)
+
+def merge_shard_reports(shard_reports, wall=None):
+    """(report, graph, metrics) of a whole sharded seed, from the --shard-report of every shard and phase.
+
+    Counts add up, except the doctors that the reconcile phase only restores
+    from its journal. Steps with the same label add their tasks and busy time
+    and keep the longest wall time, since the shards ran them side by side.
+    Without `wall`, the run took the slowest shard of each phase. The limits
+    and sustainable rates of --adaptive add up over the shards of a phase
+    (they ran at the same time); the final limit is the last phase's.
+    """
+    first = shard_reports[0]["report"]
+    report = {
+        "counts": dict.fromkeys(first["counts"], 0),
+        "skipped": {},
+        "tokens": dict.fromkeys(first["tokens"], 0),
+        "institutions": 0,
+        "sizes": first["sizes"],
+        "zipf": first["zipf"],
+        "entities": 0,
+        "footprint": dict.fromkeys(first["footprint"], 0),
+        "adaptive": None,
+    }
+    phase_limits = {}  # phase -> [final, highest]
+    phase_rates = {}   # phase -> endpoint -> [req/s, concurrency]
+    steps = {}
+    phase_wall = {}
+    metrics = RequestMetrics()
+    for shard in shard_reports:
+        part, main = shard["report"], shard["phase"] == "main"
+        for kind, n in part["counts"].items():
+            if main or kind != "doctors":
+                report["counts"][kind] += n
+        for kind, n in part["tokens"].items():
+            report["tokens"][kind] += n
+        report["institutions"] = max(report["institutions"], part["institutions"])
+        if main:
+            for kind, n in part["skipped"].items():
+                report["skipped"][kind] = report["skipped"].get(kind, 0) + n
+            report["entities"] += part["entities"]
+            for name, size in part["footprint"].items():
+                report["footprint"][name] += size
+        for label, step_wall, busy, tasks in shard["steps"]:
+            merged = steps.setdefault(label, [label, 0.0, 0.0, 0])
+            merged[1] = max(merged[1], step_wall)
+            merged[2] += busy
+            merged[3] += tasks
+        phase_wall[shard["phase"]] = max(phase_wall.get(shard["phase"], 0.0), shard["wall"])
+        metrics.merge(shard["metrics"])
+        adaptive = part.get("adaptive")
+        if adaptive:
+            merged = report["adaptive"] = report["adaptive"] or {**adaptive, "backoffs": 0}
+            merged["backoffs"] += adaptive["backoffs"]
+            limits = phase_limits.setdefault(shard["phase"], [0, 0])
+            limits[0] += adaptive["final"]
+            limits[1] += adaptive["highest"]
+            rates = phase_rates.setdefault(shard["phase"], {})
+            for endpoint, row in adaptive["endpoints"].items():
+                rate = rates.setdefault(endpoint, [0.0, 0])
+                rate[0] += row["rps"]
+                rate[1] += row["concurrency"]
+    if report["adaptive"]:
+        report["adaptive"]["final"] = phase_limits[shard_reports[-1]["phase"]][0]
+        report["adaptive"]["highest"] = max(highest for _, highest in phase_limits.values())
+        best = {}
+        for rates in phase_rates.values():
+            for endpoint, (rps, concurrency) in rates.items():
+                if rps > best.get(endpoint, (0.0,))[0]:
+                    best[endpoint] = (rps, concurrency)
+        report["adaptive"]["endpoints"] = {endpoint: {"rps": round(rps, 2), "concurrency": concurrency}
+                                           for endpoint, (rps, concurrency) in
+                                           sorted(best.items(), key=lambda item: -item[1][0])}
+    graph = TaskGraph(0)
+    graph.steps = [tuple(step) for step in steps.values() if step[3]]  # phases leave most steps empty
+    graph.wall = wall if wall is not None else sum(phase_wall.values())
+    metrics.by_step.wall = metrics.by_endpoint.wall = graph.wall
+    return report, graph, metrics
+
+def run_shards(args, argv):
+    """Run --shards K as K local worker processes per phase, then print the merged report.
+
+    Each worker is this script with --shard-index i, its own journal and a
+    log file; they share the token cache, which is how the reconcile phase
+    acts as the accounts another shard registered.
+    """
+    started = time.perf_counter()
+    workdir = tempfile.mkdtemp(prefix="seed-shards-")
+    worker_argv = [arg for arg in argv if arg != "--mock"]
+    if worker_argv and worker_argv[0] == "seed":
+        worker_argv = worker_argv[1:]
+    common = ["--base-url", seed_http.BASE, "--metrics-json", ""]
+    if args.mock:
+        # The workers are separate processes, so in-memory state would not reach the reconcile phase
+        common += ["--journal", os.path.join(workdir, "journal.sqlite"),
+                   "--token-cache", os.path.join(workdir, "tokens.sqlite")]
+    shard_reports = []
+    workers = []
+    try:
+        for phase in ShardView.PHASES:
+            print(f"\nFase {phase}: {args.shards} shards (logs em {os.path.join(SCRIPT_DIR, '.seed-shard-N.log')})")
+            workers = []
+            for index in range(args.shards):
+                report_path = os.path.join(workdir, f"{phase}.shard{index}.json")
+                extra = ["--shard-index", str(index), "--shard-phase", phase, "--shard-report", report_path]
+                if args.metrics_csv:
+                    extra += ["--metrics-csv", shard_path(args.metrics_csv, index, phase)]
+                if args.trace_out:
+                    extra += ["--trace-out", shard_path(args.trace_out, index, phase)]
+                log_path = os.path.join(SCRIPT_DIR, f".seed-shard-{index}.log")
+                log = open(log_path, "w" if phase == "main" else "a")
+                process = subprocess.Popen([sys.executable, os.path.join(SCRIPT_DIR, "seed-data.py"), "seed",
+                                            *worker_argv, *common, *extra],
+                                           stdout=log, stderr=subprocess.STDOUT)
+                log.close()
+                workers.append((index, process, log_path, report_path))
+            failed = []
+            for index, process, log_path, report_path in workers:
+                code = process.wait()
+                if code != 0:
+                    failed.append(f"shard {index} saiu com código {code} (veja {log_path})")
+                    continue
+                with open(report_path) as f:
+                    shard_reports.append(json.load(f))
+                print(f"  ✓ shard {index} ({phase}) em {time.perf_counter() - started:.1f}s")
+            if failed:
+                sys.exit(f"Fase {phase} falhou: " + "; ".join(failed))
+    finally:
+        for _, process, _, _ in workers:
+            if process.poll() is None:
+                process.terminate()
+        shutil.rmtree(workdir, ignore_errors=True)
+    report, graph, metrics = merge_shard_reports(shard_reports, wall=time.perf_counter() - started)
+    # One file per shard and phase; the summary shows the pattern that matches them all
+    args.metrics_csv = shard_path(args.metrics_csv, "*")
+    args.trace_out = shard_path(args.trace_out, "*")
+    print_seed_summary(args, report, graph, metrics)
+
+def merge_reports(args):
+    """`report` subcommand: merge the --shard-report files of shards run elsewhere."""
+    shard_reports = []
+    for path in args.files:
+        with open(path) as f:
+            shard_reports.append(json.load(f))
+    seed_http.BASE = shard_reports[0]["base"]
+    report, graph, metrics = merge_shard_reports(shard_reports)
+    phases = sorted({shard["phase"] for shard in shard_reports})
+    print(f"Relatórios: {len(shard_reports)} ({', '.join(phases)}) de {seed_http.BASE}")
+    print_seed_summary(args, report, graph, metrics)
+
+
+def add_parser(commands, parents):
+    """The `report` subparser: shard reports in, one seed summary out."""
+    parser = commands.add_parser("report", help="Junta os relatórios de shards rodados separadamente",
+                                 description="Soma os arquivos de --shard-report (todas as fases) "
+                                             "em um único resumo do seed.")
+    parser.add_argument("files", nargs="+", help="Arquivos JSON gravados por --shard-report")
+    parser.add_argument("--metrics-json", help="Exporta o resumo de latência combinado em JSON")
+    parser.set_defaults(metrics_csv=None, trace_out=None)
+    return parser
@@ -0,0 +1,447 @@
+"""Estado local do seed-data.py: registro compacto das entidades, journal e cache de tokens em SQLite."""
+import base64
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+import zlib
+from array import array
+
+from seed_http import api, login
+
+
+# ─────────────────────────────────────────────────────────────
+# REGISTRO COMPACTO (handles inteiros em vez de dicts de strings)
+# ─────────────────────────────────────────────────────────────
+
+def grow(column, size, fill=0):
+    """Extend the array `column` with `fill` up to `size` items."""
+    if len(column) < size:
+        column.extend(array(column.typecode, [fill]) * (size - len(column)))
+
+
+class ByteArena:
+    """Byte strings addressed by a dense index, stored back to back in one bytearray.
+
+    Replacing a value appends the new bytes and leaves the old ones behind as
+    garbage; the buffer is rewritten once the garbage outweighs the live data.
+    Not thread-safe: callers lock around it.
+    """
+
+    COMPACT_MIN = 1 << 20  # bytes of garbage before compaction is considered
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array("q")
+        self.lengths = array("i")  # -1 = no value
+        self.garbage = 0
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def set(self, index, value):
+        grow(self.offsets, index + 1)
+        grow(self.lengths, index + 1, -1)
+        if self.lengths[index] >= 0:
+            self.garbage += self.lengths[index]
+        self.offsets[index] = len(self.data)
+        self.lengths[index] = len(value)
+        self.data += value
+        if self.garbage > self.COMPACT_MIN and self.garbage * 2 > len(self.data):
+            self.compact()
+
+    def get(self, index):
+        """The bytes stored at `index` (as a bytearray copy), or None."""
+        if index >= len(self.lengths) or self.lengths[index] < 0:
+            return None
+        start = self.offsets[index]
+        return self.data[start:start + self.lengths[index]]
+
+    def compact(self):
+        data = bytearray()
+        for index, length in enumerate(self.lengths):
+            if length >= 0:
+                start = self.offsets[index]
+                self.offsets[index] = len(data)
+                data += self.data[start:start + length]
+        self.data = data
+        self.garbage = 0
+
+    def nbytes(self):
+        return sys.getsizeof(self.data) + sys.getsizeof(self.offsets) + sys.getsizeof(self.lengths)
+
+
+class Registry:
+    """Interned string keys (emails, post keys) mapped to dense integer handles.
+
+    A handle costs a few dozen bytes instead of a dict entry plus its str
+    objects: the UTF-8 key in a ByteArena, a slot in an open-addressing index
+    made of two parallel arrays, and a 16-byte server id (UUIDs are stored
+    packed; anything else goes to a side dict). Handles are never reused, so
+    other components keep their own per-entity columns as arrays indexed by
+    handle. Lookups are O(1) and thread-safe.
+
+    Handles are dense in insertion order. The index hashes keys with
+    zlib.crc32 rather than the per-process salted hash(), so a rerun or a
+    shard fed the same keys lays them out the same way.
+    """
+
+    MIN_SLOTS = 1 << 10
+    MAX_LOAD = 0.7
+
+    def __init__(self):
+        self.keys = ByteArena()
+        self.slots = array("i", [-1]) * self.MIN_SLOTS  # slot -> handle, -1 = empty
+        self.hashes = array("q", [0]) * self.MIN_SLOTS  # slot -> hash of that handle's key
+        self.ids = bytearray()                          # 16 bytes per handle, all zero = no id
+        self.odd_ids = {}                               # handle -> id that is not a canonical UUID
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _find(self, encoded, key_hash):
+        """Slot holding `encoded`, or the empty slot where it would go (linear probing)."""
+        mask = len(self.slots) - 1
+        slot = key_hash & mask
+        while True:
+            handle = self.slots[slot]
+            if handle < 0 or (self.hashes[slot] == key_hash and self.keys.get(handle) == encoded):
+                return slot
+            slot = (slot + 1) & mask
+
+    def handle(self, key, create=True):
+        """Handle of `key`, interning it unless create is False (then None for unknown keys)."""
+        encoded = key.encode()
+        key_hash = zlib.crc32(encoded)
+        with self.lock:
+            slot = self._find(encoded, key_hash)
+            handle = self.slots[slot]
+            if handle >= 0 or not create:
+                return handle if handle >= 0 else None
+            handle = len(self.keys)
+            self.keys.set(handle, encoded)
+            self.slots[slot] = handle
+            self.hashes[slot] = key_hash
+            self.ids += bytes(16)
+            if len(self.keys) > len(self.slots) * self.MAX_LOAD:
+                self._rehash(len(self.slots) * 2)
+            return handle
+
+    def _rehash(self, size):
+        old_slots, old_hashes = self.slots, self.hashes
+        self.slots = array("i", [-1]) * size
+        self.hashes = array("q", [0]) * size
+        mask = size - 1
+        for handle, key_hash in zip(old_slots, old_hashes):
+            if handle < 0:
+                continue
+            slot = key_hash & mask
+            while self.slots[slot] >= 0:
+                slot = (slot + 1) & mask
+            self.slots[slot] = handle
+            self.hashes[slot] = key_hash
+
+    def key(self, handle):
+        with self.lock:
+            return self.keys.get(handle).decode()
+
+    def set_id(self, handle, server_id):
+        try:
+            packed = uuid.UUID(server_id).bytes
+        except (TypeError, ValueError):
+            packed = None
+        with self.lock:
+            if packed is not None and str(uuid.UUID(bytes=packed)) == server_id:
+                self.ids[handle * 16:handle * 16 + 16] = packed
+                self.odd_ids.pop(handle, None)
+            else:
+                self.ids[handle * 16:handle * 16 + 16] = bytes(16)
+                self.odd_ids[handle] = server_id
+
+    def id(self, handle):
+        """Server id stored for `handle`, or None."""
+        with self.lock:  # clear_ids() swaps the table
+            packed = bytes(self.ids[handle * 16:handle * 16 + 16])
+            if not packed.strip(b"\0"):
+                return self.odd_ids.get(handle)
+        return str(uuid.UUID(bytes=packed))
+
+    def clear_ids(self):
+        with self.lock:
+            self.ids = bytearray(len(self.ids))
+            self.odd_ids.clear()
+
+    def footprint(self):
+        """Allocated bytes per component (sys.getsizeof, so buffer slack included)."""
+        return {
+            "keys": self.keys.nbytes(),
+            "index": sys.getsizeof(self.slots) + sys.getsizeof(self.hashes),
+            "ids": sys.getsizeof(self.ids) + sys.getsizeof(self.odd_ids)
+                   + sum(sys.getsizeof(value) for value in self.odd_ids.values()),
+        }
+
+
+def print_footprint(parts, entities):
+    """One summary line from Registry.footprint() plus the footprints of components built on its handles."""
+    total = sum(parts.values())
+    labels = {"keys": "chaves", "index": "índice", "ids": "ids", "tokens": "tokens"}
+    detail = ", ".join(f"{labels.get(name, name)} {size / 2**20:.1f}" for name, size in parts.items())
+    per_entity = f", {total / entities:.0f} B/entidade" if entities else ""
+    print(f"  Registro: {entities} entidades em {total / 2**20:.1f} MB ({detail}{per_entity})")
+
+
+# ─────────────────────────────────────────────────────────────
+# LOCAL STATE (journal de checkpoints e cache de tokens)
+# ─────────────────────────────────────────────────────────────
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_JOURNAL = os.path.join(SCRIPT_DIR, ".seed-journal.sqlite")
+DEFAULT_TOKEN_CACHE = os.path.join(SCRIPT_DIR, ".seed-tokens.sqlite")
+
+
+class BufferedStore:
+    """SQLite file whose writes go through a small in-memory buffer.
+
+    Subclasses set INSERT (executed with executemany on flush) and create
+    their tables in __init__. Safe to call from worker threads.
+    """
+
+    INSERT = None
+    FLUSH_EVERY = 200        # rows
+    FLUSH_INTERVAL = 1.0     # seconds; bounds what a hard kill can lose
+
+    def __init__(self, path):
+        self._buffer = []
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+        # --shards workers share the token cache file; wait for their writes instead of failing
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self.db.execute(sql, params).fetchall()
+
+    def _write(self, row):
+        with self._lock:
+            self._buffer.append(row)
+            due = (len(self._buffer) >= self.FLUSH_EVERY
+                   or time.monotonic() - self._flushed_at >= self.FLUSH_INTERVAL)
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            if self._buffer:
+                self.db.executemany(self.INSERT, self._buffer)
+                self.db.commit()
+                self._buffer = []
+            self._flushed_at = time.monotonic()
+
+    def close(self):
+        self.flush()
+        self.db.close()
+
+
+class Journal(BufferedStore):
+    """Record of completed seed work, keyed by (kind, key).
+
+    Each finished entity is stored with its server id, so --resume skips it
+    with a single primary-key lookup; tokens live in the TokenCache. Without
+    --resume the journal is cleared and rebuilt by the new run.
+    """
+
+    INSERT = "INSERT OR REPLACE INTO done VALUES (?, ?, ?, ?)"
+
+    def __init__(self, path, base, resume=False):
+        super().__init__(path)
+        self.resume = resume
+        self.skipped = {}
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS done (
+            kind TEXT, key TEXT, server_id TEXT, data TEXT, PRIMARY KEY (kind, key)) WITHOUT ROWID""")
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'base'").fetchone()
+        if resume and row and row[0] != base:
+            sys.exit(f"Journal {path} pertence a {row[0]}, não a {base}; rode sem --resume.")
+        if not resume:
+            self.db.execute("DELETE FROM done")
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES ('base', ?)", (base,))
+        self.db.commit()
+
+    def get(self, kind, key):
+        """(server_id, data) of a completed entity, or None. Always None unless resuming."""
+        if not self.resume:
+            return None
+        rows = self._query("SELECT server_id, data FROM done WHERE kind = ? AND key = ?", (kind, key))
+        if not rows:
+            return None
+        return rows[0][0], json.loads(rows[0][1]) if rows[0][1] else None
+
+    def pending(self, kind, items, key):
+        """Yield the items not yet journaled under `kind`, counting the rest as skipped."""
+        for item in items:
+            if self.get(kind, key(item)) is not None:
+                self.count_skipped(kind)
+                continue
+            yield item
+
+    def count_skipped(self, kind):
+        self.skipped[kind] = self.skipped.get(kind, 0) + 1
+
+    def record(self, kind, key, server_id=None, data=None):
+        self._write((kind, key, server_id, json.dumps(data) if data is not None else None))
+
+    def print_skipped(self, kind, label=""):
+        if self.skipped.get(kind):
+            print(f"  {label + ' ' if label else ''}↷ {self.skipped[kind]} já concluídos em execução anterior (journal)")
+
+
+def jwt_expiry(token):
+    """`exp` claim of a JWT (unverified), or 0 if it cannot be read."""
+    try:
+        payload = token.split(".")[1]
+        return json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))["exp"]
+    except (IndexError, ValueError, KeyError):
+        return 0
+
+
+class TokenCache(BufferedStore):
+    """Persistent email -> (access token, refresh token, doctorId) cache.
+
+    Tokens survive across runs, so warm reruns need no login at all. They are
+    renewed lazily by token(): /auth/refresh sits behind JwtAuthGuard and needs
+    a still-valid access token, so a token is refreshed once it is within
+    REFRESH_MARGIN of expiry, and an already expired one falls back to login.
+
+    In memory an account is a Registry handle: its doctorId lives in the
+    registry, the access token in a ByteArena and its expiry in an array.
+    Refresh tokens are read once per access-token lifetime, so they stay in SQLite.
+    """
+
+    INSERT = "INSERT OR REPLACE INTO tokens VALUES (?, ?, ?, ?, ?, ?)"
+    REFRESH_MARGIN = 60  # seconds
+    LOCK_STRIPES = 64
+
+    def __init__(self, path, base, password_for, registry=None):
+        super().__init__(path)
+        self.base = base
+        self.password_for = password_for
+        self.registry = registry or Registry()
+        self.access = ByteArena()    # handle -> access token
+        self.expiry = array("q")     # handle -> `exp` of that token
+        self._arena_lock = threading.Lock()
+        self.stats = {"cache": 0, "refresh": 0, "login": 0}
+        self._stripes = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+        self.db.execute("""CREATE TABLE IF NOT EXISTS tokens (
+            base TEXT, email TEXT, access_token TEXT, refresh_token TEXT, doctor_id TEXT, access_exp INTEGER,
+            PRIMARY KEY (base, email)) WITHOUT ROWID""")
+        self.db.commit()
+
+    def _keep(self, handle, access_token, doctor_id, expiry):
+        if doctor_id:
+            self.registry.set_id(handle, doctor_id)
+        with self._arena_lock:
+            self.access.set(handle, access_token.encode())
+            grow(self.expiry, handle + 1)
+            self.expiry[handle] = expiry
+
+    def _entry(self, email):
+        """(handle, access token, expiry) of a cached account, loaded from SQLite on first use, or None."""
+        handle = self.registry.handle(email)
+        with self._arena_lock:
+            token = self.access.get(handle)
+            if token is not None:
+                return handle, token.decode(), self.expiry[handle]
+        rows = self._query("SELECT access_token, doctor_id, access_exp FROM tokens WHERE base = ? AND email = ?",
+                           (self.base, email))
+        if not rows:
+            return None
+        self._keep(handle, *rows[0])
+        return handle, rows[0][0], rows[0][2]
+
+    def _refresh_token(self, email):
+        self.flush()  # the latest login for `email` may still be buffered
+        rows = self._query("SELECT refresh_token FROM tokens WHERE base = ? AND email = ?", (self.base, email))
+        return rows[0][0] if rows else None
+
+    def store(self, email, auth):
+        """Cache an /auth/login, /auth/register or /auth/refresh response."""
+        handle = self.registry.handle(email)
+        doctor_id = (auth.get("user") or {}).get("doctorId") or self.registry.id(handle)
+        expiry = jwt_expiry(auth["accessToken"])
+        self._keep(handle, auth["accessToken"], doctor_id, expiry)
+        self._write((self.base, email, auth["accessToken"], auth.get("refreshToken"), doctor_id, expiry))
+
+    def doctor_id(self, email):
+        """doctorId of a cached account, without any request."""
+        entry = self._entry(email)
+        if entry:
+            self.stats["cache"] += 1
+            return self.registry.id(entry[0])
+        return None
+
+    def token(self, email):
+        """A usable access token for `email`, refreshing or logging in only when needed."""
+        entry = self._entry(email)
+        if entry and entry[2] - time.time() > self.REFRESH_MARGIN:
+            return entry[1]
+        with self._stripes[hash(email) % self.LOCK_STRIPES]:
+            entry = self._entry(email)
+            now = time.time()
+            if entry and entry[2] - now > self.REFRESH_MARGIN:
+                return entry[1]
+            refresh_token = self._refresh_token(email) if entry and entry[2] > now else None
+            if refresh_token:
+                r = api("POST", "/auth/refresh", entry[1], json={"refreshToken": refresh_token})
+                if r is not None and r.status_code == 200:
+                    self.stats["refresh"] += 1
+                    auth = r.json()
+                    self.store(email, auth)
+                    return auth["accessToken"]
+            password = self.password_for(email)
+            auth = login(email, password) if password else None
+            if auth is None:
+                return None
+            self.stats["login"] += 1
+            self.store(email, auth)
+            return auth["accessToken"]
+
+    def probe(self, email):
+        """Drop the cache if the backend no longer accepts our tokens (e.g. after `make reset`)."""
+        if self._entry(email) is None:
+            return
+        token = self.token(email)
+        if token:
+            r = api("GET", "/doctors/me", token)
+            if r is None or r.status_code != 401:
+                return
+        print("  ! Tokens em cache rejeitados pelo backend; descartando o cache")
+        self.flush()
+        with self._lock:
+            self.db.execute("DELETE FROM tokens WHERE base = ?", (self.base,))
+            self.db.commit()
+        with self._arena_lock:
+            self.access = ByteArena()
+            self.expiry = array("q")
+        self.registry.clear_ids()
+
+    def footprint(self):
+        with self._arena_lock:
+            return {"tokens": self.access.nbytes() + sys.getsizeof(self.expiry)}
+
+
+def post_key(post):
+    """Stable journal key for a post: its dataset index, plus a short digest of its content.
+
+    The index alone makes the key unique (the same author can draw the same
+    text twice); the digest keeps a journal written for another dataset from
+    matching.
+    """
+    digest = hashlib.blake2b(post["content"].encode(), digest_size=8).hexdigest()
+    return f"{post['index']}|{digest}"
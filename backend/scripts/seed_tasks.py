@@ -0,0 +1,407 @@
+"""Concorrência do seed-data.py: execução paralela, limitador adaptativo (AIMD) e grafo de tarefas."""
+import threading
+import time
+from array import array
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from seed_common import LatencyStats
+from seed_http import set_step
+
+DEFAULT_CONCURRENCY = 8
+
+def run_parallel(fn, items, concurrency=DEFAULT_CONCURRENCY):
+    """Call fn(item) for each item with at most `concurrency` calls in flight.
+
+    `items` may be a lazy iterable; it is consumed only as slots free up.
+    Yields (item, result, elapsed_seconds) in completion order.
+    """
+    def timed(item):
+        start = time.perf_counter()
+        result = fn(item)
+        return result, time.perf_counter() - start
+
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        in_flight = {}
+        for item in items:
+            in_flight[pool.submit(timed, item)] = item
+            if len(in_flight) >= concurrency:
+                break
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = in_flight.pop(future)
+                result, elapsed = future.result()
+                yield item, result, elapsed
+                for nxt in items:
+                    in_flight[pool.submit(timed, nxt)] = nxt
+                    break
+
+
+class AdaptiveLimiter:
+    """AIMD limit on the requests in flight, shared by every api() call (--adaptive).
+
+    The limit starts small and doubles after each window in which it was
+    actually reached and the backend kept up (slow start); after the first
+    backoff it grows by one per window instead. A 429/5xx (including the ones
+    urllib3 retries), a transport error, or a window p95 above the latency
+    target or SPIKE times the best p95 so far cuts it by BETA, at most once
+    per window. A window is about one round trip of the whole limit.
+
+    Healthy windows also measure each endpoint's throughput under the current
+    mix; the best one seen is reported as that endpoint's sustainable rate.
+    """
+
+    BETA = 0.7
+    SPIKE = 4.0
+    MIN_WINDOW = 20        # completions
+    MIN_WINDOW_S = 0.25
+
+    def __init__(self, max_limit, latency_target, initial=4):
+        self.max_limit = max_limit
+        self.latency_target = latency_target  # seconds
+        self.limit = float(min(initial, max_limit))
+        self.threshold = float("inf")         # slow start until the first backoff
+        self.highest = self.limit
+        self.in_flight = 0
+        self.best_p95 = None
+        self.backoffs = 0
+        self.sustainable = {}  # endpoint -> (req/s, limit at the time)
+        self._cond = threading.Condition()
+        self._next_ticket = self._serving = 0
+        self._new_window(time.perf_counter())
+
+    def _new_window(self, now):
+        self.window_start = now
+        self.window_samples = array("d")
+        self.window_endpoints = {}
+        self.window_congested = False
+        self.peak = self.in_flight
+
+    def acquire(self):
+        """Wait for a slot, first come first served so no worker starves while the limit is low."""
+        with self._cond:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            while ticket != self._serving or self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self._serving += 1
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            self._cond.notify_all()
+
+    def _back_off(self, reason):
+        old = int(self.limit)
+        self.limit = max(1.0, self.limit * self.BETA)
+        self.threshold = self.limit
+        self.backoffs += 1
+        print(f"  ⇣ concorrência {old} → {int(self.limit)} ({reason})")
+        self._new_window(time.perf_counter())
+        # Calls already in flight report the same overload; they must not cut the limit again
+        self.window_congested = True
+
+    def congested(self, reason):
+        with self._cond:
+            if not self.window_congested:
+                self._back_off(reason)
+
+    def _too_slow(self, p95):
+        if p95 > self.latency_target:
+            return True
+        # A spike relative to the best window, ignored while latencies are tiny anyway
+        return self.best_p95 is not None and p95 > max(self.SPIKE * self.best_p95, self.latency_target / 4)
+
+    def release(self, endpoint, seconds, status):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+            if status == 0 or status == 429 or status >= 500:
+                if not self.window_congested:
+                    self._back_off(f"HTTP {status}" if status else "erro de conexão")
+                return
+            self.window_samples.append(seconds)
+            self.window_endpoints[endpoint] = self.window_endpoints.get(endpoint, 0) + 1
+            now = time.perf_counter()
+            if (len(self.window_samples) < max(self.MIN_WINDOW, int(self.limit))
+                    or now - self.window_start < self.MIN_WINDOW_S):
+                return
+            p95 = LatencyStats.percentile(sorted(self.window_samples), 95)
+            if self.window_congested:
+                self._new_window(now)
+            elif self._too_slow(p95):
+                self._back_off(f"p95 {p95 * 1000:.0f} ms")
+            else:
+                self._healthy_window(now, p95)
+
+    def _healthy_window(self, now, p95):
+        elapsed = now - self.window_start
+        for endpoint, n in self.window_endpoints.items():
+            if n / elapsed > self.sustainable.get(endpoint, (0.0,))[0]:
+                self.sustainable[endpoint] = (n / elapsed, int(self.limit))
+        self.best_p95 = p95 if self.best_p95 is None else min(self.best_p95, p95)
+        if self.peak >= int(self.limit) and self.limit < self.max_limit:
+            self.limit = min(self.max_limit, self.limit * 2 if self.limit < self.threshold else self.limit + 1)
+            self.highest = max(self.highest, self.limit)
+        self._new_window(now)
+
+    def summary(self):
+        with self._cond:
+            return {
+                "latency_target_ms": round(self.latency_target * 1000, 1),
+                "final": int(self.limit),
+                "highest": int(self.highest),
+                "backoffs": self.backoffs,
+                "endpoints": {endpoint: {"rps": round(rps, 2), "concurrency": limit}
+                              for endpoint, (rps, limit) in sorted(self.sustainable.items(),
+                                                                   key=lambda item: -item[1][0])},
+            }
+
+
+def print_adaptive(summary):
+    """Limits reached by --adaptive and the sustainable req/s of each endpoint."""
+    print(f"  Concorrência adaptativa (p95 alvo {summary['latency_target_ms']:g} ms): "
+          f"final {summary['final']}, máxima {summary['highest']}, {summary['backoffs']} recuos")
+    print(f"  {'Endpoint':<34} {'Req/s sustentável':>18} {'Concorrência':>13}")
+    for endpoint, row in summary["endpoints"].items():
+        print(f"  {endpoint:<34} {row['rps']:>18.1f} {row['concurrency']:>13}")
+
+
+class TaskGraph:
+    """Dependency-aware scheduler for the seed steps.
+
+    Work comes from sources: lazy item streams registered with add(), one per
+    step label. A source is not read until its `after` keys exist, and each
+    of its items may wait on keys of its own (`needs`). Keys are resolved by
+    the on_result callbacks of other tasks; "done:<label>" resolves by itself
+    once that source is drained. Items whose inputs are missing are parked
+    and start the moment the last one appears, so the pool stays full across
+    entity types instead of waiting for whole steps to finish.
+
+    A source added with `rate` is paced where its items are dispatched, at
+    most `rate` per second and without bursts: its waiting items hold no
+    worker, so the other sources keep the pool.
+
+    Callbacks (on_result, on_blocked and the item streams themselves) run on
+    the calling thread, one at a time; only `fn` runs on the workers.
+    """
+
+    MAX_PARKED = 50000  # stop reading sources past this many waiting items
+
+    class Source:
+        def __init__(self, label, fn, items, needs, after, on_result, on_blocked, on_drained, rate):
+            self.label = label
+            self.fn = fn
+            self.items = iter(items)
+            self.needs = needs
+            self.after = after
+            self.on_result = on_result
+            self.on_blocked = on_blocked
+            self.on_drained = on_drained
+            self.ready = deque()
+            self.interval = 1 / rate if rate else 0.0
+            self.next_slot = 0.0  # time.monotonic() before which a paced source dispatches nothing
+            self.started = False
+            self.exhausted = False
+            self.outstanding = 0  # read but not finished: parked, ready or in flight
+            self.first_start = None
+            self.last_end = None
+            self.busy = 0.0
+            self.tasks = 0
+            self.blocked = 0
+
+    def __init__(self, concurrency, step_prefix=""):
+        self.concurrency = concurrency
+        self.step_prefix = step_prefix  # prepended to labels in metrics and self.steps, not in keys
+        self.sources = []
+        self.resolved = {}  # key -> value
+        self.failed = set()
+        self.parked = {}    # missing key -> [entry]; entry = [source, item, missing count, alive]
+        self.n_parked = 0
+        self.steps = []     # (label, wall_s, busy_s, tasks), filled in by run()
+        self.wall = 0.0
+
+    def add(self, label, fn, items, needs=None, after=(), on_result=None, on_blocked=None, on_drained=None,
+            rate=None):
+        """Register a source; needs(item) returns the keys that item waits for, rate caps its items/s."""
+        self.sources.append(self.Source(label, fn, items, needs, tuple(after), on_result, on_blocked, on_drained,
+                                        rate))
+
+    def resolve(self, key, value=True):
+        """Make `key` available and release the items that were waiting only for it."""
+        if key in self.resolved:
+            return
+        self.resolved[key] = value
+        for entry in self.parked.pop(key, ()):
+            if not entry[3]:
+                continue
+            entry[2] -= 1
+            if entry[2] == 0:
+                entry[3] = False
+                self.n_parked -= 1
+                entry[0].ready.append(entry[1])
+
+    def fail(self, key):
+        """Mark `key` as never coming; items waiting for it are reported as blocked."""
+        if key in self.resolved or key in self.failed:
+            return
+        self.failed.add(key)
+        for entry in self.parked.pop(key, ()):
+            if entry[3]:
+                entry[3] = False
+                self.n_parked -= 1
+                self._block(entry[0], entry[1])
+
+    def get(self, key, default=None):
+        return self.resolved.get(key, default)
+
+    def not_started(self):
+        """Labels of sources whose `after` keys never appeared."""
+        return [source.label for source in self.sources if not source.started]
+
+    def _block(self, source, item):
+        source.blocked += 1
+        source.outstanding -= 1
+        if source.on_blocked:
+            source.on_blocked(item)
+        self._check_drained(source)
+
+    def _check_drained(self, source):
+        if source.exhausted and source.outstanding == 0 and f"done:{source.label}" not in self.resolved:
+            self.resolve(f"done:{source.label}")
+            if source.on_drained:
+                source.on_drained()
+
+    def _admit(self, source, item):
+        source.outstanding += 1
+        keys = source.needs(item) if source.needs else ()
+        if any(key in self.failed for key in keys):
+            self._block(source, item)
+            return
+        missing = [key for key in keys if key not in self.resolved]
+        if not missing:
+            source.ready.append(item)
+            return
+        entry = [source, item, len(missing), True]
+        for key in missing:
+            self.parked.setdefault(key, []).append(entry)
+        self.n_parked += 1
+
+    def _fill(self, force=False):
+        """Read sources round-robin until enough work is ready; force ignores MAX_PARKED until anything is."""
+        target = self.concurrency * 2
+        progress = True
+        while progress:
+            progress = False
+            # Paced items wait for their slot, not for a worker: they do not count towards the target
+            if sum(len(s.ready) for s in self.sources if not s.interval) >= target:
+                return
+            if self.n_parked >= self.MAX_PARKED and not force:
+                return
+            for source in self.sources:
+                if source.exhausted or (source.interval and len(source.ready) >= target):
+                    continue
+                if not source.started:
+                    if not all(key in self.resolved for key in source.after):
+                        continue
+                    source.started = True
+                for item in source.items:
+                    self._admit(source, item)
+                    progress = True
+                    break
+                else:
+                    source.exhausted = True
+                    self._check_drained(source)
+                    progress = True
+            if force and any(s.ready for s in self.sources):
+                force = False  # the pool has work again: back to the normal limits, keep filling
+
+    def _next_ready(self, now):
+        # Earlier sources first: they produce the keys later ones wait for
+        for source in self.sources:
+            if source.ready:
+                if source.interval:
+                    if source.next_slot > now:
+                        continue
+                    source.next_slot = max(source.next_slot, now) + source.interval
+                return source, source.ready.popleft()
+        return None, None
+
+    def _next_slot(self):
+        """When the earliest paced item that is ready may go, or None if none is waiting."""
+        slots = [source.next_slot for source in self.sources if source.interval and source.ready]
+        return min(slots) if slots else None
+
+    def _release_parked(self):
+        """Nothing can run any more: give up on every parked item."""
+        entries = [entry for waiting in self.parked.values() for entry in waiting if entry[3]]
+        self.parked.clear()
+        released = False
+        for entry in entries:
+            if entry[3]:
+                entry[3] = False
+                self.n_parked -= 1
+                self._block(entry[0], entry[1])
+                released = True
+        return released
+
+    def run(self):
+        """Run every source to completion, then record per-step timings in self.steps."""
+        def timed(source, item):
+            set_step(self.step_prefix + source.label)
+            start = time.perf_counter()
+            result = source.fn(item)
+            return result, start, time.perf_counter()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, self.concurrency)) as pool:
+            in_flight = {}
+            while True:
+                self._fill(force=not in_flight)
+                now = time.monotonic()
+                while len(in_flight) < self.concurrency:
+                    source, item = self._next_ready(now)
+                    if source is None:
+                        break
+                    in_flight[pool.submit(timed, source, item)] = (source, item)
+                paced = self._next_slot()
+                if not in_flight:
+                    if paced is not None:
+                        time.sleep(max(0.0, paced - time.monotonic()))
+                        continue
+                    # Idle and nothing readable: what is still parked waits on keys nobody will produce
+                    if self._release_parked():
+                        continue
+                    break
+                timeout = None if paced is None else max(0.0, paced - time.monotonic())
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    source, item = in_flight.pop(future)
+                    result, start, end = future.result()
+                    if source.first_start is None or start < source.first_start:
+                        source.first_start = start
+                    source.last_end = end if source.last_end is None else max(source.last_end, end)
+                    source.busy += end - start
+                    source.tasks += 1
+                    source.outstanding -= 1
+                    if source.on_result:
+                        source.on_result(item, result)
+                    self._check_drained(source)
+        self.wall = time.perf_counter() - started
+        for source in self.sources:
+            wall = source.last_end - source.first_start if source.tasks else 0.0
+            self.steps.append((self.step_prefix + source.label, wall, source.busy, source.tasks))
+
+    def print_speedup(self):
+        """Per-step table; steps overlap, so the total uses the graph's wall time, not the sum."""
+        print(f"  {'Etapa':<18} {'Tarefas':>8} {'Sequencial':>11} {'Paralelo':>10} {'Speedup':>8} {'Req/s':>8}")
+        total_busy = 0.0
+        for label, wall, busy, tasks in self.steps:
+            total_busy += busy
+            if not tasks:
+                print(f"  {label:<18} {tasks:>8} {'—':>11} {'—':>10} {'—':>8} {'—':>8}")
+                continue
+            print(f"  {label:<18} {tasks:>8} {busy:>10.2f}s {wall:>9.2f}s {busy / wall if wall else 1:>7.1f}x"
+                  f" {tasks / wall if wall else 0:>8.1f}")
+        if self.wall:
+            print(f"  {'Total':<18} {'':>8} {total_busy:>10.2f}s {self.wall:>9.2f}s {total_busy / self.wall:>7.1f}x")
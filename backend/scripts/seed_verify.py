@@ -0,0 +1,320 @@
+"""Subcomando verify do seed-data.py: confere o grafo semeado e mede sugestões e consultas /graph."""
+import argparse
+import bisect
+import json
+import os
+import random
+from array import array
+
+import seed_http  # for BASE, which main() sets
+from seed_http import api, get_suggestions, set_step
+from seed_state import Registry
+from seed_tasks import run_parallel
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_VERIFY_REPORT = os.path.join(SCRIPT_DIR, "verify-report.json")
+GRAPH_INSIGHTS = ("/graph/influential", "/graph/bridges", "/graph/communities")
+
+
+class Adjacency:
+    """Graph over dense node numbers in CSR form: per-node offsets into one sorted neighbour array.
+
+    About 4 bytes per edge end plus 8 per node, so the full seeded graph
+    fits in memory next to the registries.
+    """
+
+    def __init__(self, n_nodes, sources, targets):
+        """Edges sources[i] -> targets[i]; duplicates are dropped."""
+        counts = array("q", bytes(8 * (n_nodes + 1)))
+        for source in sources:
+            counts[source + 1] += 1
+        for v in range(n_nodes):
+            counts[v + 1] += counts[v]
+        slots = array("i", bytes(4 * len(sources)))
+        cursor = array("q", counts)
+        for source, target in zip(sources, targets):
+            slots[cursor[source]] = target
+            cursor[source] += 1
+        self.offsets = array("q", [0])
+        self.targets = array("i")
+        for v in range(n_nodes):
+            self.targets.extend(sorted(set(slots[counts[v]:counts[v + 1]])))
+            self.offsets.append(len(self.targets))
+
+    @classmethod
+    def undirected(cls, n_nodes, pairs_a, pairs_b):
+        return cls(n_nodes, pairs_a + pairs_b, pairs_b + pairs_a)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def neighbors(self, v):
+        return self.targets[self.offsets[v]:self.offsets[v + 1]]
+
+    def degree(self, v):
+        return self.offsets[v + 1] - self.offsets[v]
+
+    def has_edge(self, u, v):
+        row = self.neighbors(u)
+        i = bisect.bisect_left(row, v)
+        return i < len(row) and row[i] == v
+
+    def two_hop(self, v):
+        """Friends of friends of v that are not v's friends -> number of mutual friends."""
+        friends = self.neighbors(v)
+        mutual = {}
+        for friend in friends:
+            for other in self.neighbors(friend):
+                if other != v:
+                    mutual[other] = mutual.get(other, 0) + 1
+        for friend in friends:
+            mutual.pop(friend, None)
+        return mutual
+
+
+def mutual_count(value):
+    """mutualConnections as a number; older backends leak the Neo4j Integer {low, high}."""
+    if isinstance(value, dict):
+        return value.get("low", 0)
+    return int(value or 0)
+
+
+def verify(args, dataset, tokens, metrics):
+    """Check the connection graph the API serves against the dataset and time the graph queries.
+
+    1. GET /connections/me for every seeded doctor gives the observed graph,
+       which is diffed edge by edge with dataset.connections(): missing,
+       unexpected and one-sided edges (CONNECTED_TO is written both ways).
+    2. For a sample of doctors, the friends-of-friends part of
+       /connections/suggestions (the entries with mutualConnections > 0) is
+       checked against the 2-hop neighbourhood of the observed graph:
+       every entry must be a 2-hop non-friend with the right mutual count,
+       and together they must be a top-N by that count.
+    3. The same sample times /graph/similar/:id and /graph/community-peers,
+       and the global /graph queries run --repeat times.
+
+    The per-endpoint table comes from `metrics`, the fresh RequestMetrics
+    api() reports to. Returns the number of divergences found.
+    """
+    print("=" * 60)
+    print("MedConnect - Verificação do grafo")
+    print(f"Concorrência: {args.concurrency}, amostra: {args.sample} médicos, limite das sugestões: {args.limit}")
+    print("=" * 60)
+    registry = tokens.registry
+    tokens.probe(dataset.first_email())
+    emails = [email for email, _ in dataset.existing_accounts()] + [doc["email"] for doc in dataset.doctors()]
+    nodes = Registry()            # doctorId -> dense node number
+    node_account = array("i")     # node -> registry handle of its email, -1 outside the dataset
+    fetched = bytearray()         # node -> 1 once its /connections/me is in
+    observed_a, observed_b = array("i"), array("i")
+
+    def node(doctor_id):
+        v = nodes.handle(doctor_id)
+        if v == len(node_account):
+            node_account.append(-1)
+            fetched.append(0)
+        return v
+
+    def account_node(email):
+        """Node of a seeded account, or None if it has no doctorId yet."""
+        handle = registry.handle(email)
+        doctor_id = registry.id(handle)
+        if not doctor_id:
+            return None
+        v = node(doctor_id)
+        node_account[v] = handle
+        return v
+
+    def label(v):
+        return registry.key(node_account[v]) if node_account[v] >= 0 else nodes.key(v)
+
+    def my_connections(email):
+        token = tokens.token(email)
+        if not token:
+            return None
+        r = api("GET", "/connections/me", token)
+        return r.json() if r is not None and r.status_code == 200 else None
+
+    # --- 1. Observed graph vs. the dataset ---
+    print("\n[1/3] Conexões de cada médico (/connections/me)...")
+    set_step("[1/3] conexões")
+    unreachable = 0
+    for email, connections, _ in run_parallel(my_connections, emails, args.concurrency):
+        v = account_node(email)
+        if connections is None or v is None:
+            unreachable += 1
+            continue
+        fetched[v] = 1
+        for other in connections:
+            observed_a.append(v)
+            observed_b.append(node(other["id"]))
+    expected_a, expected_b = array("i"), array("i")
+    unseeded = 0
+    for sender, receiver in dataset.connections():
+        u, v = account_node(sender), account_node(receiver)
+        if u is None or v is None:
+            unseeded += 1
+            continue
+        expected_a.append(u)
+        expected_b.append(v)
+    n = len(node_account)
+    observed = Adjacency(n, observed_a, observed_b)
+    graph = Adjacency.undirected(n, observed_a, observed_b)  # what the 2-hop query walks
+    expected = Adjacency.undirected(n, expected_a, expected_b)
+    del observed_a, observed_b, expected_a, expected_b
+
+    edges = {"missing": 0, "unexpected": 0, "one_sided": 0, "outside_dataset": 0}
+    examples = []
+
+    def diverges(kind, u, v):
+        edges[kind] += 1
+        if len(examples) < args.examples:
+            examples.append(f"{kind}: {label(u)} - {label(v)}")
+
+    for u in range(n):
+        for v in expected.neighbors(u):
+            if v < u:
+                continue
+            seen_uv, seen_vu = observed.has_edge(u, v), observed.has_edge(v, u)
+            if not seen_uv and not seen_vu:
+                diverges("missing", u, v)
+            elif fetched[u] and fetched[v] and seen_uv != seen_vu:
+                diverges("one_sided", u, v)
+        for v in observed.neighbors(u):
+            if node_account[v] < 0:
+                edges["outside_dataset"] += 1
+            elif not expected.has_edge(u, v) and (v > u or not observed.has_edge(v, u)):
+                diverges("unexpected", u, v)
+
+    # --- 2. Friends-of-friends suggestions, 3. per-doctor graph queries ---
+    accounts = [v for v in range(n) if fetched[v] and node_account[v] >= 0]
+    sample = random.Random(args.seed).sample(accounts, min(args.sample, len(accounts)))
+    print(f"[2/3] Sugestões de {len(sample)} médicos (/connections/suggestions, /graph/similar, /graph/community-peers)...")
+
+    def per_doctor(v):
+        token = tokens.token(label(v))
+        if not token:
+            return None
+        set_step("[2/3] sugestões")
+        suggestions = get_suggestions(token, args.limit)
+        set_step("[3/3] insights")
+        api("GET", f"/graph/similar/{nodes.key(v)}", token, params={"limit": args.limit})
+        api("GET", "/graph/community-peers", token, params={"limit": args.limit})
+        return suggestions
+
+    checks = {"checked": 0, "exact": 0, "not_two_hop": 0, "wrong_mutual": 0, "too_few": 0,
+              "not_top": 0, "unordered": 0, "failed": 0}
+
+    def wrong(kind, v, detail):
+        checks[kind] += 1
+        if len(examples) < args.examples:
+            examples.append(f"{kind}: {label(v)} {detail}")
+
+    for v, suggestions, _ in run_parallel(per_doctor, sample, args.concurrency):
+        if suggestions is None:
+            checks["failed"] += 1
+            continue
+        checks["checked"] += 1
+        problems = sum(checks.values())
+        mutual = graph.two_hop(v)
+        fof = [(item["id"], mutual_count(item.get("mutualConnections"))) for item in suggestions
+               if mutual_count(item.get("mutualConnections")) > 0]
+        for doctor_id, count in fof:
+            u = nodes.handle(doctor_id, create=False)
+            if u is None or u not in mutual:
+                wrong("not_two_hop", v, f"-> {doctor_id}")
+            elif mutual[u] != count:
+                wrong("wrong_mutual", v, f"-> {label(u)}: {count} (esperado {mutual[u]})")
+        counts = [count for _, count in fof]
+        ranked = sorted(mutual.values(), reverse=True)
+        if len(fof) < min(args.limit, len(mutual)):
+            wrong("too_few", v, f"{len(fof)} de {min(args.limit, len(mutual))}")
+        elif counts and len(counts) <= len(ranked) and min(counts) < ranked[len(counts) - 1]:
+            wrong("not_top", v, f"menor {min(counts)}, esperado >= {ranked[len(counts) - 1]}")
+        if counts != sorted(counts, reverse=True):
+            wrong("unordered", v, str(counts))
+        if sum(checks.values()) == problems:
+            checks["exact"] += 1
+
+    print(f"[3/3] Consultas globais do grafo ({', '.join(GRAPH_INSIGHTS)}) x{args.repeat}...")
+    set_step("[3/3] insights")
+    token = tokens.token(label(sample[0])) if sample else None
+    for path in GRAPH_INSIGHTS:
+        for _ in range(args.repeat if token else 0):
+            api("GET", path, token, params={"limit": args.limit})
+    metrics.by_endpoint.stop()
+
+    # --- Report ---
+    n_edges = len(graph.targets) // 2
+    shape = {
+        "doctors": len(accounts),
+        "nodes": n,
+        "edges": n_edges,
+        "expected_edges": len(expected.targets) // 2,
+        "max_degree": max((graph.degree(v) for v in range(n)), default=0),
+        "mean_degree": round(2 * n_edges / n, 2) if n else 0.0,
+        "unreachable": unreachable,
+        "unseeded_pairs": unseeded,
+    }
+    divergences = (edges["missing"] + edges["unexpected"] + edges["one_sided"]
+                   + sum(count for kind, count in checks.items() if kind not in ("checked", "exact", "failed")))
+    print("\n" + "=" * 60)
+    print("RESULTADO DA VERIFICAÇÃO")
+    print("=" * 60)
+    print(f"  Grafo: {shape['doctors']} médicos, {n_edges} conexões "
+          f"(grau médio {shape['mean_degree']:g}, máximo {shape['max_degree']})")
+    print(f"  Esperadas pelo dataset: {shape['expected_edges']}"
+          + (f" (+{unseeded} pares sem conta semeada)" if unseeded else ""))
+    print(f"  Arestas: {edges['missing']} faltando, {edges['unexpected']} inesperadas, "
+          f"{edges['one_sided']} de um lado só, {edges['outside_dataset']} com médicos fora do dataset")
+    if unreachable:
+        print(f"  ! {unreachable} médicos sem token ou sem /connections/me")
+    print(f"  Sugestões: {checks['exact']}/{checks['checked']} exatas; {checks['not_two_hop']} fora do 2-hop, "
+          f"{checks['wrong_mutual']} com mútuos errados, {checks['too_few']} incompletas, "
+          f"{checks['not_top']} fora do top, {checks['unordered']} fora de ordem, {checks['failed']} falharam")
+    if edges["outside_dataset"]:
+        print("  ! Médicos fora do dataset não foram consultados: o 2-hop por eles pode estar incompleto")
+    for line in examples:
+        print(f"    {line}")
+    print("-" * 60)
+    print("  Latência por endpoint")
+    metrics.by_endpoint.print_table()
+    report = metrics.by_endpoint.to_json(base=seed_http.BASE, graph=shape, edges=edges, suggestions=checks,
+                                         divergences=divergences, examples=examples)
+    if args.verify_json == "-":
+        print(json.dumps(report, indent=2))
+    elif args.verify_json:
+        with open(args.verify_json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"  Relatório JSON: {args.verify_json}")
+    print(f"  {'✓ Grafo conforme o dataset' if not divergences else f'✗ {divergences} divergências'}")
+    print("=" * 60)
+    return divergences
+
+
+def verify_options():
+    """Parent parser of the verify options, shared by `verify` and `seed --verify`."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--sample", type=int, default=200,
+                        help="Médicos cujas sugestões e consultas de grafo são conferidas e cronometradas")
+    parser.add_argument("--limit", type=int, default=10, help="?limit= das sugestões e das consultas /graph")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetições de cada consulta global /graph")
+    parser.add_argument("--examples", type=int, default=10, help="Divergências listadas como exemplo")
+    parser.add_argument("--verify-json", default=DEFAULT_VERIFY_REPORT,
+                        help="Arquivo do relatório JSON da verificação ('-' imprime no stdout, '' desativa)")
+    return parser
+
+
+def add_parser(commands, parents):
+    """The `verify` subparser; its own options are the `checks` parent, see verify_options()."""
+    parser = commands.add_parser("verify", parents=[parents.http, parents.data, parents.mock, parents.checks], help="Confere o grafo semeado e mede as consultas",
+                                 description="Compara /connections/me e as sugestões (amigos de amigos) com o dataset "
+                                             "e mede a latência de /connections/suggestions e /graph/*.")
+    return parser
+
+
+def check_args(parser, args):
+    """Reject --sample, --limit or --repeat below 1 (also run for seed --verify)."""
+    if min(args.sample, args.limit, args.repeat) < 1:
+        parser.error("--sample, --limit e --repeat devem ser pelo menos 1")
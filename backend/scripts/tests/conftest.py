@@ -0,0 +1,22 @@
+import importlib.util
+import pathlib
+import sys
+
+import pytest
+
+SCRIPT = pathlib.Path(__file__).resolve().parent.parent / "seed-data.py"
+# The sibling modules seed-data.py imports (seed_common, seed_export, ...)
+sys.path.insert(0, str(SCRIPT.parent))
+
+
+def load_seed_module():
+    """Import seed-data.py, whose hyphenated name rules out a plain import."""
+    spec = importlib.util.spec_from_file_location("seed_data", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def seed():
+    return load_seed_module()
@@ -0,0 +1,62 @@
+import seed_tasks
+
+
+def limiter(**kwargs):
+    controller = seed_tasks.AdaptiveLimiter(64, latency_target=0.1, **kwargs)
+    controller.MIN_WINDOW_S = 0  # windows close on the sample count alone
+    return controller
+
+
+def run_window(controller, seconds, status=200):
+    """Fill the limit, then finish a whole window of calls."""
+    for _ in range(max(controller.MIN_WINDOW, int(controller.limit))):
+        controller.acquire()
+        controller.release("GET /feed/timeline", seconds, status)
+
+
+def test_slow_start_doubles_the_limit_while_healthy():
+    controller = limiter()
+    for _ in range(int(controller.limit)):
+        controller.acquire()
+    for _ in range(int(controller.limit)):
+        controller.release("GET /feed/timeline", 0.01, 200)
+    run_window(controller, 0.01)
+    assert controller.limit == 8
+    assert controller.backoffs == 0
+    assert controller.summary()["endpoints"]["GET /feed/timeline"]["concurrency"] == 4
+
+
+def test_errors_cut_the_limit_once_per_window():
+    controller = limiter(initial=10)
+    controller.acquire()
+    controller.acquire()
+    controller.release("POST /jobs", 0.01, 503)
+    controller.release("POST /jobs", 0.01, 0)
+    assert controller.limit == 10 * controller.BETA
+    assert controller.backoffs == 1
+    assert controller.threshold == controller.limit
+
+
+def test_slow_window_backs_off_then_grows_additively():
+    controller = limiter(initial=32)
+    run_window(controller, 0.5)  # p95 above the 100 ms target
+    assert controller.backoffs == 1
+    cut = controller.limit
+    assert int(cut) == int(32 * controller.BETA)
+    run_window(controller, 0.5)  # the congested window only closes, no second cut
+    assert controller.backoffs == 1
+    for _ in range(int(controller.limit)):
+        controller.acquire()
+    for _ in range(int(controller.limit)):
+        controller.release("GET /feed/timeline", 0.01, 200)
+    run_window(controller, 0.01)
+    assert controller.limit == cut + 1  # past the threshold: +1 per window, not x2
+
+
+def test_limit_never_drops_below_one():
+    controller = limiter(initial=1)
+    for _ in range(5):
+        controller.acquire()
+        controller.release("GET /x", 0.01, 500)
+        controller.window_congested = False
+    assert controller.limit == 1
@@ -0,0 +1,31 @@
+import pytest
+
+
+def test_seed_is_the_default_command(seed):
+    args = seed.parse_args(["--scale", "doctors=10"])
+    assert args.command == "seed"
+    assert args.scale == {"doctors": 10}
+    assert args.sample == 200  # the verify options come along for seed --verify
+
+
+def test_every_module_registers_its_subcommand(seed):
+    for command in seed.COMMANDS:
+        argv = [command] + (["log.jsonl"] if command == "replay" else ["shard.json"] if command == "report" else [])
+        assert seed.parse_args(argv).command == command
+
+
+@pytest.mark.parametrize("argv", [
+    ["bench", "--rps", "0"],
+    ["verify", "--limit", "0"],
+    ["seed", "--repeat", "0"],
+    ["seed", "--shards", "2", "--verify"],
+    ["chat", "--sockets", "1"],
+    ["appointments", "--slot", "5"],
+    ["replay", "log.jsonl", "--speed", "-1"],
+    ["export", "--format", "mysql"],
+    ["bench", "--zipf", "0"],
+])
+def test_invalid_options_are_rejected(seed, argv, capsys):
+    with pytest.raises(SystemExit):
+        seed.parse_args(argv)
+    assert "error:" in capsys.readouterr().err
@@ -0,0 +1,122 @@
+import gc
+import json
+import weakref
+from collections import Counter
+
+import pytest
+
+import seed_datasets
+import seed_state
+
+
+def test_smallworld_edges_are_unique_pairs():
+    for doctors, rewire in ((7, 0.9), (50, 0.5), (2000, 0.1)):
+        dataset = seed_datasets.SyntheticDataset({"doctors": doctors}, graph="smallworld", rewire=rewire)
+        pairs = Counter((min(i, j), max(i, j)) for i, j in dataset.edges())
+        assert pairs
+        assert max(pairs.values()) == 1
+        assert all(i != j for i, j in pairs)
+
+
+def test_powerlaw_edges_are_unique_pairs():
+    dataset = seed_datasets.SyntheticDataset({"doctors": 2000})
+    pairs = Counter((min(i, j), max(i, j)) for i, j in dataset.edges())
+    assert max(pairs.values()) == 1
+
+
+def test_doctor_email_cache_does_not_keep_datasets_alive():
+    dataset = seed_datasets.SyntheticDataset({"doctors": 10})
+    email = dataset.doctor_email(3)[0]
+    assert dataset.doctor_email(3)[0] == email
+    ref = weakref.ref(dataset)
+    del dataset
+    gc.collect()
+    assert ref() is None
+
+
+def test_post_keys_are_unique_at_scale():
+    # Few doctors and many posts: the same author draws the same text over and over
+    dataset = seed_datasets.SyntheticDataset({"doctors": 200, "posts": 100000})
+    keys = [seed_state.post_key(post) for post in dataset.posts()]
+    assert len(keys) == 100000
+    assert len(set(keys)) == len(keys)
+
+
+def test_post_keys_are_stable():
+    first = [seed_state.post_key(post) for post in seed_datasets.SyntheticDataset({"doctors": 50, "posts": 100}).posts()]
+    second = [seed_state.post_key(post) for post in seed_datasets.SyntheticDataset({"doctors": 50, "posts": 100}).posts()]
+    assert first == second
+
+
+def test_spec_post_keys_do_not_clash_with_generated_ones(tmp_path):
+    spec = tmp_path / "spec.json"
+    spec.write_text(json.dumps({
+        "doctors": [{"email": "a@example.com", "password": "Senha@2026", "fullName": "A",
+                     "crm": "201001", "crmState": "SP"}],
+        "posts": [{"email": "a@example.com", "content": "Mesmo texto"}] * 3,
+        "generate": {"doctors": 20, "posts": 50},
+    }))
+    keys = [seed_state.post_key(post) for post in seed_datasets.SpecDataset(str(spec)).posts()]
+    assert len(keys) == 53
+    assert len(set(keys)) == len(keys)
+
+
+def test_zipf_counts_sum_exactly_to_the_total():
+    for n, total, cap in ((15, 19, None), (15, 60, 20), (1000, 10000, 1000), (7, 3, None)):
+        counts = seed_datasets.zipf_counts(n, total, 1.1, cap)
+        assert sum(counts) == total
+        assert list(counts) == sorted(counts, reverse=True)
+        assert cap is None or max(counts) <= cap
+
+
+def test_zipf_counts_are_capped_by_distinct_actors():
+    counts = seed_datasets.zipf_counts(5, 1000, 1.1, cap=3)
+    assert list(counts) == [3, 3, 3, 3, 3]
+
+
+def test_engagement_matches_the_planned_sizes():
+    dataset = seed_datasets.SyntheticDataset({"doctors": 20, "posts": 40, "likes": 5000, "comments": 77})
+    kinds = Counter(event["kind"] for event in dataset.engagement())
+    assert dataset.sizes["likes"] == 20 * 40  # one like per doctor and post at most
+    assert kinds == {"like": dataset.sizes["likes"], "comment": 77, "bookmark": dataset.sizes["bookmarks"]}
+    likes = Counter((event["post"], event["email"]) for event in dataset.engagement() if event["kind"] == "like")
+    assert max(likes.values()) == 1
+
+
+def write_spec(tmp_path, document):
+    path = tmp_path / "spec.json"
+    path.write_text(json.dumps(document))
+    return str(path)
+
+
+def doctor_record(email, crm):
+    return {"email": email, "password": "Senha@2026", "fullName": "Dra. Teste", "crm": crm, "crmState": "SP"}
+
+
+def test_command_line_seed_wins_over_the_spec(tmp_path):
+    path = write_spec(tmp_path, {"generate": {"doctors": 10, "seed": 42, "graph": "smallworld"}})
+    assert seed_datasets.SpecDataset(path).seed == 42
+    dataset = seed_datasets.SpecDataset(path, seed=7)
+    assert dataset.seed == dataset.generated.seed == 7
+    assert dataset.generated.graph == "smallworld"  # options not given on the command line stay the spec's
+    assert next(dataset.doctors()) == next(seed_datasets.SyntheticDataset({"doctors": 10}, seed=7).doctors())
+
+
+def test_spec_rejects_literal_crms_in_the_generated_range(tmp_path):
+    base = seed_datasets.SyntheticDataset.CRM_BASE
+    path = write_spec(tmp_path, {
+        "doctors": [doctor_record("a@example.com", str(base + 3)), doctor_record("b@example.com", str(base + 10))],
+        "generate": {"doctors": 10},
+    })
+    with pytest.raises(SystemExit) as exit_info:
+        seed_datasets.SpecDataset(path)
+    message = str(exit_info.value)
+    assert "1 problema" in message
+    assert str(base + 3) in message
+
+
+def test_spec_rejects_repeated_crms(tmp_path):
+    path = write_spec(tmp_path, {"doctors": [doctor_record("a@example.com", "201001"),
+                                             doctor_record("b@example.com", "201001")]})
+    with pytest.raises(SystemExit, match="CRM repetido"):
+        seed_datasets.SpecDataset(path)
@@ -0,0 +1,67 @@
+import random
+
+import seed_bench
+import seed_common
+
+
+def test_histogram_percentiles_are_within_one_percent():
+    rng = random.Random(7)
+    samples = [rng.lognormvariate(-3, 1) for _ in range(20000)]
+    exact = seed_common.LatencyStats()
+    approx = seed_common.LatencyStats(exact=False)
+    for value in samples:
+        exact.add("GET /x", value)
+        approx.add("GET /x", value)
+    want, got = exact.summary()["GET /x"], approx.summary()["GET /x"]
+    assert got["requests"] == want["requests"] == 20000
+    assert got["max_ms"] == want["max_ms"]
+    assert abs(got["mean_ms"] - want["mean_ms"]) < 0.01
+    for key in ("p50_ms", "p95_ms", "p99_ms"):
+        assert abs(got[key] - want[key]) <= 0.011 * want[key]
+
+
+def test_histogram_memory_does_not_grow_with_samples():
+    histogram = seed_common.LatencyHistogram()
+    size = len(histogram.counts)
+    for i in range(1, 10001):
+        histogram.add(i / 1000)
+    histogram.add(0.0)
+    histogram.add(1e6)
+    assert len(histogram.counts) == size
+    assert histogram.count == 10002
+
+
+def test_histogram_state_merges_across_processes():
+    first, second = seed_common.LatencyStats(exact=False), seed_common.LatencyStats(exact=False)
+    for i in range(100):
+        first.add("GET /a", 0.010, ok=i % 10 != 0, nbytes=2)
+        second.add("GET /a", 0.020)
+        second.add("GET /b", 0.030)
+    first.merge(second.state())
+    summary = first.summary()
+    assert summary["GET /a"]["requests"] == 200
+    assert summary["GET /a"]["errors"] == 10
+    assert summary["GET /a"]["bytes"] == 200
+    assert summary["total"]["requests"] == 300
+    assert summary["total"]["max_ms"] == 30.0
+
+
+def test_request_metrics_aggregate_into_histograms():
+    metrics = seed_bench.RequestMetrics()
+    for status in (200, 201, 404, 0):
+        metrics.observe("GET", "/feed/posts/123/like", status, 10, 0.0, 0.005)
+    row = metrics.by_endpoint.summary()["GET /feed/posts/:id/like"]
+    assert row["requests"] == 4
+    assert row["errors"] == 2
+    assert isinstance(metrics.by_endpoint.samples["GET /feed/posts/:id/like"], seed_common.LatencyHistogram)
+
+
+def test_total_row_can_be_left_out():
+    mixed = seed_common.LatencyStats(total=False)
+    mixed.add("send_message (ack)", 0.010)
+    mixed.add("new_message (entrega)", 0.050)
+    assert set(mixed.summary()) == {"send_message (ack)", "new_message (entrega)"}
+    combined = seed_common.LatencyStats()
+    combined.add("GET /a", 0.010)
+    combined.add("GET /b", 0.050)
+    assert combined.summary()["total"]["requests"] == 2
@@ -0,0 +1,38 @@
+import requests
+
+import seed_mock
+
+
+def login(backend, email="demo@medconnect.com", password="Demo@2026"):
+    _, body = backend.handle("POST", "/auth/login", {}, "", {"email": email, "password": password})
+    return f"Bearer {body['accessToken']}"
+
+
+def test_patient_token_gets_404_from_doctors_me():
+    backend = seed_mock.MockBackend()
+    status, body = backend.handle("POST", "/auth/register-patient", {}, "",
+                                  {"email": "paciente@example.com", "password": "Senha@2026", "fullName": "Ana"})
+    assert status == 201
+    status, body = backend.handle("GET", "/doctors/me", {}, f"Bearer {body['accessToken']}", None)
+    assert (status, body["statusCode"]) == (404, 404)
+
+
+def test_bad_input_is_an_http_error_not_a_dropped_connection():
+    backend = seed_mock.MockBackend()
+    token = login(backend)
+    assert backend.handle("GET", "/feed/timeline", {"limit": "abc"}, token, None)[0] == 400
+    backend.route_index["GET /feed/timeline"] = (True, lambda user, body, query: 1 / 0)
+    assert backend.handle("GET", "/feed/timeline", {}, token, None)[0] == 500
+
+
+def test_query_strings_are_percent_decoded():
+    backend = seed_mock.MockBackend()
+    server, base = seed_mock.start_mock_server(backend)
+    try:
+        seen = {}
+        backend.route_index["GET /feed/trending"] = (False, lambda user, body, query: (200, seen.update(query)))
+        r = requests.get(f"{base}/feed/trending?q=S%C3%A3o+Paulo&limit=%35&empty=", timeout=5)
+        assert r.status_code == 200
+        assert seen == {"q": "São Paulo", "limit": "5", "empty": ""}
+    finally:
+        server.shutdown()
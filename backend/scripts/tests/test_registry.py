@@ -0,0 +1,79 @@
+import os
+import subprocess
+import sys
+import types
+import uuid
+
+import seed_state
+
+
+def test_handles_are_dense_and_stable():
+    registry = seed_state.Registry()
+    first = registry.handle("a@example.com")
+    second = registry.handle("b@example.com")
+    assert (first, second) == (0, 1)
+    assert registry.handle("a@example.com") == first
+    assert registry.key(second) == "b@example.com"
+    assert registry.handle("c@example.com", create=False) is None
+    assert len(registry) == 2
+
+
+def test_index_grows_past_the_load_factor():
+    registry = seed_state.Registry()
+    slots = len(registry.slots)
+    keys = [f"medico.{i}@medconnect.com" for i in range(5000)]
+    handles = [registry.handle(key) for key in keys]
+    assert handles == list(range(5000))
+    assert len(registry.slots) > slots
+    assert len(registry) <= len(registry.slots) * registry.MAX_LOAD
+    assert all(registry.handle(key, create=False) == i for i, key in enumerate(keys))
+    assert all(registry.key(i) == key for i, key in enumerate(keys))
+
+
+def test_colliding_hashes_probe_to_their_own_slot(monkeypatch):
+    # Every key hashes alike: lookups must tell them apart by their bytes
+    monkeypatch.setattr(seed_state, "zlib", types.SimpleNamespace(crc32=lambda encoded: 7))
+    registry = seed_state.Registry()
+    keys = [f"k{i}" for i in range(2000)]
+    for key in keys:
+        registry.handle(key)
+    assert [registry.handle(key, create=False) for key in keys] == list(range(2000))
+    assert registry.handle("k2000", create=False) is None
+
+
+def test_server_ids_are_packed_or_kept_aside():
+    registry = seed_state.Registry()
+    canonical = str(uuid.uuid4())
+    packed, odd = registry.handle("post:1"), registry.handle("post:2")
+    registry.set_id(packed, canonical)
+    registry.set_id(odd, "65f0c2a9e4b0a1b2c3d4e5f6")
+    assert registry.id(packed) == canonical
+    assert registry.id(odd) == "65f0c2a9e4b0a1b2c3d4e5f6"
+    assert packed not in registry.odd_ids
+    registry.set_id(odd, canonical.upper())  # not canonical text: kept verbatim
+    assert registry.id(odd) == canonical.upper()
+    registry.clear_ids()
+    assert registry.id(packed) is None and registry.id(odd) is None
+
+
+def test_byte_arena_replaces_and_compacts():
+    arena = seed_state.ByteArena()
+    arena.COMPACT_MIN = 16
+    arena.set(3, b"tres")
+    assert len(arena) == 4
+    assert arena.get(0) is None and arena.get(10) is None
+    for n in range(50):
+        arena.set(0, f"valor {n}".encode())
+    assert arena.get(0) == b"valor 49"
+    assert arena.get(3) == b"tres"
+    assert arena.garbage * 2 <= len(arena.data)  # compacted along the way
+    assert len(arena.data) < 50 * len(b"valor 49")
+
+
+def test_index_layout_does_not_depend_on_the_hash_seed():
+    script = ("import sys; sys.path.insert(0, sys.argv[1]); import seed_state; "
+              "r = seed_state.Registry(); [r.handle(f'k{i}') for i in range(100)]; print(list(r.slots))")
+    layouts = {subprocess.run([sys.executable, "-c", script, os.path.dirname(seed_state.__file__)], check=True,
+                              capture_output=True, text=True, env={**os.environ, "PYTHONHASHSEED": str(salt)}).stdout
+               for salt in (1, 2)}
+    assert len(layouts) == 1
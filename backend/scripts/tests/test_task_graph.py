@@ -0,0 +1,76 @@
+import threading
+import time
+
+import seed_tasks
+
+
+def test_paced_source_does_not_hold_workers():
+    graph = seed_tasks.TaskGraph(4)
+    done = {"fast": 0, "slow": 0}
+    lock = threading.Lock()
+
+    def work(kind):
+        def fn(item):
+            with lock:
+                done[kind] += 1
+            return True
+        return fn
+
+    graph.add("slow", work("slow"), range(5), rate=10)
+    graph.add("fast", work("fast"), range(200))
+    started = time.perf_counter()
+    graph.run()
+    elapsed = time.perf_counter() - started
+    assert done == {"fast": 200, "slow": 5}
+    assert 0.35 <= elapsed < 2
+    steps = {label: (wall, busy) for label, wall, busy, _ in graph.steps}
+    fast_wall, _ = steps["fast"]
+    _, slow_busy = steps["slow"]
+    assert fast_wall < 0.35  # the fast source is not queued behind the paced one
+    assert slow_busy < 0.1   # the pacing is not counted as time spent in the calls
+
+
+def test_items_wait_for_keys_from_other_sources():
+    graph = seed_tasks.TaskGraph(4)
+    order = []
+
+    def create(name):
+        order.append(("create", name))
+        return name
+
+    def use(item):
+        order.append(("use", item))
+        return True
+
+    graph.add("create", create, ["a", "b"], on_result=lambda name, result: graph.resolve(f"key:{name}", result))
+    # Read first (added later but the items are parked until their keys appear)
+    graph.add("use", use, ["b", "a", "b"], needs=lambda item: (f"key:{item}",))
+    graph.run()
+    for item in ("a", "b"):
+        created = order.index(("create", item))
+        assert all(order.index(entry) > created for entry in order if entry == ("use", item))
+    assert order.count(("use", "b")) == 2
+    assert graph.n_parked == 0
+
+
+def test_after_waits_for_a_drained_source():
+    graph = seed_tasks.TaskGraph(2)
+    seen = []
+    graph.add("first", lambda item: seen.append(("first", item)), range(3))
+    graph.add("second", lambda item: seen.append(("second", item)), range(2), after=("done:first",))
+    graph.run()
+    assert [kind for kind, _ in seen] == ["first"] * 3 + ["second"] * 2
+
+
+def test_failed_and_missing_keys_block_their_items():
+    graph = seed_tasks.TaskGraph(2)
+    blocked, ran = [], []
+    graph.add("make", lambda item: item != "bad", ["good", "bad"],
+              on_result=lambda item, ok: graph.resolve(item) if ok else graph.fail(item))
+    graph.add("use", ran.append, ["good", "bad", "never"], needs=lambda item: (item,), on_blocked=blocked.append)
+    graph.add("later", ran.append, ["x"], after=("done:nothing",))
+    graph.run()
+    assert ran == ["good"]
+    assert sorted(blocked) == ["bad", "never"]
+    assert graph.not_started() == ["later"]
+    assert "done:use" in graph.resolved
@@ -26,7 +26,7 @@ export class JwtStrategy extends PassportStrategy(Strategy) {
   async validate(payload: JwtPayload) {
     const user = await this.prisma.user.findUnique({
       where: { id: payload.sub },
-      include: { doctor: true, institution: true },
+      include: { doctor: true, patient: true, institution: true },
     });
 
     if (!user) {
@@ -38,6 +38,7 @@ export class JwtStrategy extends PassportStrategy(Strategy) {
       email: user.email,
       role: user.role,
       doctorId: user.doctor?.id,
+      patientId: user.patient?.id,
       institutionId: user.institution?.id,
     };
   }